@@ -0,0 +1,186 @@
+import copy
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .core.components import HealthComponent, ShieldComponent, PositionComponent
+from .core.entity import Entity
+from .core.event_bus import EventBus, GameEvent
+from .core.enums import EventName, ListenerErrorPolicy
+from .main import build_world, init_battlefield, load_game_data
+from .scheduler import ChoicePolicy, first_choice, subscribe_choice_policy
+from .systems.data_manager import DataManager
+from .world import DEFAULT_MAX_BATTLE_STEPS
+
+# 每个工作进程一次领取的战斗数，摊薄进程间通信的开销
+DEFAULT_CHUNKS_PER_WORKER = 4
+
+# BATTLEFIELD_COMPLETE 的 result -> 获胜的队伍
+WINNING_TEAMS = {"victory": "player", "defeat": "enemy"}
+
+@dataclass
+class BattleSpec:
+    """一场批量模拟的战斗。avatars/enemies 按位置ID覆盖战场配置中的角色模板，为空时沿用战场配置"""
+    battlefield_id: str = "tutorial_battlefield"
+    avatars: Optional[dict[int, str]] = None
+    enemies: Optional[dict[int, str]] = None
+    seed: int = 0
+
+@dataclass
+class BattleSummary:
+    """一场战斗的紧凑结果；winner 为 None 表示战斗没有分出胜负（超出帧数上限等）"""
+    seed: int
+    winner: Optional[str]
+    turns: int  # 行动次数（ACTION_AFTER_ACT）
+    steps: int
+    damage_dealt: dict[str, float] = field(default_factory=dict)  # 实体名称 -> 造成的伤害（生命值和护盾的减少量）
+    wall_time: float = 0.0
+    listener_errors: int = 0
+
+def apply_overrides(battlefield_data: dict, spec: BattleSpec) -> dict:
+    """按 spec 覆盖战场配置中的玩家和敌人位置，返回新的配置；原配置不会被修改"""
+    data = dict(battlefield_data)
+    if spec.avatars is not None:
+        player_team = dict(data.get('player_team', {}))
+        player_team['positions'] = {position_id: {'avatar': template} for position_id, template in spec.avatars.items()}
+        player_team['starting_avatars'] = list(spec.avatars.values())
+        data['player_team'] = player_team
+    if spec.enemies is not None:
+        enemy_teams = dict(data.get('enemy_teams', {}))
+        enemy_teams['positions'] = {position_id: {'enemy': template} for position_id, template in spec.enemies.items()}
+        data['enemy_teams'] = enemy_teams
+    return data
+
+class BattleWorker:
+    """
+    在一个进程里连续跑战斗：数据只加载一次，世界只装配一次。
+    每场战斗开始前用世界刚装配好时的快照还原（见 World.snapshot()），再按 spec 的种子重置世界的随机数。
+    战场覆盖写在本工作者自己的 DataManager 浅拷贝上，加载好的数据本身不会被修改。
+    """
+    def __init__(self, data_manager: DataManager, choice_policy: ChoicePolicy = first_choice,
+                 max_steps: int = DEFAULT_MAX_BATTLE_STEPS):
+        self.base_data_manager = data_manager
+        self.data_manager = copy.copy(data_manager)
+        self.max_steps = max_steps
+        # 监听器出错时只计数，不打印，结果中报告出错次数
+        self.event_bus = EventBus(ListenerErrorPolicy.COUNT)
+        self.world = build_world(self.event_bus, self.data_manager, headless=True)
+        subscribe_choice_policy(self.event_bus, choice_policy)
+        self._pristine = self.world.snapshot()
+
+        self._turns = 0
+        self._damage: dict[Entity, float] = {}
+        self._pending_damage: list[tuple[Entity, Entity, float]] = []  # 正在结算的伤害：(施法者, 目标, 结算前的生命值+护盾)
+        self.event_bus.subscribe(EventName.ACTION_AFTER_ACT, self._on_action_after_act)
+        # 伤害请求的第一个和最后一个监听器：结算前后目标生命值和护盾的差就是这次伤害的实际数值
+        self.event_bus.subscribe(EventName.DAMAGE_REQUEST, self._before_damage, priority=-1)
+        self.event_bus.subscribe(EventName.DAMAGE_REQUEST, self._after_damage, priority=sys.maxsize)
+
+    @staticmethod
+    def _durability(entity: Entity) -> float:
+        health = entity.get_component(HealthComponent)
+        shield = entity.get_component(ShieldComponent)
+        return (health.hp if health else 0.0) + (shield.shield_value if shield else 0.0)
+
+    def _on_action_after_act(self, event: GameEvent):
+        self._turns += 1
+
+    def _before_damage(self, event: GameEvent):
+        payload = event.payload
+        self._pending_damage.append((payload.caster, payload.target, self._durability(payload.target)))
+
+    def _after_damage(self, event: GameEvent):
+        caster, target, before = self._pending_damage.pop()
+        dealt = before - self._durability(target)
+        if caster is not None and dealt > 0:
+            self._damage[caster] = self._damage.get(caster, 0.0) + dealt
+
+    def _damage_by_name(self) -> dict[str, float]:
+        # 名称重复的实体（例如同一个模板放在两个位置）加上位置ID区分
+        result: dict[str, float] = {}
+        for entity, dealt in self._damage.items():
+            key = entity.name
+            if key in result:
+                position = entity.get_component(PositionComponent)
+                key = f"{entity.name}@{position.position_id if position else entity.id}"
+            result[key] = dealt
+        return result
+
+    def run(self, spec: BattleSpec) -> BattleSummary:
+        start_time = time.perf_counter()
+        base_battlefields = self.base_data_manager.battlefield_data
+        if spec.battlefield_id not in base_battlefields:
+            raise ValueError(f"找不到战场配置 {spec.battlefield_id}")
+        if spec.avatars is None and spec.enemies is None:
+            self.data_manager.battlefield_data = base_battlefields
+        else:
+            self.data_manager.battlefield_data = {
+                **base_battlefields, spec.battlefield_id: apply_overrides(base_battlefields[spec.battlefield_id], spec)}
+
+        self.world.restore(self._pristine)
+        self.world.rng.seed(spec.seed)
+        self._turns = 0
+        self._damage.clear()
+        self._pending_damage.clear()
+        self.event_bus.error_counts.clear()
+
+        init_battlefield(self.event_bus, spec.battlefield_id)
+        outcome = self.world.run_battle(self.max_steps)
+        return BattleSummary(
+            seed=spec.seed,
+            winner=WINNING_TEAMS.get(outcome.result),
+            turns=self._turns,
+            steps=outcome.steps,
+            damage_dealt=self._damage_by_name(),
+            wall_time=time.perf_counter() - start_time,
+            listener_errors=sum(self.event_bus.error_counts.values()),
+        )
+
+# --- 工作进程 ---
+
+_worker: Optional[BattleWorker] = None
+
+def _init_worker(choice_policy: ChoicePolicy, max_steps: int):
+    global _worker
+    # 工作进程不输出战斗播报
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    _worker = BattleWorker(load_game_data(), choice_policy, max_steps)
+
+def _run_in_worker(spec: BattleSpec) -> BattleSummary:
+    return _worker.run(spec)
+
+def run_battle_farm(specs: Iterable[BattleSpec], max_workers: Optional[int] = None,
+                    choice_policy: ChoicePolicy = first_choice, max_steps: int = DEFAULT_MAX_BATTLE_STEPS,
+                    chunksize: Optional[int] = None) -> list[BattleSummary]:
+    """
+    在进程池中无界面地跑完所有战斗，按 specs 的顺序返回结果。
+    每个工作进程启动时加载一次数据、装配一次世界，之后所有分到它的战斗都复用这个世界。
+    choice_policy 必须是可以被 pickle 的模块级函数。
+    """
+    specs = list(specs)
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(specs) // (max_workers * DEFAULT_CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(choice_policy, max_steps)) as executor:
+        return list(executor.map(_run_in_worker, specs, chunksize=chunksize))
+
+def main(count: int = 1000, max_workers: Optional[int] = None):
+    specs = [BattleSpec(seed=seed) for seed in range(count)]
+    start_time = time.perf_counter()
+    results = run_battle_farm(specs, max_workers)
+    elapsed = time.perf_counter() - start_time
+
+    wins: dict[Optional[str], int] = {}
+    for summary in results:
+        wins[summary.winner] = wins.get(summary.winner, 0) + 1
+    print(f"{count} 场战斗，耗时 {elapsed:.2f} s（{count / elapsed * 60:.0f} 场/分钟）")
+    print("胜方: " + "，".join(f"{winner or '未分胜负'} {n}" for winner, n in wins.items()))
+    print(f"平均行动次数 {sum(s.turns for s in results) / max(count, 1):.1f}，"
+          f"监听器错误 {sum(s.listener_errors for s in results)} 次")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else None)
@@ -0,0 +1,70 @@
+import asyncio
+import inspect
+import traceback
+from typing import Callable, Coroutine, Optional
+from .enums import EventName, ListenerErrorPolicy
+from .event_bus import EventBus, GameEvent, Subscription
+
+class AsyncEventBus(EventBus):
+    """
+    支持协程监听器的事件总线。
+    普通监听器照常同步执行；协程监听器（async def）在派发时被创建为任务交给事件循环，
+    派发方不等待它完成。等待玩家输入、AI 决策等耗时操作可以写成协程监听器，
+    在等待期间让出事件循环，供同一进程里的其他战斗继续运行。
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending_tasks: set[asyncio.Task] = set()
+        self._task_errors: list[BaseException] = []
+
+    @property
+    def has_pending_tasks(self) -> bool:
+        return bool(self._pending_tasks)
+
+    def _wrap_listener(self, handle: Subscription, listener: Callable, weak: bool) -> Callable:
+        is_coroutine = inspect.iscoroutinefunction(listener)
+        wrapped = super()._wrap_listener(handle, listener, weak)
+        if not is_coroutine:
+            return wrapped
+
+        event_name = handle.event_name
+        def spawn_listener(event: GameEvent):
+            coroutine = wrapped(event)
+            if coroutine is not None:
+                self._spawn(event_name, coroutine)
+        spawn_listener.__qualname__ = getattr(listener, '__qualname__', spawn_listener.__qualname__)
+        return spawn_listener
+
+    def _spawn(self, event_name: EventName, coroutine: Coroutine):
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._pending_tasks.add(task)
+        task.add_done_callback(lambda done: self._on_task_done(event_name, done))
+
+    def _on_task_done(self, event_name: EventName, task: asyncio.Task):
+        self._pending_tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            return
+        # 协程监听器的异常无法抛回派发方，这里按照总线的异常策略处理
+        self.error_counts[event_name] = self.error_counts.get(event_name, 0) + 1
+        if self.error_policy == ListenerErrorPolicy.RAISE:
+            self._task_errors.append(error)
+        elif self.error_policy == ListenerErrorPolicy.ISOLATE:
+            print(f"[CRITICAL ERROR] Error in async event listener for {event_name}")
+            print("".join(traceback.format_exception(error)))
+
+    async def drain(self, timeout: Optional[float] = None):
+        """
+        等待所有协程监听器执行完毕（包括它们执行过程中新派发出来的协程监听器）。
+        RAISE 策略下，协程监听器抛出的第一个异常会在这里抛出。
+        """
+        while self._pending_tasks:
+            await asyncio.wait(set(self._pending_tasks), timeout=timeout)
+            if timeout is not None:
+                break
+        if self._task_errors:
+            error = self._task_errors[0]
+            self._task_errors.clear()
+            raise error
@@ -0,0 +1,170 @@
+from array import array
+from typing import TYPE_CHECKING, Any, Optional
+
+from .components import (HealthComponent, ManaComponent, EnergyComponent, SpeedComponent,
+                         ShieldComponent, UltimateChargeComponent, slot_names)
+
+try:  # NumPy 是可选依赖，没有安装时退回到标准库 array
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from .entity import Entity
+
+DEFAULT_CAPACITY = 64
+
+# 组件类型 -> ((列名, 组件上的属性名), ...)；这些组件的数值存放在按实体行号索引的列中
+COLUMN_SPECS: dict[type, tuple[tuple[str, str], ...]] = {
+    HealthComponent: (("hp", "_hp"), ("max_hp", "_max_hp")),
+    ManaComponent: (("mana", "mana"), ("max_mana", "max_mana")),
+    EnergyComponent: (("energy", "energy"), ("max_energy", "max_energy"), ("recovery_per_turn", "recovery_per_turn")),
+    SpeedComponent: (("speed", "speed"),),
+    ShieldComponent: (("shield_value", "shield_value"),),
+    UltimateChargeComponent: (("charge", "charge"), ("max_charge", "max_charge"), ("charge_per_spell", "charge_per_spell")),
+}
+
+def _column_key(component_type: type, column: str) -> str:
+    return f"{component_type.__name__}.{column}"
+
+class ComponentStore:
+    """
+    可选的列式组件存储（struct-of-arrays）。
+    挂接到存储上的实体会分配一个行号，上面 COLUMN_SPECS 中组件的数值字段改为存放在按行号索引的列里，
+    实体上保留的是绑定到这些列的组件对象，原有的 comp.hp / comp.mana 等读写方式不变。
+    系统可以通过 column()/mask() 一次性读写所有实体的某个字段。
+    安装了 NumPy 时列为 ndarray，可以做向量化运算；否则为标准库 array。
+    目前只有 DeadSystem 用它批量筛选生命值归零的实体；AP 增长要经 STAT_QUERY 取状态效果修正后的速度，
+    能量恢复只发生在行动者的回合结束时，这两处仍逐个实体计算。
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, use_numpy: Optional[bool] = None):
+        self.use_numpy = (np is not None) if use_numpy is None else use_numpy
+        if self.use_numpy and np is None:
+            raise ImportError("ComponentStore(use_numpy=True) 需要安装 numpy")
+        self.capacity = capacity
+        self.entities: list[Optional['Entity']] = [None] * capacity  # 行号 -> 实体
+        self._free_rows: list[int] = list(range(capacity - 1, -1, -1))
+        self._columns: dict[str, Any] = {}
+        self._masks: dict[type, Any] = {}   # 组件类型 -> 该行是否有此组件（0/1）
+        self._bound_types: dict[type, type] = {}
+        self._carried_slots: dict[type, tuple[str, ...]] = {}  # 绑定时原样带过去的（非列）属性
+        for component_type, spec in COLUMN_SPECS.items():
+            for column, _ in spec:
+                self._columns[_column_key(component_type, column)] = self._new_column('d', capacity)
+            self._masks[component_type] = self._new_column('b', capacity)
+            self._bound_types[component_type] = self._make_bound_type(component_type, spec)
+            column_attributes = {attribute for _, attribute in spec}
+            self._carried_slots[component_type] = tuple(
+                name for name in slot_names(component_type) if name not in column_attributes)
+
+    def _new_column(self, typecode: str, size: int):
+        if self.use_numpy:
+            return np.zeros(size, dtype=np.float64 if typecode == 'd' else np.int8)
+        return array(typecode, bytes(array(typecode).itemsize * size))
+
+    def _grow(self):
+        old_capacity = self.capacity
+        self.capacity *= 2
+        for columns in (self._columns, self._masks):
+            for key, column in columns.items():
+                if self.use_numpy:
+                    grown = np.zeros(self.capacity, dtype=column.dtype)
+                    grown[:old_capacity] = column
+                    columns[key] = grown
+                else:
+                    column.extend(self._new_column(column.typecode, old_capacity))
+        self.entities.extend([None] * old_capacity)
+        self._free_rows.extend(range(self.capacity - 1, old_capacity - 1, -1))
+
+    def _make_bound_type(self, component_type: type, spec: tuple[tuple[str, str], ...]) -> type:
+        namespace: dict[str, Any] = {'__slots__': ('_store', '_store_row')}
+        for column, attribute in spec:
+            namespace[attribute] = self._make_column_property(_column_key(component_type, column))
+        return type(f"Stored{component_type.__name__}", (component_type,), namespace)
+
+    def _make_column_property(self, key: str) -> property:
+        if self.use_numpy:
+            def getter(component):
+                return component._store._columns[key][component._store_row].item()
+        else:
+            def getter(component):
+                return component._store._columns[key][component._store_row]
+        def setter(component, value):
+            component._store._columns[key][component._store_row] = value
+        return property(getter, setter)
+
+    # --- 实体挂接 ---
+
+    def attach(self, entity: 'Entity') -> int:
+        """给实体分配行号，并把它现有的数值组件迁移到列中"""
+        if not self._free_rows:
+            self._grow()
+        row = self._free_rows.pop()
+        self.entities[row] = entity
+        entity._store = self
+        entity._store_row = row
+        for component_type in COLUMN_SPECS:
+            component = entity._components.get(component_type)
+            if component is not None:
+                entity._components[component_type] = self.bind(entity, component)
+        return row
+
+    def detach(self, entity: 'Entity'):
+        """把实体的数值组件恢复为普通对象，并回收行号"""
+        row = entity._store_row
+        for component_type in COLUMN_SPECS:
+            if entity._components.get(component_type) is not None:
+                entity._components[component_type] = self.unbind(entity, component_type)
+        self.entities[row] = None
+        self._free_rows.append(row)
+        entity._store = None
+        entity._store_row = -1
+
+    def bind(self, entity: 'Entity', component: Any) -> Any:
+        """返回绑定到实体所在行的组件对象，数值写入列中"""
+        component_type = type(component)
+        spec = COLUMN_SPECS[component_type]
+        row = entity._store_row
+        bound = object.__new__(self._bound_types[component_type])
+        for name in self._carried_slots[component_type]:
+            if hasattr(component, name):
+                setattr(bound, name, getattr(component, name))
+        bound._store = self
+        bound._store_row = row
+        for column, attribute in spec:
+            self._columns[_column_key(component_type, column)][row] = getattr(component, attribute)
+        self._masks[component_type][row] = 1
+        return bound
+
+    def unbind(self, entity: 'Entity', component_type: type) -> Any:
+        """返回与列中当前数值相同的普通组件对象，并清除该行的组件标记"""
+        bound = entity._components[component_type]
+        row = entity._store_row
+        plain = object.__new__(component_type)
+        for name in self._carried_slots[component_type]:
+            if hasattr(bound, name):
+                setattr(plain, name, getattr(bound, name))
+        for _, attribute in COLUMN_SPECS[component_type]:
+            setattr(plain, attribute, getattr(bound, attribute))
+        self._masks[component_type][row] = 0
+        return plain
+
+    # --- 列访问 ---
+
+    def column(self, component_type: type, column: str):
+        """某个数值字段的整列（按行号索引）。只有 mask() 为 1 的行有意义"""
+        return self._columns[_column_key(component_type, column)]
+
+    def mask(self, component_type: type):
+        return self._masks[component_type]
+
+    def entities_where_le(self, component_type: type, column: str, value: float) -> list['Entity']:
+        """拥有该组件且字段值 <= value 的所有实体"""
+        values = self.column(component_type, column)
+        mask = self.mask(component_type)
+        if self.use_numpy:
+            rows = np.flatnonzero(mask.astype(bool) & (values <= value)).tolist()
+        else:
+            rows = [row for row, (present, current) in enumerate(zip(mask, values)) if present and current <= value]
+        entities = self.entities
+        return [entities[row] for row in rows]
@@ -2,12 +2,29 @@ from dataclasses import dataclass, field
 from typing import List, TYPE_CHECKING, Dict, Optional, Any
 
 from game.core.entity import Entity
+from game.core.enums import EventName
 from game.core.event_bus import EventBus, GameEvent
+from game.core.payloads import HealthChangePayload
 from game.status_effects.status_effect import StatusEffect
 
+_slot_names_cache: Dict[type, tuple] = {}
+
+def slot_names(component_type: type) -> tuple:
+    """组件（以及 StatusEffect 等）都是 __slots__ 类型，实例属性即整个继承链上声明的槽位"""
+    names = _slot_names_cache.get(component_type)
+    if names is None:
+        names = []
+        for klass in reversed(component_type.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            names.extend((slots,) if isinstance(slots, str) else slots)
+        names = _slot_names_cache[component_type] = tuple(names)
+    return names
+
 # --- 核心组件 ---
 @dataclass
 class HealthComponent:
+    __slots__ = ('_owner', '_event_bus', '_hp', '_max_hp')
+
     def __init__(self, owner: 'Entity', event_bus: 'EventBus', hp: float, max_hp: float):
         self._owner = owner
         self._event_bus = event_bus
@@ -19,48 +36,52 @@ class HealthComponent:
 
     @hp.setter
     def hp(self, value: float):
-        from .enums import EventName
-        from .payloads import HealthChangePayload
         old_hp = self._hp
-        self._hp = max(0, min(value, self.max_hp))
-        if self._hp != old_hp:
-            self._event_bus.dispatch(GameEvent(EventName.HEALTH_CHANGED, HealthChangePayload(self._owner, old_hp, self._hp, self.max_hp)))
+        self._hp = new_hp = max(0, min(value, self.max_hp))
+        if new_hp != old_hp:
+            # 世界开启了生命值批处理时只记录变化，由 HealthChangeBatchSystem 在行动结束时合并派发
+            # 没有所属实体、或所属实体还不在世界中时直接派发
+            world = getattr(self._owner, '_world', None)
+            if world is not None and world.health_tracker is not None:
+                world.health_tracker.record(self._owner, old_hp, new_hp, self.max_hp)
+            else:
+                self._event_bus.dispatch(GameEvent(EventName.HEALTH_CHANGED, HealthChangePayload(self._owner, old_hp, new_hp, self.max_hp)))
     
     @property
     def max_hp(self) -> float: return self._max_hp
 
-@dataclass
+@dataclass(slots=True)
 class ManaComponent:
     mana: float
     max_mana: float
 
-@dataclass
+@dataclass(slots=True)
 class EnergyComponent:
     """能量点组件 - 管理角色的能量点"""
     energy: float
     max_energy: float
     recovery_per_turn: float = 1.0  # 每回合恢复的能量点数，可通过装备等修改
 
-@dataclass
+@dataclass(slots=True)
 class UltimateChargeComponent:
     """终极技能充能条组件 - 管理角色的终极技能充能"""
     charge: float = 0.0  # 当前充能值（0-200%）
     max_charge: float = 200.0  # 最大充能值
     charge_per_spell: float = 10.0  # 每次施法获得的充能值
 
-@dataclass
+@dataclass(slots=True)
 class SpeedComponent:
     speed: int
 
-@dataclass
+@dataclass(slots=True)
 class SpellListComponent:
     spells: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class UltimateSpellListComponent:
     ultimate_spells: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class BattlefieldComponent:
     """战场组件，存储当前战场的信息"""
     battlefield_id: str
@@ -70,7 +91,7 @@ class BattlefieldComponent:
     defeat_condition: str
     is_completed: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class BattlefieldConfigComponent:
     """战场配置组件，存储战场的基本配置"""
     name: str
@@ -79,20 +100,20 @@ class BattlefieldConfigComponent:
     starting_avatars: List[str]
     battlefield_id: str
 
-@dataclass
+@dataclass(slots=True)
 class EnemyWaveComponent:
     """敌人波次组件，存储当前波次的敌人信息"""
     round_number: int
     enemies: List[str]  # 简化为敌人模板名称列表
     is_spawned: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class TeamComponent:
     """队伍组件，标识实体属于哪个队伍"""
     team_id: str  # "player" 或 "enemy"
     position: str = "front"  # "front" 或 "back"
 
-@dataclass
+@dataclass(slots=True)
 class AIComponent:
     """AI组件，控制敌人的智能行为"""
     ai_template: str  # AI模板名称
@@ -101,47 +122,47 @@ class AIComponent:
     last_action_time: float = 0.0  # 上次行动时间
     action_cooldown: float = 1.0   # 行动冷却时间
 
-@dataclass
+@dataclass(slots=True)
 class PositionComponent:
     """位置组件，用于AP值相等时的先手判断"""
     position_id: int
 
-@dataclass
+@dataclass(slots=True)
 class ShieldComponent:
     shield_value: float
 
-@dataclass
+@dataclass(slots=True)
 class StatusEffectContainerComponent:
     effects: List['StatusEffect'] = field(default_factory=list) # type: ignore
 
-@dataclass
+@dataclass(slots=True)
 class GrievousWoundsComponent:
     reduction: float = 0.5
 
-@dataclass
+@dataclass(slots=True)
 class ResistanceComponent:
     element: str
     percentage: float
 
-@dataclass
+@dataclass(slots=True)
 class ThornsComponent:
     thorns_percentage: float
 
-@dataclass
+@dataclass(slots=True)
 class CounterStrikeComponent:
     """反震组件 - 被攻击时造成固定数值的反伤"""
     counter_damage: float = 0.0  # 固定反伤数值
 
-@dataclass
+@dataclass(slots=True)
 class CritComponent:
     crit_chance: float = 0.0
     crit_damage_multiplier: float = 2.0
 
-@dataclass
+@dataclass(slots=True)
 class OverhealToShieldComponent:
     conversion_ratio: float = 1.0
 
-@dataclass
+@dataclass(slots=True)
 class AttackTriggerPassiveComponent:
     """攻击触发被动效果组件"""
     passive_id: str
@@ -157,24 +178,27 @@ class AttackTriggerPassiveComponent:
     trigger_condition: str = "always"  # 触发条件：always, on_damage, on_hit
 
 # --- 状态标记组件 ---
-@dataclass
+@dataclass(slots=True)
 class PlayerControlledComponent: pass
-@dataclass
+@dataclass(slots=True)
 class AIControlledComponent: pass
-@dataclass
+@dataclass(slots=True)
 class DeadComponent: pass
-@dataclass
+@dataclass(slots=True)
 class EntageShieldUsedComponent: pass
 
-@dataclass
+@dataclass(slots=True)
 class StatsComponent:
     """统一管理角色属性的组件"""
     attack: float = 0.0  # 攻击力
     defense: float = 0.0  # 防御力
     base_attack: float = 0.0  # 基础攻击力
     base_defense: float = 0.0  # 基础防御力
+    # 由 EquipmentSystem 首次计算装备加成时写入的基础属性，未写入前 hasattr 为 False
+    _base_attack: float = field(init=False, repr=False, compare=False)
+    _base_defense: float = field(init=False, repr=False, compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class EquipmentComponent:
     """装备组件，管理角色的装备"""
     equipment_slots: Dict[str, Optional[str]] = None  # 装备槽位 -> 装备ID
@@ -222,7 +246,7 @@ class EquipmentComponent:
         """获取所有已装备的物品"""
         return list(self.equipped_items.values())
 
-@dataclass
+@dataclass(slots=True)
 class EquipmentItem:
     """装备物品类"""
     equipment_id: str
@@ -269,7 +293,7 @@ class EquipmentItem:
         """获取当前耐久度百分比"""
         return (self.current_durability / self.max_durability) * 100
 
-@dataclass
+@dataclass(slots=True)
 class InventoryComponent:
     """物品栏组件，管理角色的物品"""
     items: Dict[str, 'InventoryItem'] = None  # 物品ID -> 物品实例
@@ -320,7 +344,7 @@ class InventoryComponent:
             return False
         return self.items[item_id].quantity >= quantity
 
-@dataclass
+@dataclass(slots=True)
 class InventoryItem:
     """物品栏中的物品实例"""
     item_id: str
@@ -1,3 +1,4 @@
+import itertools
 from typing import Any, TYPE_CHECKING
 from game.core.payloads import StatQueryPayload
 from game.core.event_bus import EventName, GameEvent
@@ -6,12 +7,25 @@ from game.core.event_bus import EventBus
 if TYPE_CHECKING:
     from .components import ResistanceComponent
 
+# 进程内唯一的实体ID；名称可能重复（例如同一模板生成的多个敌人），ID 不会
+_entity_ids = itertools.count(1)
+
+def reserve_entity_ids(max_id: int):
+    """保证之后新建的实体ID都大于 max_id（还原快照等沿用外部实体ID的场合调用）"""
+    global _entity_ids
+    _entity_ids = itertools.count(max(next(_entity_ids), max_id + 1))
+
 class Entity:
     def __init__(self, name: str, event_bus: 'EventBus'): 
+        self.id = next(_entity_ids)
         self.name = name
         self.event_bus = event_bus
         self._components = {}  # 存储单个组件
         self._component_lists = {}  # 存储多个同类型组件
+        self._store = None  # 挂接的列式组件存储（可选，见 ComponentStore）
+        self._store_row = -1
+        self._world = None  # 所在的世界，用于在组件增删时更新世界的实体索引
+        self._world_seq = -1
     
     def get_final_stat(self, stat_name: str, base_value: float) -> float:
         """通过事件总线查询考虑所有效果后的最终属性值"""
@@ -34,7 +48,13 @@ class Entity:
             return c
         else:
             # 其他组件类型只允许一个实例
+            if self._store is not None and component_type in self._store._bound_types:
+                if component_type in self._components:
+                    self._store.unbind(self, component_type)
+                c = self._store.bind(self, c)  # 数值字段存放到列式存储中
             self._components[component_type] = c
+            if self._world is not None:
+                self._world._on_component_added(self, component_type, c)
             return c
     
     def get_component(self, ct: type): 
@@ -61,7 +81,11 @@ class Entity:
         """移除指定类型的组件"""
         # 从单个组件中移除
         if ct in self._components:
+            if self._store is not None and ct in self._store._bound_types:
+                self._store.unbind(self, ct)
             del self._components[ct]
+            if self._world is not None:
+                self._world._on_component_removed(self, ct)
             return True
         # 从组件列表中移除第一个
         if ct in self._component_lists and self._component_lists[ct]:
@@ -50,6 +50,12 @@ class EventName(Enum):
     ROUND_END = auto()
     ENTITY_DEATH = auto()
 
+class ListenerErrorPolicy(Enum):
+    """事件监听器抛出异常时的处理策略，按事件总线整体设置"""
+    ISOLATE = auto()  # 打印错误并继续执行后续监听器
+    RAISE = auto()    # 直接向派发方抛出异常
+    COUNT = auto()    # 静默计数并继续执行后续监听器
+
 class BattleTurnRule(Enum):
     TURN_BASED = auto()
     AP_BASED = auto()
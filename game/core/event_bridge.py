@@ -0,0 +1,94 @@
+import dataclasses
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+from . import payloads as payload_module
+from .entity import Entity
+from .enums import EventName
+from .event_bus import EventBus, GameEvent
+
+# 默认转发给旁路进程的事件：日志和界面文字播报
+DEFAULT_BRIDGED_EVENTS = (EventName.LOG_REQUEST, EventName.UI_MESSAGE)
+DEFAULT_BATCH_SIZE = 32
+
+class EntityRef(NamedTuple):
+    """跨进程传输时代替 Entity 的轻量引用：实体ID 和名称（用于显示）"""
+    id: int
+    name: str
+
+class _DataclassRecord(NamedTuple):
+    type_name: str
+    values: tuple
+
+def encode_value(value: Any) -> Any:
+    """把载荷转换成可紧凑序列化的形式：Entity 换成 EntityRef，dataclass 换成按字段顺序的元组"""
+    if isinstance(value, Entity):
+        return EntityRef(value.id, value.name)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _DataclassRecord(type(value).__name__,
+                                tuple(encode_value(getattr(value, f.name)) for f in dataclasses.fields(value)))
+    if isinstance(value, (list, tuple)):
+        return type(value)(encode_value(item) for item in value)
+    if isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+    return value
+
+def decode_value(value: Any) -> Any:
+    """encode_value 的逆过程；实体保持为 EntityRef"""
+    if isinstance(value, _DataclassRecord):
+        payload_type = getattr(payload_module, value.type_name, None)
+        if payload_type is None:
+            return value  # 不是 payloads 中定义的类型，原样交给接收方
+        return payload_type(*(decode_value(item) for item in value.values))
+    if isinstance(value, EntityRef):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(decode_value(item) for item in value)
+    if isinstance(value, dict):
+        return {key: decode_value(item) for key, item in value.items()}
+    return value
+
+def decode_event(record: tuple) -> GameEvent:
+    event_value, payload = record
+    return GameEvent(EventName(event_value), decode_value(payload))
+
+def encode_event(event: GameEvent) -> tuple:
+    return event.name.value, encode_value(event.payload)
+
+class EventBridge:
+    """
+    事件桥：订阅选定的事件，编码后按批写入 multiprocessing 队列，
+    由旁路进程（见 game.sidecar）重新派发给日志、界面播报和统计等接收方。
+    本进程只负责游戏逻辑。
+    事件按帧合并订阅（见 EventBus.coalesce）：派发时立即编码，每帧末尾把本帧的事件
+    按每批最多 batch_size 条写入队列，旁路进程的输出最多落后一帧。
+    编码时已经复制了载荷，池化事件（见 EventBus.dispatch_pooled）在派发后被回收也不受影响。
+    """
+    def __init__(self, event_bus: EventBus, queue: Any, event_names: Iterable[EventName] = DEFAULT_BRIDGED_EVENTS,
+                 batch_size: int = DEFAULT_BATCH_SIZE, log_filter: Optional[Callable[[str], bool]] = None):
+        self.event_bus = event_bus
+        self.queue = queue
+        self.batch_size = batch_size
+        self.forwarded_count = 0
+        self._scope = event_bus.scope()
+
+        event_names = tuple(event_names)
+        with self._scope:
+            event_bus.coalesce(event_names, self._send, capture=encode_event)
+        if EventName.LOG_REQUEST in event_names:
+            # 日志也由旁路进程输出：旁路进程需要的标签即使本地 LogSystem 不输出也要派发
+            event_bus.add_log_filter(log_filter)
+
+    def _send(self, records: list[tuple]):
+        batch_size = self.batch_size
+        for start in range(0, len(records), batch_size):
+            self.queue.put(records[start:start + batch_size])
+        self.forwarded_count += len(records)
+
+    def flush(self):
+        """立即发出已缓存的事件（连同本帧其他合并事件一起交付），不必等到帧末"""
+        self.event_bus.flush_coalesced()
+
+    def close(self):
+        """停止转发，发出剩余事件并通知旁路进程退出"""
+        self.flush()
+        self._scope.close()
+        self.queue.put(None)
@@ -1,27 +1,509 @@
+import copy
 import traceback
+import weakref
+from collections import deque
+from time import perf_counter
 from dataclasses import dataclass
-from typing import Any, Callable
-from .enums import EventName
+from typing import Any, Callable, Iterable, Optional
+from .enums import EventName, ListenerErrorPolicy
+from .payloads import LogRequestPayload
+from .pool import ObjectPool
+from .event_bus_stats import EventBusStats
 
-@dataclass
+DEFAULT_LISTENER_PRIORITY = 100
+DEFAULT_MAX_CASCADE_DEPTH = 16
+UI_TEXT_GROUP = "ui_text"  # 文字播报的合并组：日志输出前只需先输出这一组，保持先后顺序
+
+# 按实体订阅时，默认根据载荷的哪个字段路由
+ENTITY_ROUTING_FIELDS: dict[EventName, str] = {
+    EventName.TURN_START: 'entity',
+    EventName.ACTION_REQUEST: 'acting_entity',
+    EventName.ACTION_AFTER_ACT: 'acting_entity',
+    EventName.POST_ACTION_SETTLEMENT: 'acting_entity',
+    EventName.CAST_SPELL_REQUEST: 'caster',
+    EventName.DAMAGE_REQUEST: 'target',
+    EventName.HEAL_REQUEST: 'target',
+    EventName.HEALTH_CHANGED: 'entity',
+    EventName.GAIN_SHIELD_REQUEST: 'target',
+    EventName.APPLY_STATUS_EFFECT_REQUEST: 'target',
+    EventName.REMOVE_STATUS_EFFECT_REQUEST: 'target',
+}
+
+@dataclass(slots=True)
 class GameEvent:
     name: EventName
     payload: Any = None
 
+@dataclass(slots=True)
+class PooledGameEvent(GameEvent):
+    """dispatch_pooled 从对象池取出的事件，派发结束后即被回收；需要保留时先用 detach_pooled_event 复制"""
+
+def detach_pooled_event(event: GameEvent) -> GameEvent:
+    """池化事件在派发结束后会被回收复用，要在派发之后继续持有时复制事件和载荷；普通事件原样返回"""
+    if type(event) is PooledGameEvent:
+        return GameEvent(event.name, copy.copy(event.payload))
+    return event
+
+class CascadeDepthError(RuntimeError):
+    """延迟模式下连锁结算超过最大深度，后续事件被丢弃（RAISE 策略下抛出）"""
+
+@dataclass(frozen=True)
+class Subscription:
+    """subscribe() 返回的订阅句柄，可交给 unsubscribe() 取消订阅"""
+    event_name: EventName
+    seq: int
+
+class SubscriptionScope:
+    """
+    订阅作用域。在 with 块内通过该总线创建的所有订阅都会记录到作用域里，
+    之后调用 close() 即可一次性取消（例如一场战斗结束时）。
+    退出 with 块只是停止记录，并不会取消订阅。
+    """
+    def __init__(self, event_bus: 'EventBus'):
+        self.event_bus = event_bus
+        self.subscriptions: list[Subscription] = []
+
+    def __enter__(self) -> 'SubscriptionScope':
+        self.event_bus._scopes.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.event_bus._scopes.remove(self)
+
+    def subscribe(self, event_name: EventName, listener: Callable, priority: int = DEFAULT_LISTENER_PRIORITY,
+                  **options) -> Subscription:
+        """在作用域外也可以直接通过作用域订阅，options 同 EventBus.subscribe"""
+        handle = self.event_bus.subscribe(event_name, listener, priority, **options)
+        if self not in self.event_bus._scopes:
+            self.subscriptions.append(handle)
+        return handle
+
+    def close(self):
+        """取消作用域内记录的所有订阅"""
+        for handle in self.subscriptions:
+            self.event_bus.unsubscribe(handle)
+        self.subscriptions.clear()
+
 class EventBus:
-    def __init__(self):
-        self._listeners: dict[EventName, list[Callable]] = {}
+    """
+    事件总线。
+    订阅关系会被预编译成按 EventName 整数值索引的监听器元组，
+    派发时只需一次列表索引即可拿到按优先级排好序的监听器。
+
+    延迟模式下，最外层的一次 dispatch() 是连锁结算的根事件：结算过程中通过 post() 派发的事件
+    不会递归派发，而是进入 FIFO 队列，在根事件的所有监听器执行完后依次排空。
+    """
+    def __init__(self, error_policy: ListenerErrorPolicy = ListenerErrorPolicy.ISOLATE,
+                 deferred: bool = False, max_cascade_depth: int = DEFAULT_MAX_CASCADE_DEPTH):
+        self._listeners: dict[EventName, list[tuple[int, int, Callable]]] = {}
+        self._dispatch_table: list[tuple[Callable, ...]] = [()] * (max(e.value for e in EventName) + 1)
+        # 按实体订阅的索引：事件 -> 路由字段 -> 实体 -> 监听器条目；没有按实体订阅的事件为 None
+        self._routes: list[Optional[dict[str, dict[Any, list[tuple[int, int, Callable]]]]]] = [None] * len(self._dispatch_table)
+        self._subscribe_seq = 0
+        self._scopes: list[SubscriptionScope] = []
+        self.error_counts: dict[EventName, int] = {}
+        self.stats: Optional[EventBusStats] = None  # 仅在开启统计时存在
+
+        # --- 延迟队列模式 ---
+        self.deferred = deferred
+        self.max_cascade_depth = max_cascade_depth
+        self._queue: deque[tuple[GameEvent, int]] = deque()
+        self._draining = False           # 是否处于一次连锁结算中（根事件派发到队列排空之间）
+        self._batch_listeners: dict[EventName, list[Callable]] = {}
+        self.current_depth = 0           # 当前正在处理的事件在连锁中的深度（根事件为0）
+        self.last_cascade_size = 0       # 上一次连锁结算共处理的事件数
+        self.dropped_event_count = 0     # 因超过最大连锁深度被丢弃的事件数
+        self.set_error_policy(error_policy)
+
+        # --- 池化事件 ---
+        # 每个总线一个对象池：分叉出的子世界、同一进程中的多个战斗互不复用对方派发中的事件
+        self._event_pool = ObjectPool(PooledGameEvent)
+
+        # --- 按帧合并 ---
+        self._coalesced: dict[int, tuple[Callable, list[GameEvent]]] = {}
+        self._coalesce_seq = 0
+        self._coalesce_groups: dict[int, str] = {}
+        self._flushing_coalesced = False
+
+        # --- 日志快速判断 ---
+        self._log_filter: Optional[Callable[[str], bool]] = None
+
+    def subscribe(self, event_name: EventName, listener: Callable, priority: int = DEFAULT_LISTENER_PRIORITY,
+                  weak: bool = False, entity: Any = None, entity_field: Optional[str] = None,
+                  where: Optional[Callable[[GameEvent], bool]] = None) -> Subscription:
+        """
+        订阅事件。priority 越小越先执行，相同优先级按订阅顺序执行。
+        weak=True 时总线只持有监听器的弱引用，监听器所属对象被回收后订阅自动取消。
+        entity 不为空时只接收载荷中 entity_field 字段（默认见 ENTITY_ROUTING_FIELDS）为该实体的事件，
+        派发时通过索引直接找到对应监听器；where 为额外的过滤条件，返回 False 时不调用监听器。
+        """
+        handle = Subscription(event_name, self._subscribe_seq)
+        self._subscribe_seq += 1
+        listener = self._wrap_listener(handle, listener, weak)
+        if where is not None:
+            listener = self._make_filtered_listener(listener, where)
+        entry = (priority, handle.seq, listener)
+
+        if entity is not None:
+            field_name = entity_field or ENTITY_ROUTING_FIELDS.get(event_name)
+            if field_name is None:
+                raise ValueError(f"{event_name} 没有默认的实体路由字段，请指定 entity_field")
+            routes = self._routes[event_name.value]
+            if routes is None:
+                routes = self._routes[event_name.value] = {}
+            routes.setdefault(field_name, {}).setdefault(entity, []).append(entry)
+        else:
+            if event_name not in self._listeners: self._listeners[event_name] = []
+            self._listeners[event_name].append(entry)
+            self._compile(event_name)
+
+        for scope in self._scopes:
+            scope.subscriptions.append(handle)
+        return handle
+
+    def unsubscribe(self, handle: Subscription) -> bool:
+        """取消订阅，返回该订阅此前是否存在"""
+        entries = self._listeners.get(handle.event_name)
+        if entries:
+            remaining = [entry for entry in entries if entry[1] != handle.seq]
+            if len(remaining) != len(entries):
+                self._listeners[handle.event_name] = remaining
+                self._compile(handle.event_name)
+                return True
+        return self._unsubscribe_routed(handle)
+
+    def _unsubscribe_routed(self, handle: Subscription) -> bool:
+        routes = self._routes[handle.event_name.value]
+        if routes is None:
+            return False
+        for field_name, index in routes.items():
+            for entity, entries in index.items():
+                remaining = [entry for entry in entries if entry[1] != handle.seq]
+                if len(remaining) == len(entries):
+                    continue
+                if remaining:
+                    index[entity] = remaining
+                else:
+                    del index[entity]
+                    if not index:
+                        del routes[field_name]
+                        if not routes:
+                            self._routes[handle.event_name.value] = None
+                return True
+        return False
+
+    def _route(self, event: GameEvent, routes: dict) -> tuple[Callable, ...]:
+        """合并全局监听器和命中的按实体监听器，按优先级排序"""
+        matched = None
+        payload = event.payload
+        for field_name, index in routes.items():
+            entries = index.get(getattr(payload, field_name, None))
+            if entries:
+                matched = entries if matched is None else matched + entries
+        if matched is None:
+            return self._dispatch_table[event.name.value]
+        return tuple(listener for _, _, listener in sorted(self._listeners.get(event.name, []) + matched,
+                                                           key=lambda entry: (entry[0], entry[1])))
+
+    @staticmethod
+    def _make_filtered_listener(listener: Callable, where: Callable[[GameEvent], bool]) -> Callable:
+        def filtered_listener(event: GameEvent):
+            if where(event):
+                return listener(event)
+        filtered_listener.__qualname__ = getattr(listener, '__qualname__', filtered_listener.__qualname__)
+        return filtered_listener
+
+    def scope(self) -> SubscriptionScope:
+        """创建一个订阅作用域，用于统一清理一场战斗创建的订阅"""
+        return SubscriptionScope(self)
+
+    def _wrap_listener(self, handle: Subscription, listener: Callable, weak: bool) -> Callable:
+        """订阅时对监听器做包装，子类可以扩展"""
+        return self._make_weak_listener(handle, listener) if weak else listener
+
+    def _make_weak_listener(self, handle: Subscription, listener: Callable) -> Callable:
+        # 回调里只弱引用总线，避免监听器反过来让总线常驻
+        bus_ref = weakref.ref(self)
+        def on_collected(_):
+            bus = bus_ref()
+            if bus is not None:
+                bus.unsubscribe(handle)
+
+        if hasattr(listener, '__self__') and hasattr(listener, '__func__'):
+            listener_ref = weakref.WeakMethod(listener, on_collected)
+        else:
+            listener_ref = weakref.ref(listener, on_collected)
 
-    def subscribe(self, event_name: EventName, listener: Callable):
-        if event_name not in self._listeners: self._listeners[event_name] = []
-        self._listeners[event_name].append(listener)
+        def weak_listener(event: GameEvent):
+            target = listener_ref()
+            if target is not None:
+                return target(event)
+        weak_listener.__qualname__ = getattr(listener, '__qualname__', weak_listener.__qualname__)
+        return weak_listener
 
-    def dispatch(self, event: GameEvent):
-        if event.name in self._listeners:
-            for callback in self._listeners[event.name]:
+    def _compile(self, event_name: EventName):
+        """重建单个事件的派发元组"""
+        entries = sorted(self._listeners.get(event_name, []), key=lambda entry: (entry[0], entry[1]))
+        self._dispatch_table[event_name.value] = tuple(listener for _, _, listener in entries)
+
+    def get_listeners(self, event_name: EventName) -> tuple[Callable, ...]:
+        """获取某个事件已编译好的全局监听器元组（按执行顺序，不含按实体订阅的监听器）"""
+        return self._dispatch_table[event_name.value]
+
+    def set_error_policy(self, error_policy: ListenerErrorPolicy):
+        """切换监听器异常处理策略。策略在这里一次性选定，而不是在每次派发时判断。"""
+        self.error_policy = error_policy
+        self._bind_dispatch()
+
+    def enable_instrumentation(self) -> EventBusStats:
+        """
+        开启统计：按事件和监听器记录调用次数、累计耗时和延迟直方图。
+        未开启时派发路径与统计完全无关，不产生任何额外开销。
+        """
+        if self.stats is None:
+            self.stats = EventBusStats()
+            self._bind_dispatch()
+        return self.stats
+
+    def disable_instrumentation(self) -> Optional[EventBusStats]:
+        """关闭统计，返回已收集的数据"""
+        stats, self.stats = self.stats, None
+        self._bind_dispatch()
+        return stats
+
+    def _bind_dispatch(self):
+        if self.stats is not None:
+            self._dispatch_listeners = self._dispatch_instrumented
+        elif self.error_policy == ListenerErrorPolicy.RAISE:
+            self._dispatch_listeners = self._dispatch_raise
+        else:
+            self._dispatch_listeners = self._dispatch_isolated
+        # 延迟模式下外面再包一层：最外层的派发负责排空连锁队列
+        self.dispatch = self._dispatch_deferred if self.deferred else self._dispatch_listeners
+
+    # dispatch(event) 由 _bind_dispatch 绑定为下面三种实现之一（延迟模式下由 _dispatch_deferred 调用）
+
+    def _dispatch_raise(self, event: GameEvent):
+        value = event.name.value
+        routes = self._routes[value]
+        for callback in self._dispatch_table[value] if routes is None else self._route(event, routes):
+            callback(event)
+
+    def _dispatch_isolated(self, event: GameEvent):
+        # 整个派发只进入一次 try；某个监听器出错后从下一个监听器继续
+        value = event.name.value
+        routes = self._routes[value]
+        callbacks = iter(self._dispatch_table[value] if routes is None else self._route(event, routes))
+        while True:
+            try:
+                for callback in callbacks:
+                    callback(event)
+                return
+            except Exception:
+                self._on_listener_error(event)
+
+    def _dispatch_instrumented(self, event: GameEvent):
+        stats = self.stats
+        event_start = perf_counter()
+        value = event.name.value
+        routes = self._routes[value]
+        try:
+            for callback in self._dispatch_table[value] if routes is None else self._route(event, routes):
+                start = perf_counter()
                 try:
                     callback(event)
-                except Exception as e:
-                    error_message = f"Error in event listener for {event.name}"
-                    print(f"[CRITICAL ERROR] {error_message}")
-                    print(traceback.format_exc())
\ No newline at end of file
+                except Exception:
+                    if self.error_policy == ListenerErrorPolicy.RAISE:
+                        raise
+                    self._on_listener_error(event)
+                finally:
+                    stats.record_listener(event.name, callback, perf_counter() - start)
+        finally:
+            stats.record_event(event.name, perf_counter() - event_start)
+
+    def dispatch_pooled(self, event_name: EventName, payload: Any, payload_pool: Optional[ObjectPool] = None):
+        """
+        用对象池中的 GameEvent 派发，派发结束后立即回收事件对象；给出 payload_pool 时载荷也一并回收。
+        监听器不能在派发结束后继续持有事件或载荷（协程监听器等），需要保留时用 detach_pooled_event 复制；
+        按帧合并的订阅会自动复制。可以用 pool.set_pool_debug(True) 检查。
+        """
+        event_pool = self._event_pool
+        event = event_pool.acquire(event_name, payload)
+        try:
+            self.dispatch(event)
+        finally:
+            event_pool.release(event)
+            if payload_pool is not None:
+                payload_pool.release(payload)
+
+    def set_deferred(self, deferred: bool):
+        """开启或关闭延迟队列模式"""
+        self.deferred = deferred
+        self._bind_dispatch()
+
+    def _dispatch_deferred(self, event: GameEvent):
+        if self._draining:
+            # 连锁结算内部的同步派发照常执行，深度不变
+            self._dispatch_listeners(event)
+            return
+        self._draining = True
+        self.current_depth = 0
+        self.last_cascade_size = 1
+        try:
+            self._dispatch_listeners(event)
+            self._drain()
+        finally:
+            self._draining = False
+            self.current_depth = 0
+            self._queue.clear()
+
+    def subscribe_batch(self, event_name: EventName, listener: Callable):
+        """
+        订阅批量事件（仅在延迟模式排空队列时生效）。
+        队列中同名且目标(payload.target)相同的事件会被连续处理，
+        处理完后以 list[GameEvent] 的形式一次性交给批量监听器。
+        """
+        self._batch_listeners.setdefault(event_name, []).append(listener)
+
+    def post(self, event: GameEvent):
+        """
+        派发一个由其他事件引发的后续事件（反伤、吸血、攻击触发被动等）。
+        非延迟模式下等同于 dispatch；延迟模式下，若已处于连锁结算中则入队，
+        在根事件的监听器全部执行完后再派发；否则该事件本身成为连锁的根事件。
+        超过最大连锁深度的事件会被丢弃，并按异常处理策略报告（见 _on_cascade_overflow）。
+        """
+        if not self.deferred or not self._draining:
+            self.dispatch(event)
+            return
+        depth = self.current_depth + 1
+        if depth > self.max_cascade_depth:
+            self._on_cascade_overflow(event)
+            return
+        self._queue.append((event, depth))
+
+    def _on_cascade_overflow(self, event: GameEvent):
+        self.dropped_event_count += 1
+        self.error_counts[event.name] = self.error_counts.get(event.name, 0) + 1
+        message = f"连锁深度超过 {self.max_cascade_depth}，丢弃事件 {event.name.name}"
+        if self.error_policy == ListenerErrorPolicy.RAISE:
+            raise CascadeDepthError(message)
+        if self.error_policy == ListenerErrorPolicy.ISOLATE:
+            print(f"[CASCADE WARNING] {message}")
+
+    def _drain(self):
+        queue = self._queue
+        while queue:
+            event, depth = queue.popleft()
+            batch_listeners = self._batch_listeners.get(event.name)
+            if not batch_listeners:
+                self.current_depth = depth
+                self.last_cascade_size += 1
+                self.dispatch(event)
+                continue
+
+            # 把队列中同名、同目标的事件取出来连续处理
+            target = getattr(event.payload, 'target', None)
+            group = [(event, depth)]
+            remaining = deque()
+            for entry in queue:
+                if entry[0].name == event.name and getattr(entry[0].payload, 'target', None) is target:
+                    group.append(entry)
+                else:
+                    remaining.append(entry)
+            queue.clear()
+            queue.extend(remaining)
+
+            for grouped_event, grouped_depth in group:
+                self.current_depth = grouped_depth
+                self.last_cascade_size += 1
+                self.dispatch(grouped_event)
+            events = [grouped_event for grouped_event, _ in group]
+            for listener in batch_listeners:
+                listener(events)
+
+    def coalesce(self, event_names: Iterable[EventName], listener: Callable,
+                 priority: int = DEFAULT_LISTENER_PRIORITY,
+                 capture: Optional[Callable[[GameEvent], Any]] = None,
+                 group: Optional[str] = None) -> tuple[Subscription, ...]:
+        """
+        按帧合并订阅：event_names 中的事件派发时只被缓存下来，
+        在 flush_coalesced()（由世界主循环每帧末尾调用）时按派发顺序以 list[GameEvent] 一次性交给监听器。
+        同一组中的多种事件共用一个缓存，彼此的先后顺序得以保留。
+        capture 不为空时，派发时就调用 capture(event)，缓存并交付它的返回值而不是事件本身；
+        监听器需要的是派发当时的状态（例如播报文字）时使用，避免交付时读到已经变化的组件。
+        没有 capture 时缓存的是事件本身，池化事件（见 dispatch_pooled）会先复制再缓存。
+        group 为合并组命名后，可以用 flush_coalesced(group) 只提前交付这一组，不影响其他合并订阅。
+        """
+        key = self._coalesce_seq
+        self._coalesce_seq += 1
+        if group is not None:
+            self._coalesce_groups[key] = group
+        def buffer(event: GameEvent):
+            entry = self._coalesced.get(key)
+            if entry is None:
+                entry = self._coalesced[key] = (listener, [])
+            entry[1].append(detach_pooled_event(event) if capture is None else capture(event))
+        buffer.__qualname__ = getattr(listener, '__qualname__', buffer.__qualname__)
+        return tuple(self.subscribe(event_name, buffer, priority) for event_name in event_names)
+
+    def flush_coalesced(self, group: Optional[str] = None):
+        """
+        把缓存的合并事件交给各自的监听器；交付过程中新产生的合并事件在本次一并交付。
+        group 不为空时只交付以该名字订阅的合并组，其余的留到帧末。
+        """
+        if self._flushing_coalesced:
+            return
+        self._flushing_coalesced = True
+        try:
+            if group is not None:
+                groups = self._coalesce_groups
+                for key in [key for key in self._coalesced if groups.get(key) == group]:
+                    listener, events = self._coalesced.pop(key)
+                    listener(events)
+                return
+            while self._coalesced:
+                pending, self._coalesced = self._coalesced, {}
+                for listener, events in pending.values():
+                    listener(events)
+        finally:
+            self._flushing_coalesced = False
+
+    def set_log_filter(self, log_filter: Optional[Callable[[str], bool]]):
+        """由日志接收方注册：给定标签，返回该标签的日志是否会被输出"""
+        self._log_filter = log_filter
+
+    def add_log_filter(self, log_filter: Optional[Callable[[str], bool]]):
+        """
+        再注册一个日志接收方的过滤条件，与已有的条件取并集：任一接收方需要的标签都会被派发。
+        log_filter 为空表示该接收方接收全部标签。
+        """
+        previous = self._log_filter
+        if previous is None:
+            return  # 已经接收全部标签
+        if log_filter is None:
+            self._log_filter = None
+            return
+        self._log_filter = lambda tag: previous(tag) or log_filter(tag)
+
+    def is_log_enabled(self, tag: str) -> bool:
+        """
+        快速判断某个标签的日志是否有人接收。
+        调用方可以先用它判断，再决定是否构造日志内容。
+        """
+        if not self._dispatch_table[EventName.LOG_REQUEST.value]:
+            return False
+        return self._log_filter is None or self._log_filter(tag)
+
+    def log(self, tag: str, template: str, *args):
+        """派发 LOG_REQUEST；标签未启用时直接返回，模板只在真正输出时才格式化"""
+        if not self.is_log_enabled(tag):
+            return
+        self.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(tag, template, args)))
+
+    def _on_listener_error(self, event: GameEvent):
+        self.error_counts[event.name] = self.error_counts.get(event.name, 0) + 1
+        if self.error_policy == ListenerErrorPolicy.COUNT:
+            return
+        error_message = f"Error in event listener for {event.name}"
+        print(f"[CRITICAL ERROR] {error_message}")
+        print(traceback.format_exc())
\ No newline at end of file
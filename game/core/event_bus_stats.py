@@ -0,0 +1,86 @@
+import json
+from dataclasses import dataclass, field
+from typing import Callable
+from .enums import EventName
+
+# 延迟直方图按 2 的幂划分桶（单位：微秒），第 i 个桶统计 [2^(i-1), 2^i) 微秒的调用
+HISTOGRAM_BUCKETS = 24
+
+def _bucket_label(index: int) -> str:
+    return "<1us" if index == 0 else f"<{1 << index}us"
+
+@dataclass
+class TimingStats:
+    """一组调用的计数、累计耗时和延迟直方图"""
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * HISTOGRAM_BUCKETS)
+
+    def record(self, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        bucket = min(int(elapsed * 1_000_000).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.histogram[bucket] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_time * 1000,
+            "avg_us": self.total_time / self.count * 1_000_000 if self.count else 0.0,
+            "max_us": self.max_time * 1_000_000,
+            "histogram": {_bucket_label(i): n for i, n in enumerate(self.histogram) if n},
+        }
+
+class EventBusStats:
+    """
+    事件总线的统计数据，由 EventBus.enable_instrumentation() 创建。
+    耗时都是包含嵌套派发的耗时：一次 DAMAGE_REQUEST 的耗时里包含了它引发的 STAT_QUERY 等事件。
+    """
+    def __init__(self):
+        self.events: dict[EventName, TimingStats] = {}
+        self.listeners: dict[tuple[EventName, Callable], TimingStats] = {}
+
+    def record_event(self, event_name: EventName, elapsed: float):
+        stats = self.events.get(event_name)
+        if stats is None:
+            stats = self.events[event_name] = TimingStats()
+        stats.record(elapsed)
+
+    def record_listener(self, event_name: EventName, listener: Callable, elapsed: float):
+        key = (event_name, listener)
+        stats = self.listeners.get(key)
+        if stats is None:
+            stats = self.listeners[key] = TimingStats()
+        stats.record(elapsed)
+
+    def get_event_count(self, event_name: EventName) -> int:
+        stats = self.events.get(event_name)
+        return stats.count if stats else 0
+
+    def reset(self):
+        self.events.clear()
+        self.listeners.clear()
+
+    def to_dict(self) -> dict:
+        listeners: dict[str, list[dict]] = {}
+        for (event_name, listener), stats in self.listeners.items():
+            entry = {"listener": getattr(listener, "__qualname__", repr(listener))}
+            entry.update(stats.to_dict())
+            listeners.setdefault(event_name.name, []).append(entry)
+        for entries in listeners.values():
+            entries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+
+        return {
+            "events": {
+                event_name.name: stats.to_dict()
+                for event_name, stats in sorted(self.events.items(), key=lambda item: item[1].total_time, reverse=True)
+            },
+            "listeners": listeners,
+        }
+
+    def export_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
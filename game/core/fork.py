@@ -0,0 +1,94 @@
+from typing import TYPE_CHECKING, Any, Callable
+
+from .components import (HealthComponent, StatusEffectContainerComponent, EquipmentComponent, InventoryComponent,
+                         slot_names)
+from .entity import Entity
+from .event_bus import EventBus
+from ..status_effects.status_effect import StatusEffect
+
+if TYPE_CHECKING:
+    from ..world import World
+
+def copy_slots(component_type: type, component: Any) -> Any:
+    """
+    按 component_type 声明的槽位浅复制对象，未赋值的槽位保持未赋值。
+    component 可以是列式存储中的绑定对象，复制结果总是普通的 component_type 实例。
+    """
+    clone = object.__new__(component_type)
+    for name in slot_names(component_type):
+        try:
+            setattr(clone, name, getattr(component, name))
+        except AttributeError:
+            pass
+    return clone
+
+def _copy_effect(effect: StatusEffect, world: 'World') -> StatusEffect:
+    clone = copy_slots(StatusEffect, effect)
+    if effect.caster is not None:
+        # 施法者换成子世界中ID相同的实体（施法者已不在世界中时保留原引用）
+        clone.caster = world.get_entity(effect.caster.id) or effect.caster
+    return clone
+
+# 含有会被修改的容器或实体引用的组件，复制时需要专门处理；其余组件按槽位浅复制
+FORK_COPIERS: dict[type, Callable[[Any, 'ForkedEntity'], Any]] = {
+    HealthComponent: lambda c, entity: HealthComponent(entity, entity.event_bus, c.hp, c.max_hp),
+    StatusEffectContainerComponent: lambda c, entity: StatusEffectContainerComponent(
+        [_copy_effect(effect, entity._world) for effect in c.effects]),
+    EquipmentComponent: lambda c, entity: EquipmentComponent(
+        dict(c.equipment_slots),
+        {equipment_id: copy_slots(type(item), item) for equipment_id, item in c.equipped_items.items()}),
+    InventoryComponent: lambda c, entity: InventoryComponent(
+        {item_id: copy_slots(type(item), item) for item_id, item in c.items.items()}),
+}
+
+def fork_component(component_type: type, component: Any, entity: 'ForkedEntity') -> Any:
+    copier = FORK_COPIERS.get(component_type)
+    return copier(component, entity) if copier is not None else copy_slots(component_type, component)
+
+class ForkedEntity(Entity):
+    """
+    World.fork() 中的实体：ID、名称与父世界中的实体相同，派发事件用子世界的事件总线。
+    组件在第一次被取用（get_component/get_components/增删）时才从父实体复制，
+    从未取用过的组件与父实体共用同一个对象，因此子世界使用期间父世界不应继续推进。
+    """
+    def __init__(self, parent: Entity, event_bus: EventBus):
+        # 不调用 Entity.__init__：沿用父实体的ID，不占用新的ID
+        self.id = parent.id
+        self.name = parent.name
+        self.event_bus = event_bus
+        self._components = dict(parent._components)
+        self._component_lists = dict(parent._component_lists)
+        self._shared = {*self._components, *self._component_lists}  # 仍与父实体共用的组件类型
+        self._store = None
+        self._store_row = -1
+        self._world = None
+        self._world_seq = parent._world_seq
+
+    def _unshare(self, ct: type):
+        self._shared.discard(ct)
+        component = self._components.get(ct)
+        if component is not None:
+            self._components[ct] = fork_component(ct, component, self)
+        components = self._component_lists.get(ct)
+        if components is not None:
+            self._component_lists[ct] = [fork_component(ct, c, self) for c in components]
+
+    def get_component(self, ct: type):
+        if ct in self._shared:
+            self._unshare(ct)
+        return super().get_component(ct)
+
+    def get_components(self, ct: type):
+        if ct in self._shared:
+            self._unshare(ct)
+        return super().get_components(ct)
+
+    def add_component(self, c: Any):
+        if type(c) in self._shared:
+            self._unshare(type(c))
+        return super().add_component(c)
+
+    def remove_component(self, ct: type):
+        if ct in self._shared:
+            self._unshare(ct)
+        return super().remove_component(ct)
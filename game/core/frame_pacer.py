@@ -0,0 +1,46 @@
+import math
+from time import perf_counter
+from typing import Optional
+
+# 落后超过这么多帧时不再逐帧追赶，直接丢弃落下的帧
+MAX_CATCH_UP_FRAMES = 5
+# 空闲时单次休眠的上限：没有系统声明下一次工作的时间时，也按这个间隔醒来检查一次
+MAX_IDLE_SLEEP = 1.0
+
+class FramePacer:
+    """
+    主循环的帧节奏，基于单调时钟 perf_counter。
+    - 按固定的帧时间表推进：某帧超时后，后面的帧不休眠、连续执行以追上时间表；
+      落后超过 MAX_CATCH_UP_FRAMES 帧时放弃追赶，从当前时刻重新排时间表
+    - 所有系统都空闲（见 World.next_update_time()）时，一直休眠到最早的系统需要工作的时刻，
+      空闲期间的帧既不执行也不追赶
+    """
+    def __init__(self, interval: float, max_catch_up_frames: int = MAX_CATCH_UP_FRAMES,
+                 max_idle_sleep: float = MAX_IDLE_SLEEP):
+        self.interval = interval
+        self.max_lag = interval * max_catch_up_frames
+        self.max_idle_sleep = max_idle_sleep
+        self.next_frame_time = perf_counter() + interval
+        self.skipped_frames = 0
+        self.idle_time = 0.0
+
+    def next_delay(self, wakeup_time: Optional[float] = None) -> float:
+        """
+        一帧结束后调用，返回下一帧开始前应休眠的秒数（0 表示立即执行下一帧）。
+        wakeup_time 为空表示下一帧有工作要做；否则是最早需要工作的时刻（perf_counter 时间，math.inf 表示没有计划）。
+        """
+        now = perf_counter()
+        frame_time = self.next_frame_time
+        if wakeup_time is not None:
+            wakeup_time = min(wakeup_time, now + self.max_idle_sleep)
+            if wakeup_time > frame_time:
+                # 空闲：睡到需要工作的时刻，从那里重新排时间表
+                self.idle_time += wakeup_time - max(now, frame_time)
+                frame_time = wakeup_time
+        lag = now - frame_time
+        if lag > self.max_lag:
+            skipped = math.floor(lag / self.interval)
+            self.skipped_frames += skipped
+            frame_time += skipped * self.interval
+        self.next_frame_time = frame_time + self.interval
+        return max(frame_time - now, 0.0)
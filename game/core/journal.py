@@ -0,0 +1,159 @@
+import random
+import struct
+from typing import Any, BinaryIO, Callable, NamedTuple, Optional
+from .enums import EventName
+from .event_bus import EventBus, GameEvent
+
+# 文件头：魔数、版本号、随机种子
+JOURNAL_MAGIC = b"PADJ"
+JOURNAL_VERSION = 1
+_HEADER = struct.Struct("<4sBQ")
+
+# 记录类型直接使用 EventName 的整数值；0 保留给字符串表
+_STRING_RECORD = 0
+_STRING_HEADER = struct.Struct("<BHH")  # 记录类型、字符串ID、UTF-8 字节长度
+_RECORD_TYPE = struct.Struct("<B")
+NO_REF = 0xFFFF                  # 空引用（None）；字符串ID只能用到 MAX_STRING_ID
+MAX_STRING_ID = NO_REF - 1
+MAX_STRING_BYTES = 0xFFFF
+
+# DAMAGE_REQUEST 的标志位
+_FLAG_REFLECTION = 1
+_FLAG_PASSIVE = 2
+_FLAG_DOT = 4
+_FLAG_CAN_CRIT = 8
+
+def _name(entity) -> Optional[str]:
+    return entity.name if entity is not None else None
+
+def _choice(payload) -> tuple:
+    return (payload["choice_index"],)
+
+class _Codec(NamedTuple):
+    layout: struct.Struct
+    refs: tuple[bool, ...]                   # 每个字段是否是字符串/实体引用
+    extract: Callable[[Any], tuple]          # 从载荷中取出要记录的字段
+
+# 只记录影响战斗结果的事件；实体和字符串统一记为字符串表中的整数ID
+_CODECS: dict[EventName, _Codec] = {
+    EventName.BATTLEFIELD_INIT_REQUEST: _Codec(struct.Struct("<H"), (True,), lambda p: (p["battlefield_id"],)),
+    EventName.ACTION_REQUEST: _Codec(struct.Struct("<H"), (True,), lambda p: (_name(p.acting_entity),)),
+    EventName.PLAYER_SPELL_CHOICE: _Codec(struct.Struct("<h"), (False,), _choice),
+    EventName.PLAYER_TARGET_CHOICE: _Codec(struct.Struct("<h"), (False,), _choice),
+    EventName.PLAYER_ITEM_CHOICE: _Codec(struct.Struct("<h"), (False,), _choice),
+    EventName.PLAYER_ITEM_TARGET_CHOICE: _Codec(struct.Struct("<h"), (False,), _choice),
+    EventName.CAST_SPELL_REQUEST: _Codec(
+        struct.Struct("<HHH"), (True, True, True),
+        lambda p: (_name(p.caster), _name(p.target), p.spell_id)),
+    EventName.DAMAGE_REQUEST: _Codec(
+        struct.Struct("<HHHfHB"), (True, True, True, False, True, False),
+        lambda p: (_name(p.caster), _name(p.target), p.source_spell_id, p.base_damage, p.damage_type,
+                   (_FLAG_REFLECTION if p.is_reflection else 0) | (_FLAG_PASSIVE if p.is_passive_damage else 0)
+                   | (_FLAG_DOT if p.is_dot_damage else 0) | (_FLAG_CAN_CRIT if p.can_crit else 0))),
+    EventName.HEAL_REQUEST: _Codec(
+        struct.Struct("<HHHf"), (True, True, True, False),
+        lambda p: (_name(p.caster), _name(p.target), p.source_spell_id, p.base_heal)),
+    EventName.APPLY_STATUS_EFFECT_REQUEST: _Codec(
+        struct.Struct("<HHH"), (True, True, True),
+        lambda p: (_name(p.target), p.effect.effect_id, _name(p.effect.caster))),
+    EventName.HEALTH_CHANGED: _Codec(
+        struct.Struct("<Hff"), (True, False, False),
+        lambda p: (_name(p.entity), p.old_hp, p.new_hp)),
+}
+
+PLAYER_CHOICE_EVENTS = (EventName.PLAYER_SPELL_CHOICE, EventName.PLAYER_TARGET_CHOICE,
+                        EventName.PLAYER_ITEM_CHOICE, EventName.PLAYER_ITEM_TARGET_CHOICE)
+
+class JournalRecord(NamedTuple):
+    """解码后的一条日志记录，引用字段已还原为字符串"""
+    event_name: EventName
+    fields: tuple
+
+class EventJournalRecorder:
+    """
+    事件日志记录器：把影响战斗结果的事件以紧凑的二进制格式写入流中。
+    创建时会用 seed 重置世界的随机数生成器 rng（通常传 World.rng，为空时重置全局随机数），
+    回放时使用同一个种子即可复现所有随机判定。需要在初始化战场之前创建。
+    """
+    FLUSH_THRESHOLD = 64 * 1024
+
+    def __init__(self, event_bus: EventBus, stream: BinaryIO, seed: Optional[int] = None,
+                 rng: Optional[random.Random] = None):
+        self.event_bus = event_bus
+        self.stream = stream
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.record_count = 0
+        self._strings: dict[str, int] = {}
+        self._buffer = bytearray(_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.seed))
+        self._scope = event_bus.scope()
+
+        (rng or random).seed(self.seed)
+        for event_name, codec in _CODECS.items():
+            # 优先级 0：在其他监听器修改载荷之前记录
+            self._scope.subscribe(event_name, self._make_listener(event_name, codec), priority=0)
+
+    def _make_listener(self, event_name: EventName, codec: _Codec) -> Callable[[GameEvent], None]:
+        record_type = _RECORD_TYPE.pack(event_name.value)
+        def on_event(event: GameEvent):
+            values = codec.extract(event.payload)
+            packed = [self._intern(value) if is_ref else value for value, is_ref in zip(values, codec.refs)]
+            self._buffer += record_type
+            self._buffer += codec.layout.pack(*packed)
+            self.record_count += 1
+            if len(self._buffer) >= self.FLUSH_THRESHOLD:
+                self.flush()
+        return on_event
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_REF
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            if string_id > MAX_STRING_ID:
+                raise ValueError(f"事件日志的字符串表已满（最多 {MAX_STRING_ID + 1} 个不同的实体名/法术ID），无法记录 {value!r}")
+            encoded = value.encode("utf-8")
+            if len(encoded) > MAX_STRING_BYTES:
+                raise ValueError(f"事件日志中的字符串过长（{len(encoded)} 字节，最多 {MAX_STRING_BYTES} 字节）")
+            self._strings[value] = string_id
+            self._buffer += _STRING_HEADER.pack(_STRING_RECORD, string_id, len(encoded))
+            self._buffer += encoded
+        return string_id
+
+    def flush(self):
+        self.stream.write(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        """停止记录并写出缓冲区，不负责关闭流"""
+        self._scope.close()
+        self.flush()
+        self.stream.flush()
+
+def read_journal(stream: BinaryIO) -> tuple[int, list[JournalRecord]]:
+    """读取日志，返回 (随机种子, 记录列表)"""
+    data = stream.read()
+    magic, version, seed = _HEADER.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+        raise ValueError(f"不支持的事件日志格式: {magic!r} v{version}")
+
+    strings: dict[int, str] = {}
+    records: list[JournalRecord] = []
+    offset = _HEADER.size
+    while offset < len(data):
+        (record_type,) = _RECORD_TYPE.unpack_from(data, offset)
+        if record_type == _STRING_RECORD:
+            _, string_id, length = _STRING_HEADER.unpack_from(data, offset)
+            offset += _STRING_HEADER.size
+            strings[string_id] = data[offset:offset + length].decode("utf-8")
+            offset += length
+            continue
+
+        event_name = EventName(record_type)
+        codec = _CODECS[event_name]
+        values = codec.layout.unpack_from(data, offset + _RECORD_TYPE.size)
+        offset += _RECORD_TYPE.size + codec.layout.size
+        fields = tuple((strings.get(value) if value != NO_REF else None) if is_ref else value
+                       for value, is_ref in zip(values, codec.refs))
+        records.append(JournalRecord(event_name, fields))
+    return seed, records
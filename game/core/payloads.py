@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Optional, List, TYPE_CHECKING
 from game.core.enums import EventName
+from game.core.pool import ObjectPool
 
 if TYPE_CHECKING:
     from game.core.entity import Entity
@@ -28,10 +29,14 @@ class RoundStartPayload:
 class TurnStartPayload:
     entity: 'Entity'
 
-@dataclass
+@dataclass(slots=True)
 class LogRequestPayload:
     tag: str
-    message: str
+    message: str                 # 日志模板（str.format 风格）；没有 args 时就是最终文本
+    args: tuple = ()             # 延迟格式化的参数，只有真正输出时才会拼接字符串
+
+    def render(self) -> str:
+        return self.message.format(*self.args) if self.args else self.message
 
 @dataclass
 class ActionRequestPayload:
@@ -57,7 +62,7 @@ class ManaCostRequestPayload:
     cost: float
     is_affordable: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class DamageRequestPayload:
     caster: 'Entity'
     target: 'Entity'
@@ -165,7 +170,7 @@ class UIDisplayOptionsPayload:
     response_event_name: EventName
     context: dict
 
-@dataclass
+@dataclass(slots=True)
 class StatQueryPayload:
     entity: 'Entity'
     stat_name: str
@@ -253,4 +258,8 @@ class PlayerTargetChoicePayload:
     """玩家目标选择事件payload"""
     caster: 'Entity'
     spell_id: str
-    target: 'Entity'
\ No newline at end of file
+    target: 'Entity'
+
+# --- 对象池，配合 EventBus.dispatch_pooled 使用 ---
+# 只有构造开销较大的载荷才值得池化；StatQuery、LogRequest 这类小载荷直接分配更快
+DAMAGE_REQUEST_POOL = ObjectPool(DamageRequestPayload)
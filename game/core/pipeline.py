@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, Optional, TypeVar, Generic, Protocol, TYPE_CHECKING
 from .entity import Entity
+from .pool import ObjectPool
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -15,7 +16,11 @@ class EffectExecutionContext:
     """
     一个封装了效果处理所需所有信息的上下文对象。
     它在管线中的处理器之间传递。
+    每次伤害/治疗结算都会创建一个，因此使用 __slots__ 并配有对象池 EFFECT_CONTEXT_POOL。
     """
+    __slots__ = ('source', 'target', 'effect_type', 'initial_value', 'current_value',
+                 'metadata', 'is_cancelled', 'overheal_amount')
+
     def __init__(self, source: 'Entity', target: 'Entity', effect_type: str, initial_value: float, **kwargs):
         self.source = source
         self.target = target
@@ -31,6 +36,8 @@ class EffectExecutionContext:
         """中止管线的后续执行。"""
         self.is_cancelled = True
 
+EFFECT_CONTEXT_POOL = ObjectPool(EffectExecutionContext)
+
 class Processor(ABC, Generic[T]):
     """
     管线中处理器的抽象基类。
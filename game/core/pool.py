@@ -0,0 +1,67 @@
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_POOL_SIZE = 256
+
+class UseAfterReleaseError(RuntimeError):
+    """调试模式下访问了已经归还给对象池的对象"""
+
+class ObjectPool(Generic[T]):
+    """
+    对象池（空闲链表）：归还的对象在下次 acquire 时重新调用 __init__ 复用，
+    省去热点事件每次派发都分配新载荷的开销。
+    只适用于派发结束后不会再被任何人持有的对象。
+
+    调试模式下对象归还后不再复用，而是被替换为"已释放"类型：
+    之后任何属性访问都会抛出 UseAfterReleaseError，重复归还也会被发现。
+    """
+    debug = False  # 对所有对象池生效，见 set_pool_debug
+
+    def __init__(self, cls: Callable[..., T], max_size: int = DEFAULT_POOL_SIZE):
+        self.cls = cls
+        self.max_size = max_size
+        self._free: list[T] = []
+        self._released_cls = _make_released_class(cls)
+        self.created_count = 0   # 实际分配的对象数
+        self.reused_count = 0    # 从空闲链表复用的次数
+
+    def acquire(self, *args: Any, **kwargs: Any) -> T:
+        free = self._free
+        if free:
+            obj = free.pop()
+            obj.__init__(*args, **kwargs)
+            self.reused_count += 1
+            return obj
+        self.created_count += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj: T):
+        if ObjectPool.debug:
+            if type(obj) is self._released_cls:
+                raise UseAfterReleaseError(f"{self.cls.__name__} 被重复归还")
+            object.__setattr__(obj, '__class__', self._released_cls)
+            return
+        if len(self._free) < self.max_size:
+            self._free.append(obj)
+
+def set_pool_debug(enabled: bool):
+    """开启或关闭对象池的释放后使用检测；应在派发任何池化事件之前设置"""
+    ObjectPool.debug = enabled
+
+def _make_released_class(cls: type) -> type:
+    # 空 __slots__ 的子类与原类型内存布局相同，可以直接替换实例的 __class__
+    def __getattribute__(self, name: str):
+        if name == '__class__':
+            return object.__getattribute__(self, name)
+        raise UseAfterReleaseError(f"访问了已归还对象池的 {cls.__name__}.{name}")
+    def __setattr__(self, name: str, value: Any):
+        raise UseAfterReleaseError(f"修改了已归还对象池的 {cls.__name__}.{name}")
+    def __repr__(self):
+        return f"<released {cls.__name__}>"
+    return type(f"Released{cls.__name__}", (cls,), {
+        '__slots__': (),
+        '__getattribute__': __getattribute__,
+        '__setattr__': __setattr__,
+        '__repr__': __repr__,
+    })
@@ -0,0 +1,168 @@
+import dataclasses
+import marshal
+import struct
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable
+
+from . import components as component_module
+from .components import (HealthComponent, StatusEffectContainerComponent, EquipmentComponent, EquipmentItem,
+                         InventoryComponent, InventoryItem, slot_names)
+from .entity import Entity, reserve_entity_ids
+from ..status_effects import effect_logic as effect_logic_module
+from ..status_effects.status_effect import StatusEffect
+
+if TYPE_CHECKING:
+    from ..world import World
+
+# 文件头：魔数、版本号；之后是 marshal 编码的状态元组
+SNAPSHOT_MAGIC = b"PADW"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<4sB")
+
+# 未赋值的槽位（例如尚未写入的 StatsComponent._base_attack）；marshal 可以直接编码 Ellipsis
+_UNSET = ...
+
+# 每个类型编译一次：按槽位顺序取值的 attrgetter；构造函数参数正好是全部槽位时直接调用构造函数还原
+_getters: dict[type, Callable[[Any], tuple]] = {}
+_constructible: dict[type, bool] = {}
+
+def _make_getter(cls: type) -> Callable[[Any], tuple]:
+    names = slot_names(cls)
+    if len(names) > 1:
+        return attrgetter(*names)
+    return lambda obj: tuple(getattr(obj, name) for name in names)
+
+def _slot_values(cls: type, obj: Any) -> tuple:
+    getter = _getters.get(cls)
+    if getter is None:
+        getter = _getters[cls] = _make_getter(cls)
+    try:
+        return getter(obj)
+    except AttributeError:  # 有未赋值的槽位
+        return tuple(getattr(obj, name, _UNSET) for name in slot_names(cls))
+
+def _is_constructible(cls: type) -> bool:
+    constructible = _constructible.get(cls)
+    if constructible is None:
+        init_fields = tuple(f.name for f in dataclasses.fields(cls) if f.init) if dataclasses.is_dataclass(cls) else None
+        constructible = _constructible[cls] = init_fields == slot_names(cls)
+    return constructible
+
+def _from_slot_values(cls: type, values: tuple) -> Any:
+    if _is_constructible(cls):
+        return cls(*values)
+    obj = object.__new__(cls)
+    for name, value in zip(slot_names(cls), values):
+        if value is not _UNSET:
+            setattr(obj, name, value)
+    return obj
+
+# --- 需要专门编码的组件：含有实体引用、效果逻辑对象或嵌套的组件对象 ---
+
+def _encode_effect(effect: StatusEffect) -> tuple:
+    values = dict(zip(slot_names(StatusEffect), _slot_values(StatusEffect, effect)))
+    values['caster'] = effect.caster.id if effect.caster is not None else None
+    values['logic'] = type(effect.logic).__name__ if effect.logic is not None else None
+    return tuple(values.values())
+
+def _decode_effect(values: tuple, entities: dict[int, Entity]) -> StatusEffect:
+    effect = _from_slot_values(StatusEffect, values)
+    # 施法者已经不在世界中时无法还原引用，记为 None
+    effect.caster = entities.get(effect.caster) if effect.caster is not None else None
+    effect.logic = getattr(effect_logic_module, effect.logic)() if effect.logic is not None else None
+    return effect
+
+class _ComponentCodec:
+    __slots__ = ('encode', 'decode')
+
+    def __init__(self, encode: Callable[[Any], Any], decode: Callable[[Any, Entity, dict[int, Entity]], Any]):
+        self.encode = encode
+        self.decode = decode
+
+_CODECS: dict[type, _ComponentCodec] = {
+    HealthComponent: _ComponentCodec(
+        lambda c: (c.hp, c.max_hp),
+        lambda v, entity, entities: HealthComponent(entity, entity.event_bus, v[0], v[1])),
+    StatusEffectContainerComponent: _ComponentCodec(
+        lambda c: tuple(_encode_effect(effect) for effect in c.effects),
+        lambda v, entity, entities: StatusEffectContainerComponent([_decode_effect(e, entities) for e in v])),
+    EquipmentComponent: _ComponentCodec(
+        lambda c: (c.equipment_slots, {k: _slot_values(EquipmentItem, item) for k, item in c.equipped_items.items()}),
+        lambda v, entity, entities: EquipmentComponent(
+            v[0], {k: _from_slot_values(EquipmentItem, item) for k, item in v[1].items()})),
+    InventoryComponent: _ComponentCodec(
+        lambda c: {k: (item.item_id, item.quantity) for k, item in c.items.items()},
+        lambda v, entity, entities: InventoryComponent({k: InventoryItem(*item) for k, item in v.items()})),
+}
+
+def _encode_component(component_type: type, component: Any) -> Any:
+    codec = _CODECS.get(component_type)
+    return codec.encode(component) if codec is not None else _slot_values(component_type, component)
+
+def _decode_component(component_type: type, values: Any, entity: Entity, entities: dict[int, Entity]) -> Any:
+    codec = _CODECS.get(component_type)
+    return codec.decode(values, entity, entities) if codec is not None else _from_slot_values(component_type, values)
+
+# --- 世界 ---
+
+def snapshot_world(world: 'World') -> bytes:
+    """
+    把世界状态编码为紧凑的二进制快照：所有实体及其组件、状态效果、实现了 save_state() 的系统状态
+    （回合管理的AP条、回合队列，死亡检查和生命值批处理尚未处理的变化等），以及世界的随机数生成器（World.rng）的状态。
+    战场的波次和结束标记保存在战场实体的组件中（BattlefieldComponent、EnemyWaveComponent），随实体一起记录。
+    实体引用（HealthComponent 的所属实体、StatusEffect.caster）按实体ID记录。
+    载荷使用 marshal 编码，只保证同一 Python 版本之间可以互相读取。
+    """
+    entities = []
+    for entity in world.entities:
+        entities.append((
+            entity.id,
+            entity.name,
+            tuple((ct.__name__, _encode_component(ct, c)) for ct, c in entity._components.items()),
+            tuple((ct.__name__, tuple(_encode_component(ct, c) for c in cs))
+                  for ct, cs in entity._component_lists.items()),
+        ))
+    systems = tuple((type(system).__name__, system.save_state())
+                    for _, system in world.systems if hasattr(system, 'save_state'))
+    state = (tuple(entities), systems, world.rng.getstate())
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + marshal.dumps(state)
+
+def restore_world(world: 'World', data: bytes):
+    """
+    用快照替换世界中的全部实体，并还原系统状态和随机数生成器。
+    实体保留快照中的ID；世界的系统保持不变，应与生成快照的世界配置相同（例如都由 build_world 创建）。
+    """
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"不支持的世界快照格式: {magic!r} v{version}")
+    entity_states, system_states, rng_state = marshal.loads(memoryview(data)[_HEADER.size:])
+
+    for entity in list(world.entities):
+        world.remove_entity(entity)
+
+    # 先创建全部实体，组件中的实体引用才能按ID还原
+    entities: dict[int, Entity] = {}
+    for entity_id, name, _, _ in entity_states:
+        entity = Entity(name, world.event_bus)
+        entity.id = entity_id
+        entities[entity_id] = entity
+    if entities:
+        reserve_entity_ids(max(entities))
+
+    component_types = vars(component_module)
+    for entity_id, _, component_states, list_states in entity_states:
+        entity = entities[entity_id]
+        for type_name, values in component_states:
+            ct = component_types[type_name]
+            entity._components[ct] = _decode_component(ct, values, entity, entities)
+        for type_name, values_list in list_states:
+            ct = component_types[type_name]
+            entity._component_lists[ct] = [_decode_component(ct, values, entity, entities) for values in values_list]
+        world.add_entity(entity)
+
+    systems_by_name = {type(system).__name__: system for _, system in world.systems}
+    for system_name, state in system_states:
+        system = systems_by_name.get(system_name)
+        if system is not None:
+            system.load_state(state)
+    world.rng.setstate(rng_state)
@@ -0,0 +1,175 @@
+import json
+import sys
+from collections import deque
+from time import perf_counter
+from typing import Callable, Optional, TextIO
+from .event_bus import EventBus
+
+# 滚动窗口保留最近多少帧的采样（60 帧/秒时约 10 秒）
+DEFAULT_WINDOW = 600
+DEFAULT_TOP = 10
+
+def _percentile(sorted_samples: list[float], fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(int(len(sorted_samples) * fraction), len(sorted_samples) - 1)]
+
+def _owner_name(callback: Callable) -> str:
+    """监听器或 update 方法所属的类名；弱引用、where 过滤包装会沿用原监听器的 __qualname__"""
+    owner = getattr(callback, '__self__', None)
+    if owner is not None:
+        return type(owner).__name__
+    qualname = getattr(callback, '__qualname__', repr(callback))
+    return qualname.split('.', 1)[0]
+
+class RollingTiming:
+    """最近 window 个采样（用于 p50/p99），以及开启以来的累计次数、耗时和最大值"""
+    __slots__ = ('samples', 'count', 'total_time', 'max_time')
+
+    def __init__(self, window: int):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, elapsed: float):
+        self.samples.append(elapsed)
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def to_dict(self) -> dict:
+        samples = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_ms": self.total_time * 1000,
+            "window_ms": sum(samples) * 1000,
+            "p50_us": _percentile(samples, 0.50) * 1_000_000,
+            "p99_us": _percentile(samples, 0.99) * 1_000_000,
+            "max_us": self.max_time * 1_000_000,
+        }
+
+class TickProfiler:
+    """
+    主循环的逐帧性能分析，由 World.enable_profiler() 创建。
+    - 每个系统 update() 的耗时（包含 update 中同步派发的事件）
+    - 每帧耗时（系统更新和合并事件交付，不含休眠），超过帧预算 budget 记为超时
+    - 按系统归集的事件监听器累计耗时：借助事件总线的统计（EventBus.enable_instrumentation），
+      按监听器所属的类汇总。与 EventBusStats 一样是包含嵌套派发的耗时，嵌套监听器会被重复计入
+    p50/p99 取最近 window 帧，次数、累计耗时和超时次数从开启（或 reset）时算起。
+    """
+    def __init__(self, event_bus: EventBus, budget: float, window: int = DEFAULT_WINDOW,
+                 track_handlers: bool = True):
+        self.event_bus = event_bus
+        self.budget = budget
+        self.window = window
+        self.frames = RollingTiming(window)
+        self.overrun_count = 0
+        self.worst_overrun = 0.0
+        self.systems: dict[str, RollingTiming] = {}
+        self._timings: dict[Callable, RollingTiming] = {}  # update 方法 -> 所属系统的统计
+        self._frame_start = 0.0
+        # 只有由分析器开启的事件统计才在 close() 时关闭
+        self._owns_instrumentation = track_handlers and event_bus.stats is None
+        if track_handlers:
+            event_bus.enable_instrumentation()
+
+    def _timing_for(self, update: Callable) -> RollingTiming:
+        timing = self._timings.get(update)
+        if timing is None:
+            name = _owner_name(update)
+            timing = self.systems.get(name)
+            if timing is None:
+                timing = self.systems[name] = RollingTiming(self.window)
+            self._timings[update] = timing
+        return timing
+
+    def begin_frame(self):
+        self._frame_start = perf_counter()
+
+    def end_frame(self):
+        elapsed = perf_counter() - self._frame_start
+        self.frames.record(elapsed)
+        if elapsed > self.budget:
+            self.overrun_count += 1
+            if elapsed - self.budget > self.worst_overrun:
+                self.worst_overrun = elapsed - self.budget
+
+    def record_update(self, update: Callable, elapsed: float):
+        self._timing_for(update).record(elapsed)
+
+    def run_updates(self, updates: tuple[Callable[[], None], ...]):
+        """依次调用各系统的 update 并分别计时"""
+        for update in updates:
+            start = perf_counter()
+            update()
+            self._timing_for(update).record(perf_counter() - start)
+
+    def handler_times(self) -> dict[str, dict]:
+        """按监听器所属的类汇总的事件处理累计耗时：{类名: {"count", "total_ms"}}，按耗时降序"""
+        stats = self.event_bus.stats
+        if stats is None:
+            return {}
+        totals: dict[str, list] = {}
+        for (_, listener), timing in stats.listeners.items():
+            entry = totals.setdefault(_owner_name(listener), [0, 0.0])
+            entry[0] += timing.count
+            entry[1] += timing.total_time
+        return {name: {"count": count, "total_ms": total * 1000}
+                for name, (count, total) in sorted(totals.items(), key=lambda item: item[1][1], reverse=True)}
+
+    def reset(self):
+        """清空全部采样；同时清空事件总线的统计"""
+        self.frames = RollingTiming(self.window)
+        self.overrun_count = 0
+        self.worst_overrun = 0.0
+        self.systems.clear()
+        self._timings.clear()
+        if self.event_bus.stats is not None:
+            self.event_bus.stats.reset()
+
+    def close(self):
+        if self._owns_instrumentation:
+            self.event_bus.disable_instrumentation()
+            self._owns_instrumentation = False
+
+    def summary(self, top: int = DEFAULT_TOP) -> dict:
+        """耗时最多的 top 个系统（按窗口内累计耗时）、帧耗时分位数和超时次数"""
+        systems = sorted(((name, timing.to_dict()) for name, timing in self.systems.items()),
+                         key=lambda item: item[1]["window_ms"], reverse=True)
+        handlers = self.handler_times()
+        return {
+            "budget_ms": self.budget * 1000,
+            "frames": self.frames.to_dict(),
+            "overruns": self.overrun_count,
+            "worst_overrun_ms": self.worst_overrun * 1000,
+            "systems": dict(systems[:top]),
+            "handlers": dict(list(handlers.items())[:top]),
+        }
+
+    def format_summary(self, top: int = DEFAULT_TOP) -> str:
+        summary = self.summary(top)
+        frames = summary["frames"]
+        lines = [
+            f"[PROFILER] 帧数 {frames['count']}，帧耗时 p50 {frames['p50_us']:.0f}us / p99 {frames['p99_us']:.0f}us"
+            f" / 最大 {frames['max_us']:.0f}us，"
+            f"超出帧预算 {summary['budget_ms']:.1f}ms 共 {summary['overruns']} 次（最多超出 {summary['worst_overrun_ms']:.2f}ms）",
+            "[PROFILER] 系统 update（最近窗口）：",
+        ]
+        for name, timing in summary["systems"].items():
+            lines.append(f"  {name:<28} 合计 {timing['window_ms']:8.2f}ms  p50 {timing['p50_us']:7.1f}us"
+                         f"  p99 {timing['p99_us']:7.1f}us  最大 {timing['max_us']:7.1f}us")
+        if summary["handlers"]:
+            lines.append("[PROFILER] 事件监听器（累计，含嵌套派发）：")
+            for name, handler in summary["handlers"].items():
+                lines.append(f"  {name:<28} 合计 {handler['total_ms']:8.2f}ms  调用 {handler['count']} 次")
+        return "\n".join(lines)
+
+    def dump(self, file: Optional[TextIO] = None, top: int = DEFAULT_TOP):
+        """随时输出当前的滚动摘要（默认输出到标准输出）"""
+        print(self.format_summary(top), file=file or sys.stdout)
+
+    def export_json(self, path: str, top: int = DEFAULT_TOP):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(top), f, ensure_ascii=False, indent=2)
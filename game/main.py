@@ -1,6 +1,13 @@
-from .core.event_bus import EventBus
+import argparse
+import asyncio
+from typing import Optional
+from .core.async_event_bus import AsyncEventBus
+from .core.event_bus import EventBus, GameEvent
 from .core.entity import Entity
-from .core.enums import BattleTurnRule
+from .core.enums import BattleTurnRule, EventName
+from .core.journal import EventJournalRecorder
+from .core.component_store import ComponentStore
+from .sidecar import start_sidecar
 from .world import World
 from .systems.data_manager import DataManager
 from .systems.log_system import LogSystem
@@ -22,15 +29,12 @@ from .systems.equipment_system import EquipmentSystem
 from .systems.item_system import ItemSystem
 from .systems.battlefield_system import BattlefieldSystem
 from .systems.battle_end_system import BattleEndSystem
+from .systems.health_change_system import HealthChangeBatchSystem
 from .status_effects.status_effect_factory import StatusEffectFactory
 
-def main():
-    print("游戏启动中...")
-    # 1. 初始化核心服务
-    event_bus = EventBus()
+def load_game_data() -> DataManager:
+    """加载全部游戏数据"""
     data_manager = DataManager()
-    status_effect_factory = StatusEffectFactory(data_manager)
-    print("加载游戏数据...")
     data_manager.load_spell_data()
     data_manager.load_status_effect_data()
     data_manager.load_passive_data()
@@ -41,10 +45,25 @@ def main():
     data_manager.load_enemy_ai_data("data/enemies_ai.yaml")
     data_manager.load_equipment_data()
     data_manager.load_item_data()
-    world = World(event_bus)
+    return data_manager
+
+def build_world(event_bus: EventBus, data_manager: DataManager, headless: bool = False,
+                log_enabled: Optional[bool] = None, component_store: Optional[ComponentStore] = None,
+                batch_health_changes: bool = False, stats_export_path: Optional[str] = None,
+                async_input: bool = False) -> World:
+    """
+    创建世界并注册所有系统。
+    headless=True 时不注册UI系统并关闭日志输出，用于回放、批量模拟等无界面场景；
+    此时玩家的选择需要由调用方订阅 UI_DISPLAY_OPTIONS 来提供。
+    log_enabled 单独控制本进程的日志输出，默认与 headless 相反；日志交给旁路进程时传 False。
+    component_store 不为空时，实体的数值组件存放在列式存储中（大规模战斗时使用）。
+    batch_health_changes=True 时每个实体每次行动只派发一条合并后的 HEALTH_CHANGED（见 HealthChangeBatchSystem）。
+    stats_export_path 不为空时开启事件总线统计，战斗结束后导出为 JSON（见 BattleEndSystem）。
+    async_input=True 时UI系统以协程等待玩家输入，event_bus 需为 AsyncEventBus，并用 world.start_async() 运行。
+    """
+    status_effect_factory = StatusEffectFactory(data_manager)
+    world = World(event_bus, component_store)
 
-    # 2. 创建并注册所有系统
-    print("注册系统...")
     log_system = LogSystem(event_bus)  # 创建日志系统实例以便控制
     world.add_system(log_system) # 首先注册日志系统
     
@@ -53,9 +72,13 @@ def main():
     # log_system.hide_tag("[SPELL]")   # 隐藏施法日志
     # log_system.hide_tag("[AI]")      # 隐藏AI决策日志
     # log_system.hide_tag("[SYSTEM]")  # 隐藏系统日志
-    log_system.set_enabled(True)    # 启用日志系统
+    log_system.set_enabled(not headless if log_enabled is None else log_enabled)    # 启用日志系统
+
+    if stats_export_path:
+        event_bus.enable_instrumentation()
     
-    world.add_system(UISystem(event_bus, world)) # UI系统需要world来渲染状态
+    if not headless:
+        world.add_system(UISystem(event_bus, world, async_input=async_input)) # UI系统需要world来渲染状态
     world.add_system(StatusEffectSystem(event_bus, world))
     world.add_system(InteractionSystem(event_bus, data_manager, status_effect_factory))
 
@@ -76,23 +99,56 @@ def main():
     world.add_system(ManaSystem(event_bus))
     world.add_system(energy_system)  # 使用之前创建的energy_system实例
     world.add_system(ultimate_charge_system)
-    world.add_system(PassiveAbilitySystem(event_bus))
-    world.add_system(CombatResolutionSystem(event_bus, data_manager, PassiveAbilitySystem(event_bus), status_effect_factory))
+    passive_ability_system = PassiveAbilitySystem(event_bus)
+    world.add_system(passive_ability_system)
+    world.add_system(CombatResolutionSystem(event_bus, data_manager, passive_ability_system, status_effect_factory))
     world.add_system(DeadSystem(event_bus, world))
     world.add_system(EquipmentSystem(event_bus, data_manager))
     world.add_system(ItemSystem(event_bus, data_manager, world))
     world.add_system(BattlefieldSystem(event_bus, data_manager, world))
-    world.add_system(BattleEndSystem(event_bus, world))
+    world.add_system(BattleEndSystem(event_bus, world, stats_export_path))
+    if batch_health_changes:
+        world.add_system(HealthChangeBatchSystem(event_bus, world), priority=1000)  # 每帧最后合并派发
+    world.headless_builder = lambda child_event_bus: build_world(
+        child_event_bus, data_manager, headless=True, batch_health_changes=batch_health_changes)
+    return world
+
+def init_battlefield(event_bus: EventBus, battlefield_id: str = "tutorial_battlefield"):
+    """通过战场系统初始化战场并创建角色"""
+    event_bus.dispatch(GameEvent(EventName.BATTLEFIELD_INIT_REQUEST, {"battlefield_id": battlefield_id}))
+    event_bus.flush_coalesced()  # 战场初始化的播报在进入主循环前输出
+
+def main(journal_path: Optional[str] = None, use_sidecar: bool = False, stats_export_path: Optional[str] = None,
+         use_async: bool = False):
+    """
+    journal_path 不为空时，把本场战斗记录为二进制事件日志，可用 game.replay 回放。
+    use_sidecar=True 时日志改由旁路进程输出（见 game.sidecar），本进程只跑游戏逻辑和交互界面。
+    stats_export_path 不为空时统计事件总线的派发次数和耗时，战斗结束后导出为 JSON。
+    use_async=True 时使用 AsyncEventBus 和协程版主循环，等待玩家输入时不阻塞事件循环。
+    """
+    print("游戏启动中...")
+    # 1. 初始化核心服务
+    event_bus = AsyncEventBus() if use_async else EventBus()
+    print("加载游戏数据...")
+    data_manager = load_game_data()
+
+    # 2. 创建并注册所有系统
+    print("注册系统...")
+    world = build_world(event_bus, data_manager, log_enabled=not use_sidecar, stats_export_path=stats_export_path,
+                        async_input=use_async)
+    # 界面文字播报与输入提示交错，仍在本进程输出；只把日志交给旁路进程
+    sidecar = start_sidecar(event_bus, (EventName.LOG_REQUEST,)) if use_sidecar else None
 
     # 3. 创建角色（可选：使用战场系统或直接创建角色）
     print("创建角色...")
     character_factory = CharacterFactory(event_bus, data_manager)
     
+    journal_file = open(journal_path, "wb") if journal_path else None
+    recorder = EventJournalRecorder(event_bus, journal_file, rng=world.rng) if journal_file else None
+
     # 方式1：使用战场系统（推荐）
     # 初始化战场
-    from .core.event_bus import GameEvent
-    from .core.enums import EventName
-    event_bus.dispatch(GameEvent(EventName.BATTLEFIELD_INIT_REQUEST, {"battlefield_id": "tutorial_battlefield"}))
+    init_battlefield(event_bus, "tutorial_battlefield")
     
     # 方式2：直接创建角色（向后兼容）
     # hero = character_factory.create_character("hero", world)
@@ -102,7 +158,27 @@ def main():
     print("游戏开始!")
 
     # 4. 开始游戏循环
-    world.start()
+    try:
+        if use_async:
+            asyncio.run(world.start_async())
+        else:
+            world.start()
+    finally:
+        if recorder:
+            recorder.close()
+            journal_file.close()
+        if sidecar:
+            bridge, process = sidecar
+            bridge.close()
+            process.join()
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="运行一场战斗")
+    parser.add_argument("--journal", dest="journal_path", help="把本场战斗记录为二进制事件日志")
+    parser.add_argument("--sidecar", dest="use_sidecar", action="store_true", help="日志改由旁路进程输出")
+    parser.add_argument("--stats-export", dest="stats_export_path", help="开启事件统计，战斗结束后导出为 JSON")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="使用协程版主循环")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(**vars(parse_args()))
\ No newline at end of file
@@ -0,0 +1,87 @@
+import gc
+import tracemalloc
+import types
+from typing import Callable
+
+from .core import components as c
+from .status_effects.status_effect import StatusEffect
+
+DEFAULT_COUNT = 10_000
+
+def dict_backed(cls: type) -> type:
+    """
+    去掉 __slots__ 后的同名类型（实例属性存放在 __dict__ 中），即组件改为 slots 之前的表示。
+    方法、属性和 dataclass 生成的 __init__ 原样保留。
+    """
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in ('__slots__', '__dict__', '__weakref__')
+                 and not isinstance(value, types.MemberDescriptorType)}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+def _character_components(types_: dict[type, type]) -> Callable[[], list]:
+    """按 CharacterFactory 的组装方式构造一个角色的全部组件（数值取典型值）"""
+    t = types_.__getitem__
+    def build() -> list:
+        return [
+            t(c.HealthComponent)(None, None, 100.0, 100.0),
+            t(c.ManaComponent)(mana=50.0, max_mana=50.0),
+            t(c.EnergyComponent)(energy=0, max_energy=3, recovery_per_turn=1.0),
+            t(c.UltimateChargeComponent)(charge=0, max_charge=200, charge_per_spell=10),
+            t(c.SpeedComponent)(speed=10),
+            t(c.ShieldComponent)(shield_value=0.0),
+            t(c.StatusEffectContainerComponent)(),
+            t(c.SpellListComponent)(spells=[]),
+            t(c.UltimateSpellListComponent)(ultimate_spells=[]),
+            t(c.CritComponent)(crit_chance=0.1, crit_damage_multiplier=2.0),
+            t(c.StatsComponent)(attack=10.0, defense=5.0),
+            t(c.EquipmentComponent)(),
+            t(c.InventoryComponent)(),
+            t(c.TeamComponent)(team_id="player"),
+            t(c.PositionComponent)(position_id=0),
+            t(c.PlayerControlledComponent)(),
+        ]
+    return build
+
+def _poison_effect(types_: dict[type, type]) -> Callable[[], object]:
+    """按 StatusEffectFactory 的方式构造一层中毒；context 与数据文件共用同一个字典"""
+    effect_type = types_[StatusEffect]
+    context = {"damage_per_round": 5, "damage_type": "poison"}
+    def build() -> object:
+        return effect_type(effect_id="poison_01", name="中毒", duration=3, category="poison",
+                           stacking="stack_intensity", max_stacks=10, stack_count=3, context=context)
+    return build
+
+def measure(build: Callable[[], object], count: int) -> float:
+    """构造 count 个对象，返回平均每个占用的字节数（tracemalloc 统计）"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [build() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # 扣除保存结果的列表本身
+    return (after - before - objects.__sizeof__()) / count
+
+def run_benchmark(count: int = DEFAULT_COUNT) -> dict[str, tuple[float, float]]:
+    """返回 {对象类别: (改为 slots 之前的字节数, 当前字节数)}"""
+    slotted_types = [getattr(c, name) for name in dir(c)
+                     if isinstance(getattr(c, name), type) and getattr(c, name).__module__ == c.__name__]
+    slotted_types.append(StatusEffect)
+    current = {cls: cls for cls in slotted_types}
+    before = {cls: dict_backed(cls) for cls in slotted_types}
+    return {
+        "每个实体的组件": (measure(_character_components(before), count),
+                           measure(_character_components(current), count)),
+        "每个状态效果": (measure(_poison_effect(before), count),
+                         measure(_poison_effect(current), count)),
+    }
+
+def main(count: int = DEFAULT_COUNT):
+    for label, (before, after) in run_benchmark(count).items():
+        print(f"{label}: {before:.0f} 字节 -> {after:.0f} 字节 ({(1 - after / before) * 100:.0f}% 节省)")
+
+if __name__ == "__main__":
+    import sys
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
@@ -0,0 +1,90 @@
+import io
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from .core.event_bus import EventBus, GameEvent
+from .core.enums import EventName
+from .core.payloads import UIDisplayOptionsPayload
+from .core.journal import EventJournalRecorder, JournalRecord, PLAYER_CHOICE_EVENTS, read_journal
+from .main import build_world, init_battlefield, load_game_data
+from .systems.data_manager import DataManager
+
+MAX_REPLAY_TICKS = 1_000_000
+
+@dataclass
+class ReplayResult:
+    """回放结果。divergence_index 为 None 表示回放与日志完全一致"""
+    record_count: int
+    ticks: int
+    elapsed: float
+    divergence_index: Optional[int] = None
+    expected: Optional[JournalRecord] = None
+    actual: Optional[JournalRecord] = None
+
+    @property
+    def is_consistent(self) -> bool:
+        return self.divergence_index is None
+
+def replay_journal(stream: BinaryIO, data_manager: DataManager) -> ReplayResult:
+    """
+    根据事件日志无界面地重跑一场战斗：使用日志中的随机种子，
+    并按顺序把日志里的玩家选择喂回去。回放过程会重新记录一份日志，
+    与原日志逐条比对，返回第一处不一致的位置。
+    """
+    seed, records = read_journal(stream)
+    battlefield_id = next((r.fields[0] for r in records if r.event_name == EventName.BATTLEFIELD_INIT_REQUEST), None)
+    if battlefield_id is None:
+        raise ValueError("事件日志中没有战场初始化记录，无法回放")
+    choices = deque(r for r in records if r.event_name in PLAYER_CHOICE_EVENTS)
+
+    start_time = time.perf_counter()
+    event_bus = EventBus()
+    world = build_world(event_bus, data_manager, headless=True)
+
+    def on_display_options(event: GameEvent):
+        payload: UIDisplayOptionsPayload = event.payload
+        if not choices or choices[0].event_name != payload.response_event_name:
+            # 玩家选择已经对不上，回放无法继续
+            world.is_running = False
+            return
+        choice = choices.popleft()
+        event_bus.dispatch(GameEvent(payload.response_event_name,
+                                     {"choice_index": choice.fields[0], "context": payload.context}))
+    event_bus.subscribe(EventName.UI_DISPLAY_OPTIONS, on_display_options)
+
+    replay_stream = io.BytesIO()
+    recorder = EventJournalRecorder(event_bus, replay_stream, seed, world.rng)
+    init_battlefield(event_bus, battlefield_id)
+
+    # 不经过 game_loop，直接逐帧更新，不休眠
+    ticks = world.run_until(max_steps=MAX_REPLAY_TICKS)
+    recorder.close()
+    elapsed = time.perf_counter() - start_time
+
+    replay_stream.seek(0)
+    _, replayed = read_journal(replay_stream)
+    result = ReplayResult(record_count=len(replayed), ticks=ticks, elapsed=elapsed)
+    for index in range(max(len(records), len(replayed))):
+        expected = records[index] if index < len(records) else None
+        actual = replayed[index] if index < len(replayed) else None
+        if expected != actual:
+            result.divergence_index, result.expected, result.actual = index, expected, actual
+            break
+    return result
+
+def main(journal_path: str):
+    with open(journal_path, "rb") as f:
+        result = replay_journal(f, load_game_data())
+    print(f"回放完成: {result.record_count} 条记录, {result.ticks} 帧, 耗时 {result.elapsed * 1000:.1f} ms")
+    if result.is_consistent:
+        print("回放结果与日志一致")
+    else:
+        print(f"第 {result.divergence_index} 条记录不一致:")
+        print(f"  日志: {result.expected}")
+        print(f"  回放: {result.actual}")
+
+if __name__ == "__main__":
+    import sys
+    main(sys.argv[1])
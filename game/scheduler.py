@@ -0,0 +1,158 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .core.event_bus import EventBus, GameEvent
+from .core.enums import EventName
+from .core.payloads import UIDisplayOptionsPayload
+from .main import build_world, init_battlefield, load_game_data
+from .systems.data_manager import DataManager
+from .world import World, BattleOutcome, DEFAULT_MAX_BATTLE_STEPS
+
+# 每个世界每轮最多连续运行的时间（秒），到点后让给下一个世界
+DEFAULT_TIME_SLICE = 0.002
+
+# 玩家选择策略：根据选项载荷返回选项下标
+ChoicePolicy = Callable[[UIDisplayOptionsPayload], int]
+
+def first_choice(payload: UIDisplayOptionsPayload) -> int:
+    return 0
+
+def subscribe_choice_policy(event_bus: EventBus, choice_policy: ChoicePolicy):
+    """由 choice_policy 代替玩家回答所有选项（无界面运行时使用）"""
+    def on_display_options(event: GameEvent):
+        payload: UIDisplayOptionsPayload = event.payload
+        event_bus.dispatch(GameEvent(payload.response_event_name,
+                                     {"choice_index": choice_policy(payload), "context": payload.context}))
+    event_bus.subscribe(EventName.UI_DISPLAY_OPTIONS, on_display_options)
+
+@dataclass
+class ScheduledWorld:
+    """调度器中的一个世界，以及它的战斗结果和资源使用统计"""
+    name: str
+    world: World
+    outcome: BattleOutcome = field(default_factory=BattleOutcome)
+    cpu_limit: Optional[float] = None  # CPU 时间上限（秒），超出后停止这个世界
+    max_steps: int = DEFAULT_MAX_BATTLE_STEPS
+    cpu_time: float = 0.0   # 本线程在这个世界上消耗的 CPU 时间
+    wall_time: float = 0.0  # 在这个世界上花费的墙钟时间
+    slices: int = 0
+    stop_reason: Optional[str] = None  # "complete" / "stopped" / "cpu_limit" / "max_steps"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.stop_reason is not None
+
+    def _check_finished(self):
+        if self.outcome.is_complete:
+            self.stop_reason = "complete"
+        elif not self.world.is_running:
+            self.stop_reason = "stopped"
+        elif self.cpu_limit is not None and self.cpu_time >= self.cpu_limit:
+            self.stop_reason = "cpu_limit"
+        elif self.outcome.steps >= self.max_steps:
+            self.stop_reason = "max_steps"
+        if self.stop_reason is not None:
+            self.world.is_running = False
+
+class WorldScheduler:
+    """
+    在一个进程里托管多场战斗：每个世界有自己的事件总线和系统，共享同一个只读的 DataManager。
+    调度器轮流给每个世界一个时间片，在时间片内无休眠地连续推进它的帧（至少一帧），
+    时间片用完或战斗结束就切换到下一个世界，并记录每个世界消耗的 CPU 时间和墙钟时间。
+    每个世界有自己的随机数生成器（World.rng），战斗结果与调度顺序无关。
+    """
+    def __init__(self, data_manager: DataManager, time_slice: float = DEFAULT_TIME_SLICE):
+        self.data_manager = data_manager
+        self.time_slice = time_slice
+        self.active: list[ScheduledWorld] = []
+        self.finished: list[ScheduledWorld] = []
+        self.rounds = 0
+
+    def add_world(self, world: World, name: Optional[str] = None, cpu_limit: Optional[float] = None,
+                  max_steps: int = DEFAULT_MAX_BATTLE_STEPS) -> ScheduledWorld:
+        """托管一个已经初始化好战场的世界；BATTLEFIELD_COMPLETE 所在的帧结束后它就不再被调度"""
+        scheduled = ScheduledWorld(name or f"world-{len(self.active) + len(self.finished) + 1}", world,
+                                   cpu_limit=cpu_limit, max_steps=max_steps)
+        outcome = scheduled.outcome
+        def on_battlefield_complete(event: GameEvent):
+            outcome.battlefield_id = event.payload.get("battlefield_id")
+            outcome.result = event.payload.get("result")
+        world.event_bus.subscribe(EventName.BATTLEFIELD_COMPLETE, on_battlefield_complete)
+        world.is_running = True
+        self.active.append(scheduled)
+        return scheduled
+
+    def create_battle(self, battlefield_id: str = "tutorial_battlefield", name: Optional[str] = None,
+                      choice_policy: Optional[ChoicePolicy] = first_choice, cpu_limit: Optional[float] = None,
+                      max_steps: int = DEFAULT_MAX_BATTLE_STEPS) -> ScheduledWorld:
+        """
+        用共享的 DataManager 创建一个无界面的世界并初始化战场。
+        玩家角色的选择由 choice_policy 提供；传 None 时调用方需要自己订阅 UI_DISPLAY_OPTIONS。
+        """
+        event_bus = EventBus()
+        world = build_world(event_bus, self.data_manager, headless=True)
+        if choice_policy is not None:
+            subscribe_choice_policy(event_bus, choice_policy)
+        scheduled = self.add_world(world, name, cpu_limit, max_steps)
+        init_battlefield(event_bus, battlefield_id)
+        return scheduled
+
+    def run_slice(self, scheduled: ScheduledWorld):
+        """让一个世界运行一个时间片"""
+        world, outcome = scheduled.world, scheduled.outcome
+        step = world.step
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        deadline = wall_start + self.time_slice
+        steps = outcome.steps
+        max_steps = scheduled.max_steps
+        while True:
+            step()
+            steps += 1
+            if (outcome.result is not None or not world.is_running or steps >= max_steps
+                    or time.perf_counter() >= deadline):
+                break
+        outcome.steps = steps
+        scheduled.cpu_time += time.thread_time() - cpu_start
+        scheduled.wall_time += time.perf_counter() - wall_start
+        scheduled.slices += 1
+        scheduled._check_finished()
+
+    def run_round(self) -> int:
+        """给每个未结束的世界各一个时间片，返回仍未结束的世界数"""
+        still_active = []
+        for scheduled in self.active:
+            self.run_slice(scheduled)
+            (self.finished if scheduled.is_finished else still_active).append(scheduled)
+        self.active = still_active
+        self.rounds += 1
+        return len(self.active)
+
+    def run(self) -> list[ScheduledWorld]:
+        """轮流调度直到所有世界结束，返回全部世界（按结束顺序）"""
+        while self.active:
+            self.run_round()
+        return self.finished
+
+def main(count: int = 100, battlefield_id: str = "tutorial_battlefield"):
+    data_manager = load_game_data()
+    scheduler = WorldScheduler(data_manager)
+    for _ in range(count):
+        scheduler.create_battle(battlefield_id)
+    start_time = time.perf_counter()
+    results = scheduler.run()
+    elapsed = time.perf_counter() - start_time
+
+    by_result: dict[str, int] = {}
+    for scheduled in results:
+        key = scheduled.outcome.result or scheduled.stop_reason
+        by_result[key] = by_result.get(key, 0) + 1
+    cpu_time = sum(scheduled.cpu_time for scheduled in results)
+    print(f"{count} 场战斗，{scheduler.rounds} 轮调度，耗时 {elapsed * 1000:.1f} ms"
+          f"（CPU {cpu_time * 1000:.1f} ms，平均每场 {cpu_time / max(count, 1) * 1000:.2f} ms）")
+    print("结果: " + "，".join(f"{key} {n}" for key, n in by_result.items()))
+
+if __name__ == "__main__":
+    import sys
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,42 @@
+import json
+import multiprocessing
+from collections import Counter
+from typing import Iterable, Optional, Set
+
+from .core.event_bus import EventBus
+from .core.enums import EventName
+from .core.event_bridge import DEFAULT_BRIDGED_EVENTS, EventBridge, decode_event
+from .systems.log_system import LogSystem
+
+def run_sidecar(queue, hidden_tags: Optional[Set[str]] = None, analytics_path: Optional[str] = None):
+    """
+    旁路进程入口：从队列中取出事件批次，在本进程的事件总线上重新派发。
+    这里运行日志系统、文字播报和事件计数，收到 None 时退出。
+    """
+    event_bus = EventBus()
+    LogSystem(event_bus, hidden_tags=hidden_tags)
+    event_bus.subscribe(EventName.UI_MESSAGE, lambda e: print(e.payload.message))
+
+    event_counts: Counter = Counter()
+    while (batch := queue.get()) is not None:
+        for record in batch:
+            event = decode_event(record)
+            event_counts[event.name.name] += 1
+            event_bus.dispatch(event)
+
+    if analytics_path:
+        with open(analytics_path, "w", encoding="utf-8") as f:
+            json.dump(dict(event_counts), f, ensure_ascii=False, indent=2)
+
+def start_sidecar(event_bus: EventBus, event_names: Iterable[EventName] = DEFAULT_BRIDGED_EVENTS,
+                  hidden_tags: Optional[Set[str]] = None, analytics_path: Optional[str] = None) -> tuple[EventBridge, multiprocessing.Process]:
+    """
+    启动旁路进程并把选定事件桥接过去。
+    结束时调用 bridge.close() 再 join 进程。本进程中的 LogSystem 应关闭（例如 build_world(headless=True)）。
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run_sidecar, args=(queue, hidden_tags, analytics_path), daemon=True)
+    process.start()
+    bridge = EventBridge(event_bus, queue, event_names,
+                         log_filter=(lambda tag: tag not in hidden_tags) if hidden_tags else None)
+    return bridge, process
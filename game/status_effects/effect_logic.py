@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List, Optional
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
-from ..core.payloads import StatQueryPayload, HealRequestPayload, UIMessagePayload, DamageRequestPayload, GainShieldPayload
+from ..core.payloads import StatQueryPayload, HealRequestPayload, UIMessagePayload, GainShieldPayload, DAMAGE_REQUEST_POOL
 from ..core.entity import Entity
 from ..core.pipeline import EffectExecutionContext
 from .status_effect import StatusEffect
@@ -75,7 +75,7 @@ class DamageOverTimeEffect(EffectLogic):
                 event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(
                     f"**持续伤害**: {target.name} 因为 {caster_name} 施加的持续伤害 [{effect.name}] 受到 {total_damage:.1f} 点伤害"
                 )))
-            event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
+            event_bus.dispatch_pooled(EventName.DAMAGE_REQUEST, DAMAGE_REQUEST_POOL.acquire(
                 caster=effect.caster or target,
                 target=target,
                 source_spell_id=effect.effect_id,
@@ -87,7 +87,7 @@ class DamageOverTimeEffect(EffectLogic):
                 is_dot_damage=True,  # 标记为持续伤害
                 is_passive_damage=True,  # 新增，防止触发攻击被动
                 trigger_on_attack=False  # 新增，防止触发攻击被动
-            )))
+            ), DAMAGE_REQUEST_POOL)
 
 class StatModificationLogic(EffectLogic):
     """属性修改效果"""
@@ -136,7 +136,7 @@ class PoisonDotEffect(EffectLogic):
             event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(
                 f"**持续伤害**: {target.name} 因为 {caster_name} 施加的持续伤害 [{effect.name}] 受到 {total_damage:.1f} 点伤害"
             )))
-            event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
+            event_bus.dispatch_pooled(EventName.DAMAGE_REQUEST, DAMAGE_REQUEST_POOL.acquire(
                 caster=effect.caster or target,
                 target=target,
                 source_spell_id=effect.effect_id,
@@ -148,7 +148,7 @@ class PoisonDotEffect(EffectLogic):
                 is_dot_damage=True,  # 标记为持续伤害
                 is_passive_damage=True,  # 新增，防止触发攻击被动
                 trigger_on_attack=False  # 新增，防止触发攻击被动
-            )))
+            ), DAMAGE_REQUEST_POOL)
 
     def on_remove(self, target: Entity, effect: StatusEffect, event_bus: EventBus):
         pass
@@ -217,7 +217,7 @@ class PoisonEffectLogic(EffectLogic):
             event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(
                 f"**持续伤害**: {target.name} 因为 {caster_name} 施加的持续伤害 [{len(poison_effects)}个中毒状态] 受到 {total_damage:.1f} 点伤害"
             )))
-            event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
+            event_bus.dispatch_pooled(EventName.DAMAGE_REQUEST, DAMAGE_REQUEST_POOL.acquire(
                 caster=poison_effects[0].caster or target,
                 target=target,
                 source_spell_id="poison_01",
@@ -229,7 +229,7 @@ class PoisonEffectLogic(EffectLogic):
                 is_dot_damage=True,  # 标记为持续伤害
                 is_passive_damage=True,  # 新增，防止触发攻击被动
                 trigger_on_attack=False  # 新增，防止触发攻击被动
-            )))
+            ), DAMAGE_REQUEST_POOL)
         
         # 中毒层数减1
         for poison_effect in poison_effects:
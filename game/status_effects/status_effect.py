@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..core.entity import Entity
     from .effect_logic import EffectLogic
 
-@dataclass
+@dataclass(slots=True)
 class StatusEffect:
     """代表一个具体的Buff或Debuff实例"""
     effect_id: str
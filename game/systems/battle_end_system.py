@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from typing import Optional
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
 from ..core.payloads import UIMessagePayload
@@ -10,9 +11,10 @@ from ..core.entity import Entity
 class BattleEndSystem:
     """战斗结束系统，处理战场完成后的逻辑"""
     
-    def __init__(self, event_bus: EventBus, world: 'World'): # type: ignore
+    def __init__(self, event_bus: EventBus, world: 'World', stats_export_path: Optional[str] = None): # type: ignore
         self.event_bus = event_bus
         self.world = world
+        self.stats_export_path = stats_export_path  # 开启事件统计时，战斗结束后导出为 JSON
         
         # 订阅战场完成事件
         self.event_bus.subscribe(EventName.BATTLEFIELD_COMPLETE, self.on_battlefield_complete)
@@ -33,6 +35,11 @@ class BattleEndSystem:
         
         # 显示游戏结束信息
         self.show_game_end_message(result)
+
+        # 导出事件总线统计
+        if self.stats_export_path and self.event_bus.stats:
+            self.event_bus.stats.export_json(self.stats_export_path)
+            self.event_bus.log("[BATTLE_END]", "事件统计已导出到 {}", self.stats_export_path)
     
     def handle_victory(self, battlefield_id: str):
         """处理胜利逻辑"""
@@ -63,7 +70,7 @@ class BattleEndSystem:
         for entity in entities_to_remove:
             self.world.remove_entity(entity)
         
-        print(f"[BATTLE_END] 清理了 {len(entities_to_remove)} 个实体")
+        self.event_bus.log("[BATTLE_END]", "清理了 {} 个实体", len(entities_to_remove))
     
     def show_game_end_message(self, result: str):
         """显示游戏结束信息"""
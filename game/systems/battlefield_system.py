@@ -5,7 +5,7 @@ from typing import List, Dict, Any
 from ..core.event_bus import EventBus, GameEvent, EventName
 from ..core.entity import Entity
 from ..core.components import (BattlefieldComponent, BattlefieldConfigComponent, 
-                              EnemyWaveComponent, TeamComponent, DeadComponent, PositionComponent)
+                              EnemyWaveComponent, TeamComponent, PositionComponent)
 from ..core.payloads import UIMessagePayload
 from ..systems.data_manager import DataManager
 from ..systems.character_factory import CharacterFactory
@@ -172,7 +172,7 @@ class BattlefieldSystem:
     def on_round_end(self, event: GameEvent):
         """处理回合结束事件"""
         # 检查是否需要生成下一波敌人
-        battlefield_entities = [e for e in self.world.entities if e.has_component(BattlefieldComponent)]
+        battlefield_entities = self.world.query(BattlefieldComponent, alive=False)
         
         for battlefield_entity in battlefield_entities:
             battlefield_comp = battlefield_entity.get_component(BattlefieldComponent)
@@ -187,10 +187,7 @@ class BattlefieldSystem:
     def is_current_wave_completed(self, battlefield_entity: Entity) -> bool:
         """检查当前波次是否完成"""
         # 检查是否还有存活的敌人
-        alive_enemies = [e for e in self.world.entities 
-                        if e.has_component(TeamComponent) 
-                        and e.get_component(TeamComponent).team_id == "enemy"
-                        and not e.has_component(DeadComponent)]
+        alive_enemies = self.world.query(team="enemy")
         
         return len(alive_enemies) == 0
     
@@ -242,7 +239,7 @@ class BattlefieldSystem:
             return
         
         # 检查胜利/失败条件
-        battlefield_entities = [e for e in self.world.entities if e.has_component(BattlefieldComponent)]
+        battlefield_entities = self.world.query(BattlefieldComponent, alive=False)
         
         for battlefield_entity in battlefield_entities:
             self.check_victory_condition(battlefield_entity)
@@ -254,15 +251,9 @@ class BattlefieldSystem:
             return
         
         # 获取存活的玩家和敌人
-        alive_players = [e for e in self.world.entities 
-                        if e.has_component(TeamComponent) 
-                        and e.get_component(TeamComponent).team_id == "player"
-                        and not e.has_component(DeadComponent)]
-        
-        alive_enemies = [e for e in self.world.entities 
-                        if e.has_component(TeamComponent) 
-                        and e.get_component(TeamComponent).team_id == "enemy"
-                        and not e.has_component(DeadComponent)]
+        alive_players = self.world.query(team="player")
+        
+        alive_enemies = self.world.query(team="enemy")
         
         # 检查胜利条件
         if battlefield_comp.victory_condition == "all_enemies_defeated" and len(alive_enemies) == 0:
@@ -1,15 +1,109 @@
+import dataclasses
+from typing import Any, Callable
+
 from ..core.entity import Entity
 from ..core.components import (HealthComponent, ManaComponent, SpeedComponent, SpellListComponent, UltimateSpellListComponent,
                               ShieldComponent, StatusEffectContainerComponent, PlayerControlledComponent,
                               AIControlledComponent, CritComponent, OverhealToShieldComponent, StatsComponent,
                               EquipmentComponent, InventoryComponent, EnergyComponent, UltimateChargeComponent,
-                              PositionComponent, TeamComponent, AIComponent)
+                              PositionComponent, TeamComponent, AIComponent, EquipmentItem, InventoryItem)
 from ..core.event_bus import EventBus
 from ..core.enums import EventName
-from ..core.payloads import LogRequestPayload
 from ..core.event_bus import GameEvent
 from .passive_factory import PassiveFactory
 
+# 原型中记录的生成日志里代表实体名称的占位参数，克隆时替换为新实体的名称
+_ENTITY_NAME = object()
+
+def _init_args(component: Any) -> tuple:
+    """重新构造组件所需的构造函数参数（组件都是 dataclass，init=False 的字段由构造函数自己初始化）"""
+    return tuple(getattr(component, f.name) for f in dataclasses.fields(component) if f.init)
+
+# 构造参数中的可变容器（法术列表、AI行为配置、装备属性表等）：克隆时深复制，不与原型共用
+_CONTAINER_TYPES = (list, dict, set)
+
+def _container_positions(args: tuple) -> tuple[int, ...]:
+    return tuple(i for i, arg in enumerate(args) if isinstance(arg, _CONTAINER_TYPES))
+
+def _copy_container(value: Any) -> Any:
+    """深复制来自配置数据的容器（只含列表、字典、集合和不可变值），比 copy.deepcopy 快得多"""
+    if type(value) is dict:
+        return {key: _copy_container(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_copy_container(item) for item in value]
+    if type(value) is set:
+        return set(value)
+    return value
+
+def _construct(component_type: type, args: tuple, containers: tuple[int, ...]) -> Any:
+    """用构造参数重新构造组件，containers 位置上的参数先深复制"""
+    if containers:
+        args = list(args)
+        for i in containers:
+            args[i] = _copy_container(args[i])
+    return component_type(*args)
+
+def _copy_dataclass(obj: Any) -> Any:
+    args = _init_args(obj)
+    return _construct(type(obj), args, _container_positions(args))
+
+# 运行时会被修改的容器：克隆时换成新的，而不是与原型共用
+_COMPONENT_CLONERS: dict[type, Callable[[Any], Any]] = {
+    StatusEffectContainerComponent: lambda c: StatusEffectContainerComponent(),
+    EquipmentComponent: lambda c: EquipmentComponent(
+        equipment_slots=dict(c.equipment_slots),
+        equipped_items={equipment_id: _copy_dataclass(item) for equipment_id, item in c.equipped_items.items()}),
+    InventoryComponent: lambda c: InventoryComponent(
+        items={item_id: InventoryItem(item.item_id, item.quantity) for item_id, item in c.items.items()}),
+}
+
+class EntityPrototype:
+    """
+    编译好的实体原型：按模板构造一次的全部组件（不属于任何实体），以及生成实体时要输出的日志。
+    clone() 只复制组件，不再查找模板、读取属性、装备预设装备或创建被动组件。
+    """
+    __slots__ = ('template_id', 'name', 'components', 'component_lists', 'spawn_logs', '_recipe', '_list_recipe')
+
+    def __init__(self, template_id: str, name: str, components: dict[type, Any],
+                 component_lists: dict[type, list], spawn_logs: list[tuple[str, str, tuple]]):
+        self.template_id = template_id
+        self.name = name
+        self.components = components
+        self.component_lists = component_lists
+        self.spawn_logs = spawn_logs
+        # 克隆时用到的数据预先取好：组件类型、专用复制函数（没有则用原型的字段值重新构造）、
+        # 构造参数，以及其中需要深复制的容器参数的位置
+        self._recipe = tuple((component_type, _COMPONENT_CLONERS.get(component_type), component,
+                              *self._args_recipe(None if component_type is HealthComponent else component))
+                             for component_type, component in components.items())
+        self._list_recipe = tuple((component_type, tuple(self._args_recipe(component) for component in component_list))
+                                  for component_type, component_list in component_lists.items())
+
+    @staticmethod
+    def _args_recipe(component: Any) -> tuple:
+        if component is None:
+            return None, ()
+        args = _init_args(component)
+        return args, _container_positions(args)
+
+    def clone(self, event_bus: EventBus, entity_name: str = None) -> Entity:
+        """生成一个新实体（新的实体ID）。实体尚未加入世界，组件直接放入实体，不经过 add_component"""
+        entity = Entity(entity_name or self.name, event_bus)
+        components = entity._components
+        for component_type, cloner, component, args, containers in self._recipe:
+            if component_type is HealthComponent:
+                components[component_type] = HealthComponent(entity, event_bus, component.hp, component.max_hp)
+            elif cloner is not None:
+                components[component_type] = cloner(component)
+            elif containers:
+                components[component_type] = _construct(component_type, args, containers)
+            else:
+                components[component_type] = component_type(*args)
+        for component_type, recipes in self._list_recipe:
+            entity._component_lists[component_type] = [_construct(component_type, args, containers)
+                                                       for args, containers in recipes]
+        return entity
+
 class CharacterFactory:
     """角色工厂类，负责根据配置创建角色实体"""
     
@@ -17,6 +111,7 @@ class CharacterFactory:
         self.event_bus = event_bus
         self.data_manager = data_manager
         self.passive_factory = PassiveFactory(data_manager)
+        self.prototypes: dict[str, EntityPrototype] = {}  # 模板ID -> 编译好的原型
     
     def create_character(self, character_id: str, world) -> Entity:
         """根据角色ID创建角色实体（向后兼容）"""
@@ -28,27 +123,49 @@ class CharacterFactory:
         entity = world.add_entity(Entity(character_data['name'], self.event_bus))
     
     def create_character_from_template(self, template_id: str, entity_name: str = None) -> Entity:
-        """根据模板ID创建角色实体"""
+        """根据模板ID创建角色实体：每个模板只在第一次使用时编译原型，之后都是克隆"""
+        prototype = self.prototypes.get(template_id)
+        if prototype is None:
+            prototype = self.prototypes[template_id] = self.compile_prototype(template_id)
+        return self.spawn(prototype, entity_name)
+
+    def spawn(self, prototype: EntityPrototype, entity_name: str = None) -> Entity:
+        """从原型生成实体，并输出与逐个构造组件时相同的日志"""
+        entity = prototype.clone(self.event_bus, entity_name)
+        for tag, template, args in prototype.spawn_logs:
+            self.event_bus.log(tag, template, *(entity.name if arg is _ENTITY_NAME else arg for arg in args))
+        return entity
+
+    def compile_prototype(self, template_id: str) -> EntityPrototype:
+        """根据模板ID构造实体原型"""
         # 首先尝试从avatar数据中查找
         template_data = self.data_manager.get_avatar_data(template_id)
         if template_data:
-            return self._create_character_from_data(template_data, entity_name or template_data.get('name', template_id), template_id)
+            return self._compile_prototype_from_data(template_data, template_data.get('name', template_id), template_id)
         
         # 然后尝试从enemy数据中查找
         template_data = self.data_manager.get_enemy_data(template_id)
         if template_data:
-            return self._create_character_from_data(template_data, entity_name or template_data.get('name', template_id), template_id)
+            return self._compile_prototype_from_data(template_data, template_data.get('name', template_id), template_id)
         
         # 最后尝试从character数据中查找（向后兼容）
         template_data = self.data_manager.get_character_data(template_id)
         if template_data:
-            return self._create_character_from_data(template_data, entity_name or template_data.get('name', template_id), template_id)
+            return self._compile_prototype_from_data(template_data, template_data.get('name', template_id), template_id)
         
         raise ValueError(f"未找到角色模板: {template_id}")
+
+    def clear_prototypes(self):
+        """丢弃已编译的原型；重新加载游戏数据后调用"""
+        self.prototypes.clear()
     
     def _create_character_from_data(self, character_data: dict, entity_name: str, template_id: str = None) -> Entity:
-        """根据角色数据创建角色实体"""
-        # 创建实体
+        """根据角色数据创建角色实体（不缓存原型）"""
+        return self.spawn(self._compile_prototype_from_data(character_data, entity_name, template_id), entity_name)
+
+    def _compile_prototype_from_data(self, character_data: dict, entity_name: str, template_id: str = None) -> EntityPrototype:
+        """根据角色数据构造原型：组件装配在一个临时实体上，日志记录下来留到生成实体时输出"""
+        spawn_logs: list[tuple[str, str, tuple]] = []
         entity = Entity(entity_name, self.event_bus)
         
         # 添加基础组件
@@ -80,10 +197,10 @@ class CharacterFactory:
         entity.add_component(InventoryComponent())
         
         # 装备预设的装备
-        self._equip_preset_equipment(entity, equipment_slots, template_id or entity_name)
+        self._equip_preset_equipment(entity, equipment_slots, template_id or entity_name, spawn_logs)
         
         # 添加预设的物品
-        self._add_preset_items(entity, template_id or entity_name)
+        self._add_preset_items(entity, template_id or entity_name, spawn_logs)
         
         # 更新装备属性
         self._update_equipment_stats(entity, template_id or entity_name)
@@ -99,15 +216,15 @@ class CharacterFactory:
         
         # 添加被动能力组件
         passive_versions = character_data.get('passives', [])
-        self._add_passive_components(entity, passive_versions)
+        self._add_passive_components(entity, passive_versions, spawn_logs)
         
         # 如果是敌人，添加AI组件
         if entity.has_component(TeamComponent) and entity.get_component(TeamComponent).team_id == "enemy":
             self._add_ai_component(entity, character_data.get('template_id', entity.name))
         
-        return entity
+        return EntityPrototype(template_id, entity_name, entity._components, entity._component_lists, spawn_logs)
     
-    def _add_passive_components(self, entity: Entity, passives_versions: list):
+    def _add_passive_components(self, entity: Entity, passives_versions: list, spawn_logs: list):
         """添加被动能力组件"""
         for version_id in passives_versions:
             try:
@@ -116,10 +233,10 @@ class CharacterFactory:
                 if component:
                     entity.add_component(component)
                     passive_info = self.data_manager.get_passive_version_data(version_id)
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[PASSIVE Load]", f"成功添加被动能力: {passive_info['name']} ({version_id})")))
+                    spawn_logs.append(("[PASSIVE Load]", "成功添加被动能力: {} ({})", (passive_info['name'], version_id)))
                     
             except Exception as e:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[PASSIVE Load]", f"创建被动能力组件失败: {e}")))
+                spawn_logs.append(("[PASSIVE Load]", "创建被动能力组件失败: {}", (e,)))
                 continue
 
     def _add_ai_component(self, entity: Entity, template_id: str):
@@ -147,7 +264,7 @@ class CharacterFactory:
         
         entity.add_component(ai_component)
     
-    def _equip_preset_equipment(self, entity: Entity, equipment_slots: dict, character_id: str):
+    def _equip_preset_equipment(self, entity: Entity, equipment_slots: dict, character_id: str, spawn_logs: list):
         """装备预设的装备"""
         equipment_comp = entity.get_component(EquipmentComponent)
         if not equipment_comp:
@@ -160,7 +277,6 @@ class CharacterFactory:
                     equipment_data = self.data_manager.get_equipment_data(equipment_id)
                     if equipment_data:
                         # 创建装备实例
-                        from ..core.components import EquipmentItem
                         equipment_item = EquipmentItem(
                             equipment_id=equipment_id,
                             name=equipment_data['name'],
@@ -179,16 +295,12 @@ class CharacterFactory:
                         equipment_comp.equip_item(slot, equipment_id, equipment_item)
                         
                         # 记录日志
-                        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                            "[EQUIPMENT]", f"✅ {entity.name} 自动装备了 {equipment_item.name}"
-                        )))
+                        spawn_logs.append(("[EQUIPMENT]", "✅ {} 自动装备了 {}", (_ENTITY_NAME, equipment_item.name)))
                         
                 except Exception as e:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[EQUIPMENT]", f"❌ {entity.name} 装备 {equipment_id} 失败: {e}"
-                    )))
+                    spawn_logs.append(("[EQUIPMENT]", "❌ {} 装备 {} 失败: {}", (_ENTITY_NAME, equipment_id, e)))
     
-    def _add_preset_items(self, entity: Entity, character_id: str):
+    def _add_preset_items(self, entity: Entity, character_id: str, spawn_logs: list):
         """添加预设的物品"""
         inventory_comp = entity.get_component(InventoryComponent)
         if not inventory_comp:
@@ -207,9 +319,7 @@ class CharacterFactory:
                 inventory_comp.add_item(item_id, quantity)
                 item_data = self.data_manager.get_item_data(item_id)
                 if item_data:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[INVENTORY]", f"✅ {entity.name} 获得了 {item_data['name']} x{quantity}"
-                    )))
+                    spawn_logs.append(("[INVENTORY]", "✅ {} 获得了 {} x{}", (_ENTITY_NAME, item_data['name'], quantity)))
         
         elif character_id == "boss" or "boss" in character_id.lower():
             # 给BOSS一些初始物品
@@ -222,9 +332,7 @@ class CharacterFactory:
                 inventory_comp.add_item(item_id, quantity)
                 item_data = self.data_manager.get_item_data(item_id)
                 if item_data:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[INVENTORY]", f"✅ {entity.name} 获得了 {item_data['name']} x{quantity}"
-                    )))
+                    spawn_logs.append(("[INVENTORY]", "✅ {} 获得了 {} x{}", (_ENTITY_NAME, item_data['name'], quantity)))
     
     def _update_equipment_stats(self, entity: Entity, character_id: str):
         """更新角色装备属性"""
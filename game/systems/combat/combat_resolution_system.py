@@ -1,10 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import TYPE_CHECKING, Optional, List
 from ...core.event_bus import EventBus, GameEvent
 from ...core.enums import EventName
-from ...core.payloads import DamageRequestPayload, HealRequestPayload, LogRequestPayload, EffectResolutionPayload, GainShieldPayload
+from ...core.payloads import DamageRequestPayload, HealRequestPayload, EffectResolutionPayload, GainShieldPayload
 from ...core.components import HealthComponent, ShieldComponent, StatusEffectContainerComponent
-from ...core.pipeline import Pipeline, EffectExecutionContext
+from ...core.pipeline import Pipeline, EFFECT_CONTEXT_POOL
 
 # --- 导入新的处理器 ---
 from .damage_processors import AttackDefenseHandler, CritHandler, ShieldHandler, ResistanceHandler, LifestealHandler, ThornsHandler, CounterStrikeHandler, AttackTriggerPassiveHandler
@@ -14,6 +14,16 @@ if TYPE_CHECKING:
     from ..data_manager import DataManager
     from ..passive_ability_system import PassiveAbilitySystem
 
+# 载荷类型 -> 作为上下文 metadata 传入的字段名（caster/target 已在构造函数中明确指定）
+_METADATA_FIELDS: dict[type, tuple[str, ...]] = {}
+
+def _payload_metadata(payload) -> dict:
+    names = _METADATA_FIELDS.get(type(payload))
+    if names is None:
+        names = _METADATA_FIELDS[type(payload)] = tuple(
+            f.name for f in fields(payload) if f.name not in ('caster', 'target'))
+    return {name: getattr(payload, name) for name in names}
+
 class CombatResolutionSystem:
     def __init__(self, event_bus: EventBus, data_manager: Optional['DataManager'] = None, passive_system: Optional['PassiveAbilitySystem'] = None, status_effect_factory=None):
         self.event_bus = event_bus
@@ -70,42 +80,34 @@ class CombatResolutionSystem:
         target_shield_before = shield_comp_before.shield_value if shield_comp_before else 0
         target_status_effects_before = len(status_comp_before.effects) if status_comp_before else 0
         
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[COMBAT]", f"--- 开始伤害结算: {payload.source_spell_name} from {payload.caster.name} to {payload.target.name} ---"
-        )))
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[COMBAT]", f"基础伤害: {payload.base_damage:.1f}"
-        )))
-        
-        # 创建伤害执行上下文，将 payload 所有属性作为 metadata 传入. copy()是为了不改变payload的值
-        payload_dict = vars(payload).copy()
-        # 移除已经在构造函数中明确指定的参数
-        payload_dict.pop('caster', None)
-        payload_dict.pop('target', None)
+        self.event_bus.log("[COMBAT]", "--- 开始伤害结算: {} from {} to {} ---", payload.source_spell_name, payload.caster.name, payload.target.name)
+        self.event_bus.log("[COMBAT]", "基础伤害: {:.1f}", payload.base_damage)
         
-        context = EffectExecutionContext(
+        # 创建伤害执行上下文，将 payload 所有属性作为 metadata 传入（复制一份，不改变payload的值）
+        context = EFFECT_CONTEXT_POOL.acquire(
             source=payload.caster,
             target=payload.target,
             effect_type='damage',
             initial_value=payload.base_damage,
-            **payload_dict
+            **_payload_metadata(payload)
         )
         
-        # 执行伤害计算管线
-        resolved_context = self.damage_pipeline.execute(context)
-        final_damage = int(resolved_context.current_value)
+        try:
+            # 执行伤害计算管线
+            resolved_context = self.damage_pipeline.execute(context)
+            final_damage = int(resolved_context.current_value)
         
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[COMBAT]", f"最终伤害: {final_damage:.1f}"
-        )))
+            self.event_bus.log("[COMBAT]", "最终伤害: {:.1f}", final_damage)
 
-        # 施加伤害
-        if final_damage > 0:
-            if (health_comp := payload.target.get_component(HealthComponent)):
-                health_comp.hp -= final_damage
+            # 施加伤害
+            if final_damage > 0:
+                if (health_comp := payload.target.get_component(HealthComponent)):
+                    health_comp.hp -= final_damage
         
-        # 执行造成伤害后的管线 (吸血、反伤、攻击触发被动)
-        self.post_damage_pipeline.execute(resolved_context)
+            # 执行造成伤害后的管线 (吸血、反伤、攻击触发被动)
+            self.post_damage_pipeline.execute(resolved_context)
+        finally:
+            EFFECT_CONTEXT_POOL.release(context)
         
         # 记录攻击后的状态
         health_comp_after = payload.target.get_component(HealthComponent)
@@ -166,7 +168,7 @@ class CombatResolutionSystem:
                 no_effect_produced=not has_effect,
                 is_dot_damage=getattr(payload, 'is_dot_damage', False)  # 新增
             )))
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[COMBAT]", "--- 伤害结算完毕 ---")))
+        self.event_bus.log("[COMBAT]", "--- 伤害结算完毕 ---")
 
 
     def on_heal_request(self, event: GameEvent):
@@ -181,61 +183,51 @@ class CombatResolutionSystem:
         target_shield_before = shield_comp_before.shield_value if shield_comp_before else 0
         target_status_effects_before = len(status_comp_before.effects) if status_comp_before else 0
         
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[HEAL]", f"--- 开始治疗结算: {payload.source_spell_name} on {payload.target.name} ---"
-        )))
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-             "[HEAL]", f"基础治疗: {payload.base_heal:.1f}"
-        )))
+        self.event_bus.log("[HEAL]", "--- 开始治疗结算: {} on {} ---", payload.source_spell_name, payload.target.name)
+        self.event_bus.log("[HEAL]", "基础治疗: {:.1f}", payload.base_heal)
 
         # 创建治疗执行上下文
-        payload_dict = vars(payload).copy()
-        # 移除已经在构造函数中明确指定的参数
-        payload_dict.pop('caster', None)
-        payload_dict.pop('target', None)
-        
-        context = EffectExecutionContext(
+        context = EFFECT_CONTEXT_POOL.acquire(
             source=payload.caster,
             target=payload.target,
             effect_type='heal',
             initial_value=payload.base_heal,
-            **payload_dict
+            **_payload_metadata(payload)
         )
-        # 如果治疗不可被修改（如吸血），直接跳过管线
-        if not payload.can_be_modified:
-            final_heal = payload.base_heal
-        else:
-            # 执行治疗计算管线
-            resolved_context = self.heal_pipeline.execute(context)
-            final_heal = resolved_context.current_value
+        try:
+            # 如果治疗不可被修改（如吸血），直接跳过管线
+            if not payload.can_be_modified:
+                final_heal = payload.base_heal
+            else:
+                # 执行治疗计算管线
+                resolved_context = self.heal_pipeline.execute(context)
+                final_heal = resolved_context.current_value
         
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[HEAL]", f"最终治疗: {int(final_heal):.1f}"
-        )))
+            self.event_bus.log("[HEAL]", "最终治疗: {:.1f}", int(final_heal))
 
-        # 计算实际治疗量和溢出治疗量
-        actual_heal = 0
-        overheal_amount = 0
+            # 计算实际治疗量和溢出治疗量
+            actual_heal = 0
+            overheal_amount = 0
 
-        if final_heal > 0:
-            if (health_comp := payload.target.get_component(HealthComponent)):
-                missing_health = health_comp.max_hp - health_comp.hp
-                actual_heal = min(final_heal, missing_health)
-                overheal_amount = final_heal - actual_heal
+            if final_heal > 0:
+                if (health_comp := payload.target.get_component(HealthComponent)):
+                    missing_health = health_comp.max_hp - health_comp.hp
+                    actual_heal = min(final_heal, missing_health)
+                    overheal_amount = final_heal - actual_heal
 
-                context.current_value = actual_heal
-                context.overheal_amount = overheal_amount
+                    context.current_value = actual_heal
+                    context.overheal_amount = overheal_amount
 
-        # 施加治疗
-        if final_heal > 0 and health_comp:
-            health_comp.hp += actual_heal
-        if overheal_amount > 0:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[HEAL]", f"实际治疗: {actual_heal:.1f}, 溢出治疗: {overheal_amount:.1f}"
-             )))
+            # 施加治疗
+            if final_heal > 0 and health_comp:
+                health_comp.hp += actual_heal
+            if overheal_amount > 0:
+                self.event_bus.log("[HEAL]", "实际治疗: {:.1f}, 溢出治疗: {:.1f}", actual_heal, overheal_amount)
         
-        # 执行治疗后管线
-        self.post_heal_pipeline.execute(context)
+            # 执行治疗后管线
+            self.post_heal_pipeline.execute(context)
+        finally:
+            EFFECT_CONTEXT_POOL.release(context)
         
         # 记录治疗后的状态
         health_comp_after = payload.target.get_component(HealthComponent)
@@ -292,11 +284,11 @@ class CombatResolutionSystem:
             no_effect_produced=not has_effect,
             is_dot_damage=False  # 治疗不是持续伤害
         )))
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[HEAL]", "--- 治疗结算完毕 ---")))
+        self.event_bus.log("[HEAL]", "--- 治疗结算完毕 ---")
     def on_gain_shield_request(self, event: GameEvent):
         payload: GainShieldPayload = event.payload
         if (shield_comp := payload.target.get_component(ShieldComponent)):
             shield_comp.shield_value += payload.amount
         else:
             shield_comp = payload.target.add_component(ShieldComponent(shield_value=payload.amount))
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[COMBAT]", f"来源[{payload.source}] 获得了 {payload.amount:.1f} 点护盾")))
\ No newline at end of file
+        self.event_bus.log("[COMBAT]", "来源[{}] 获得了 {:.1f} 点护盾", payload.source, payload.amount)
\ No newline at end of file
@@ -2,10 +2,15 @@ import random
 from ...core.pipeline import Processor, EffectExecutionContext
 from ...core.event_bus import EventBus, GameEvent
 from ...core.enums import EventName
-from ...core.payloads import LogRequestPayload, HealRequestPayload, DamageRequestPayload, ApplyStatusEffectRequestPayload
+from ...core.payloads import HealRequestPayload, DamageRequestPayload, ApplyStatusEffectRequestPayload
 from ...core.components import ShieldComponent, ResistanceComponent, ThornsComponent, CounterStrikeComponent, AttackTriggerPassiveComponent, EquipmentComponent
 from ...core.entity import Entity
 
+def world_rng(entity: Entity):
+    """实体所在世界的随机数生成器；不在世界中的实体使用全局随机数"""
+    world = getattr(entity, '_world', None)
+    return world.rng if world is not None else random
+
 class BaseProcessor(Processor[EffectExecutionContext]):
     """处理器的基类，方便统一注入EventBus"""
     def __init__(self, event_bus: EventBus):
@@ -51,13 +56,9 @@ class AttackDefenseHandler(BaseProcessor):
         
         # 记录日志（只有当有实际变化时才记录）
         if defense_reduction > 0:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[COMBAT]", f"🛡️ {context.target.name} 的防御力({target_defense})提供了 {defense_percentage*100:.1f}% 减伤，减少了 {defense_reduction:.1f} 点伤害"
-            )))
+            self.event_bus.log("[COMBAT]", "🛡️ {} 的防御力({})提供了 {:.1f}% 减伤，减少了 {:.1f} 点伤害", context.target.name, target_defense, defense_percentage*100, defense_reduction)
             
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[COMBAT]", f"防御力计算: {original_damage:.1f} - {defense_reduction:.1f} = {context.current_value:.1f}"
-            )))
+            self.event_bus.log("[COMBAT]", "防御力计算: {:.1f} - {:.1f} = {:.1f}", original_damage, defense_reduction, context.current_value)
         
         return context
 
@@ -67,32 +68,27 @@ class CritHandler(BaseProcessor):
         can_crit = context.metadata.get("can_crit", False)
         crit_chance = context.metadata.get("crit_chance", 0.0)
         crit_damage_multiplier = context.metadata.get("crit_damage_multiplier", 1.5)
-        random_roll = random.random()
-        compare_tip = f"(判定: random_roll={random_roll:.3f} {'<' if random_roll < crit_chance else '≥'} crit_chance={crit_chance:.3f}，{'会暴击' if random_roll < crit_chance else '不会暴击'})"
-        log_prefix = f"[暴击判定] can_crit={can_crit}, crit_chance={crit_chance:.3f}, crit_damage_multiplier={crit_damage_multiplier:.2f}, random_roll={random_roll:.3f} {compare_tip}"
+        random_roll = world_rng(context.target).random()
+        # 判定前缀比较长，日志关闭时不拼接
+        log_prefix = ""
+        if self.event_bus.is_log_enabled("[COMBAT]"):
+            compare_tip = f"(判定: random_roll={random_roll:.3f} {'<' if random_roll < crit_chance else '≥'} crit_chance={crit_chance:.3f}，{'会暴击' if random_roll < crit_chance else '不会暴击'})"
+            log_prefix = f"[暴击判定] can_crit={can_crit}, crit_chance={crit_chance:.3f}, crit_damage_multiplier={crit_damage_multiplier:.2f}, random_roll={random_roll:.3f} {compare_tip}"
 
         if not can_crit:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[COMBAT]", f"{log_prefix} → 未暴击 - 原因：该技能不支持暴击"
-            )))
+            self.event_bus.log("[COMBAT]", "{} → 未暴击 - 原因：该技能不支持暴击", log_prefix)
             return context
 
         if crit_chance <= 0.0:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[COMBAT]", f"{log_prefix} → 未暴击 - 原因：暴击率为 0%"
-            )))
+            self.event_bus.log("[COMBAT]", "{} → 未暴击 - 原因：暴击率为 0%", log_prefix)
             return context
 
         if random_roll < crit_chance:
             original_damage = context.current_value
             context.current_value *= crit_damage_multiplier
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[COMBAT]", f"{log_prefix} → 💥 暴击成功！伤害从 {original_damage:.1f} 提升至 {context.current_value:.1f} (x{crit_damage_multiplier:.2f})"
-            )))
+            self.event_bus.log("[COMBAT]", "{} → 💥 暴击成功！伤害从 {:.1f} 提升至 {:.1f} (x{:.2f})", log_prefix, original_damage, context.current_value, crit_damage_multiplier)
         else:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[COMBAT]", f"{log_prefix} → 未暴击 - 原因：暴击判定失败 (暴击率: {crit_chance*100:.1f}%)"
-            )))
+            self.event_bus.log("[COMBAT]", "{} → 未暴击 - 原因：暴击判定失败 (暴击率: {:.1f}%)", log_prefix, crit_chance*100)
         return context
 
 class ShieldHandler(BaseProcessor):
@@ -105,9 +101,7 @@ class ShieldHandler(BaseProcessor):
                 context.current_value -= blocked
                 # 实际减少护盾值
                 shield_comp.shield_value -= blocked
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[COMBAT]", f"🛡️ {target.name} 的护盾抵消了 {blocked:.1f} 点伤害，剩余护盾: {shield_comp.shield_value:.1f}"
-                )))
+                self.event_bus.log("[COMBAT]", "🛡️ {} 的护盾抵消了 {:.1f} 点伤害，剩余护盾: {:.1f}", target.name, blocked, shield_comp.shield_value)
         return context
 
 class ResistanceHandler(BaseProcessor):
@@ -143,10 +137,7 @@ class ResistanceHandler(BaseProcessor):
             # 只有当实际减伤大于0时才播报
             if damage_reduced > 0.1:  # 使用0.1作为阈值，避免浮点数精度问题
                 resistance_info = ", ".join(applied_resistances)
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[COMBAT]", 
-                    f"{target.name} 的 {resistance_info}抗性抵抗了 {damage_reduced:.1f} 点伤害，伤害从 {original_damage:.1f} 降低到 {context.current_value:.1f}"
-                )))
+                self.event_bus.log("[COMBAT]", "{} 的 {}抗性抵抗了 {:.1f} 点伤害，伤害从 {:.1f} 降低到 {:.1f}", target.name, resistance_info, damage_reduced, original_damage, context.current_value)
         
         return context
 
@@ -158,7 +149,7 @@ class LifestealHandler(BaseProcessor):
         lifesteal_ratio = context.metadata.get("lifesteal_ratio", 0.0)
         if lifesteal_ratio > 0 and context.current_value > 0:
             heal_amount = context.current_value * lifesteal_ratio
-            self.event_bus.dispatch(GameEvent(EventName.HEAL_REQUEST, HealRequestPayload(
+            self.event_bus.post(GameEvent(EventName.HEAL_REQUEST, HealRequestPayload(
                 caster=context.source,
                 target=context.source,
                 source_spell_id="lifesteal",
@@ -167,9 +158,7 @@ class LifestealHandler(BaseProcessor):
                 heal_type="blood",
                 can_be_modified=False # 吸血通常不应被重伤等效果影响
             )))
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[COMBAT]", f"🩸 {context.source.name} 通过吸血恢复了 {heal_amount:.1f} 点生命"
-            )))
+            self.event_bus.log("[COMBAT]", "🩸 {} 通过吸血恢复了 {:.1f} 点生命", context.source.name, heal_amount)
         return context
 
 class ThornsHandler(BaseProcessor):
@@ -186,10 +175,8 @@ class ThornsHandler(BaseProcessor):
         if thorns_comp := context.target.get_component(ThornsComponent):
             if thorns_comp.thorns_percentage > 0:
                 reflection_damage = context.current_value * thorns_comp.thorns_percentage
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[PASSIVE]", f"🌵 {context.target.name} 的反伤对 {context.source.name} 造成了 {reflection_damage:.1f} 点伤害"
-                )))
-                self.event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
+                self.event_bus.log("[PASSIVE]", "🌵 {} 的反伤对 {} 造成了 {:.1f} 点伤害", context.target.name, context.source.name, reflection_damage)
+                self.event_bus.post(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
                     caster=context.target,
                     target=context.source,
                     source_spell_id="thorns",
@@ -220,10 +207,8 @@ class CounterStrikeHandler(BaseProcessor):
                 # 减少攻击者的武器耐久
                 self._reduce_attacker_weapon_durability(context.source)
                 
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[PASSIVE]", f"⚔️ {context.target.name} 的反震对 {context.source.name} 造成了 {counter_strike_comp.counter_damage:.1f} 点伤害"
-                )))
-                self.event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
+                self.event_bus.log("[PASSIVE]", "⚔️ {} 的反震对 {} 造成了 {:.1f} 点伤害", context.target.name, context.source.name, counter_strike_comp.counter_damage)
+                self.event_bus.post(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
                     caster=context.target,
                     target=context.source,
                     source_spell_id="counter_strike",
@@ -249,9 +234,7 @@ class CounterStrikeHandler(BaseProcessor):
                 was_destroyed = main_hand_weapon.lose_durability('counter_strike')
                 
                 if was_destroyed:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[PASSIVE]", f"⚔️ {attacker.name} 的主手武器因反震而损坏！"
-                    )))
+                    self.event_bus.log("[PASSIVE]", "⚔️ {} 的主手武器因反震而损坏！", attacker.name)
                     # 卸下损坏的武器
                     equipment_comp.unequip_item('main_hand')
                 else:
@@ -259,9 +242,7 @@ class CounterStrikeHandler(BaseProcessor):
                     durability_after = main_hand_weapon.current_durability
                     durability_lost = durability_before - durability_after
                     
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[PASSIVE]", f"⚔️ {attacker.name} 的主手武器耐久度因反震从 {durability_before} 降低到 {durability_after} (减少{durability_lost}点，剩余{main_hand_weapon.get_durability_percentage():.1f}%)"
-                    )))
+                    self.event_bus.log("[PASSIVE]", "⚔️ {} 的主手武器耐久度因反震从 {} 降低到 {} (减少{}点，剩余{:.1f}%)", attacker.name, durability_before, durability_after, durability_lost, main_hand_weapon.get_durability_percentage())
 
 class AttackTriggerPassiveHandler(BaseProcessor):
     """处理攻击触发的被动效果"""
@@ -282,9 +263,10 @@ class AttackTriggerPassiveHandler(BaseProcessor):
             return context
         
         # 根据数据驱动的触发条件处理被动效果
+        rng = world_rng(context.source)
         for passive_comp in attack_trigger_passives:
             # 检查触发概率
-            if random.random() > passive_comp.trigger_chance:
+            if rng.random() > passive_comp.trigger_chance:
                 continue
             
             # 根据触发条件判断是否应该触发
@@ -319,21 +301,15 @@ class AttackTriggerPassiveHandler(BaseProcessor):
         if damage_amount > 0:
             # 显示不同的日志信息
             if passive_comp.use_damage_ratio:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[PASSIVE]", f"⚡ {context.source.name} 的 {passive_comp.effect_name} 对 {target.name} 造成了额外 {damage_amount:.1f} 点伤害 (基于实际伤害的 {passive_comp.damage_ratio*100:.0f}%)"
-                )))
+                self.event_bus.log("[PASSIVE]", "⚡ {} 的 {} 对 {} 造成了额外 {:.1f} 点伤害 (基于实际伤害的 {:.0f}%)", context.source.name, passive_comp.effect_name, target.name, damage_amount, passive_comp.damage_ratio*100)
             else:
                 # 固定数值模式，即使攻击被护盾抵消也能触发
                 if context.current_value <= 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[PASSIVE]", f"⚡ {context.source.name} 的 {passive_comp.effect_name} 附加伤害, 对 {target.name} 造成了 {damage_amount:.1f} 点伤害"
-                    )))
+                    self.event_bus.log("[PASSIVE]", "⚡ {} 的 {} 附加伤害, 对 {} 造成了 {:.1f} 点伤害", context.source.name, passive_comp.effect_name, target.name, damage_amount)
                 else:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[PASSIVE]", f"⚡ {context.source.name} 的 {passive_comp.effect_name} 对 {target.name} 造成了 {damage_amount:.1f} 点伤害"
-                    )))
+                    self.event_bus.log("[PASSIVE]", "⚡ {} 的 {} 对 {} 造成了 {:.1f} 点伤害", context.source.name, passive_comp.effect_name, target.name, damage_amount)
             
-            self.event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
+            self.event_bus.post(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
                 caster=context.source,
                 target=target,
                 source_spell_id=passive_comp.passive_id,
@@ -363,21 +339,15 @@ class AttackTriggerPassiveHandler(BaseProcessor):
         if heal_amount > 0:
             # 显示不同的日志信息
             if passive_comp.use_damage_ratio:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[PASSIVE]", f"💚 {context.source.name} 的 {passive_comp.effect_name} 为 {target.name} 恢复了 {heal_amount:.1f} 点生命 (基于实际伤害的 {passive_comp.damage_ratio*100:.0f}%)"
-                )))
+                self.event_bus.log("[PASSIVE]", "💚 {} 的 {} 为 {} 恢复了 {:.1f} 点生命 (基于实际伤害的 {:.0f}%)", context.source.name, passive_comp.effect_name, target.name, heal_amount, passive_comp.damage_ratio*100)
             else:
                 # 固定数值模式，即使攻击被护盾抵消也能触发
                 if context.current_value <= 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[PASSIVE]", f"💚 {context.source.name} 的 {passive_comp.effect_name} 附加治疗, 为 {target.name} 恢复了 {heal_amount:.1f} 点生命"
-                    )))
+                    self.event_bus.log("[PASSIVE]", "💚 {} 的 {} 附加治疗, 为 {} 恢复了 {:.1f} 点生命", context.source.name, passive_comp.effect_name, target.name, heal_amount)
                 else:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[PASSIVE]", f"💚 {context.source.name} 的 {passive_comp.effect_name} 为 {target.name} 恢复了 {heal_amount:.1f} 点生命"
-                    )))
+                    self.event_bus.log("[PASSIVE]", "💚 {} 的 {} 为 {} 恢复了 {:.1f} 点生命", context.source.name, passive_comp.effect_name, target.name, heal_amount)
             
-            self.event_bus.dispatch(GameEvent(EventName.HEAL_REQUEST, HealRequestPayload(
+            self.event_bus.post(GameEvent(EventName.HEAL_REQUEST, HealRequestPayload(
                 caster=context.source,
                 target=target,
                 source_spell_id=passive_comp.passive_id,
@@ -403,14 +373,10 @@ class AttackTriggerPassiveHandler(BaseProcessor):
             effect.caster = context.source
             # 显示不同的日志信息
             if context.current_value <= 0:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[PASSIVE]", f"✨ {context.source.name} 的 {passive_comp.effect_name} 穿透护盾为 {target.name} 施加了 {effect.name} 效果"
-                )))
+                self.event_bus.log("[PASSIVE]", "✨ {} 的 {} 穿透护盾为 {} 施加了 {} 效果", context.source.name, passive_comp.effect_name, target.name, effect.name)
             else:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[PASSIVE]", f"✨ {context.source.name} 的 {passive_comp.effect_name} 为 {target.name} 施加了 {effect.name} 效果"
-                )))
-            self.event_bus.dispatch(GameEvent(EventName.APPLY_STATUS_EFFECT_REQUEST, ApplyStatusEffectRequestPayload(
+                self.event_bus.log("[PASSIVE]", "✨ {} 的 {} 为 {} 施加了 {} 效果", context.source.name, passive_comp.effect_name, target.name, effect.name)
+            self.event_bus.post(GameEvent(EventName.APPLY_STATUS_EFFECT_REQUEST, ApplyStatusEffectRequestPayload(
                 target=target,
                 effect=effect
             )))
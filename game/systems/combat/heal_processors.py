@@ -1,7 +1,6 @@
 from ...core.pipeline import Processor, EffectExecutionContext
 from ...core.event_bus import EventBus, GameEvent
 from ...core.enums import EventName
-from ...core.payloads import LogRequestPayload
 from ...core.components import GrievousWoundsComponent, OverhealToShieldComponent, ShieldComponent
 from ...core.components import StatusEffectContainerComponent
 
@@ -26,10 +25,7 @@ class GrievousWoundsHandler(BaseProcessor):
             original_heal = context.current_value
             context.current_value *= (1 - grievous_comp.reduction)
             heal_reduced = original_heal - context.current_value
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[COMBAT]", 
-                f"{target.name} 的重伤效果使治疗降低了 {grievous_comp.reduction*100:.0f}%，治疗从 {original_heal:.1f} 降低到 {context.current_value:.1f}，减少了 {heal_reduced:.1f} 点治疗"
-            )))
+            self.event_bus.log("[COMBAT]", "{} 的重伤效果使治疗降低了 {:.0f}%，治疗从 {:.1f} 降低到 {:.1f}，减少了 {:.1f} 点治疗", target.name, grievous_comp.reduction*100, original_heal, context.current_value, heal_reduced)
         return context
 
 class StatusEffectOverhealToShieldHandler(BaseProcessor):
@@ -70,9 +66,7 @@ class SkillOverhealToShieldHandler(BaseProcessor):
             else:
                 context.target.add_component(ShieldComponent(shield_value=shield_to_add))
             
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[SKILL]", f"📜 技能 [{context.metadata.get('source_spell_name')}] 的效果将 {context.overheal_amount:.1f} 点溢出治疗转化为了 {shield_to_add:.1f} 点护盾！"
-            )))
+            self.event_bus.log("[SKILL]", "📜 技能 [{}] 的效果将 {:.1f} 点溢出治疗转化为了 {:.1f} 点护盾！", context.metadata.get('source_spell_name'), context.overheal_amount, shield_to_add)
 
             # 5. 【关键】消耗掉溢出治疗，防止后续处理器重复转化
             context.overheal_amount = 0.0
@@ -103,9 +97,7 @@ class OverhealToShieldHandler(BaseProcessor):
                 context.target.add_component(ShieldComponent(shield_value=shield_to_add))
             
             # 5. 派发日志事件
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[PASSIVE]", f"✨ {context.target.name} 的 {context.overheal_amount:.1f} 点溢出治疗转化为了 {shield_to_add:.1f} 点护盾！"
-            )))
+            self.event_bus.log("[PASSIVE]", "✨ {} 的 {:.1f} 点溢出治疗转化为了 {:.1f} 点护盾！", context.target.name, context.overheal_amount, shield_to_add)
             
             # 6. 【关键】消耗掉溢出治疗，防止后续处理器重复转化
             context.overheal_amount = 0.0
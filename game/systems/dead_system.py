@@ -1,19 +1,48 @@
+import math
 from ..core.event_bus import GameEvent
 from ..core.enums import EventName
-from ..core.payloads import UIMessagePayload, LogRequestPayload
+from ..core.payloads import UIMessagePayload
 from ..core.components import DeadComponent, HealthComponent
 
 class DeadSystem:
     def __init__(self, event_bus, world):
         self.event_bus = event_bus
         self.world = world
-    
+        # 上次检查之后是否有生命值变化；只用于告诉主循环本系统是否空闲
+        self._health_changed = True
+        self.event_bus.subscribe(EventName.HEALTH_CHANGED, self.on_health_changed)
+
+    def on_health_changed(self, event: GameEvent):
+        self._health_changed = True
+
+    def next_update_time(self):
+        """没有生命值变化时 update 找不到新的死亡角色"""
+        return None if self._health_changed else math.inf
+
+    def copy_state_from(self, other: 'DeadSystem'):
+        """复制另一个世界中是否有待检查的生命值变化（World.fork 调用）"""
+        self._health_changed = other._health_changed
+
+    def save_state(self) -> tuple:
+        """World.snapshot 调用"""
+        return (self._health_changed,)
+
+    def load_state(self, state: tuple):
+        """还原 save_state() 的结果（World.restore 调用）"""
+        self._health_changed = state[0]
+
     def update(self):
-        for entity in self.world.entities:
+        self._health_changed = False
+        if (store := self.world.component_store) is not None:
+            # 列式存储：一次筛出所有生命值归零的实体，只对它们逐个检查
+            candidates = store.entities_where_le(HealthComponent, "hp", 0)
+        else:
+            candidates = self.world.query()
+        for entity in candidates:
             if not entity.has_component(DeadComponent) and (hc := entity.get_component(HealthComponent)) and hc.hp <= 0:
                 entity.add_component(DeadComponent())
                 self.event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(f"**[{entity.name}] 倒下了！**")))
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[SYSTEM]", f"实体 {entity.name} 已死亡")))
+                self.event_bus.log("[SYSTEM]", "实体 {} 已死亡", entity.name)
                 
                 # 发送实体死亡事件，让战场系统处理胜利条件检测
                 self.event_bus.dispatch(GameEvent(EventName.ENTITY_DEATH, {
@@ -2,9 +2,8 @@ from typing import Dict, Any
 from .base_handler import EffectHandler
 from ...core.entity import Entity
 from ...core.components import HealthComponent, ShieldComponent, DeadComponent, CritComponent, StatsComponent
-from ...core.payloads import EffectResolutionPayload, DamageRequestPayload
+from ...core.payloads import EffectResolutionPayload, DAMAGE_REQUEST_POOL
 from ...core.enums import EventName
-from ...core.event_bus import GameEvent
 
 class DirectDamageHandler(EffectHandler):
     """处理直接伤害效果"""
@@ -33,7 +32,7 @@ class DirectDamageHandler(EffectHandler):
         spell_data = self.data_manager.get_spell_data(payload.source_spell)
         
         # 创建伤害请求负载，与旧版本保持一致
-        damage_payload = DamageRequestPayload(
+        damage_payload = DAMAGE_REQUEST_POOL.acquire(
             caster=caster,
             target=target,
             source_spell_id=payload.source_spell,
@@ -51,8 +50,8 @@ class DirectDamageHandler(EffectHandler):
             trigger_on_attack=spell_data.get('trigger_on_attack', True) if spell_data else True
         )
         
-        # 派发伤害请求事件，让战斗解析系统处理
-        self.event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, damage_payload))
+        # 派发伤害请求事件，让战斗解析系统处理；派发结束后载荷回收到对象池
+        self.event_bus.dispatch_pooled(EventName.DAMAGE_REQUEST, damage_payload, DAMAGE_REQUEST_POOL)
     
     def _calculate_damage_with_stat(self, caster: Entity, base_damage: float, damage_percentage: float, affected_stat: str) -> float:
         """根据影响属性计算实际伤害"""
@@ -74,12 +73,7 @@ class DirectDamageHandler(EffectHandler):
         actual_damage = base_damage + (stat_value * damage_percentage)
         
         # 记录日志
-        from ...core.payloads import LogRequestPayload
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, 
-            LogRequestPayload(
-                "[SPELL]", 
-                f"💥 {caster.name} 的 {affected_stat}({stat_value}) 通过 {damage_percentage*100:.0f}% 加成，伤害从 {base_damage:.1f} 提升至 {actual_damage:.1f}"
-            )
-        ))
+        self.event_bus.log("[SPELL]", "💥 {} 的 {}({}) 通过 {:.0f}% 加成，伤害从 {:.1f} 提升至 {:.1f}",
+                           caster.name, affected_stat, stat_value, damage_percentage*100, base_damage, actual_damage)
         
         return actual_damage
\ No newline at end of file
@@ -2,7 +2,7 @@ from typing import Dict, Any
 from .base_handler import EffectHandler
 from ...core.entity import Entity
 from ...core.components import HealthComponent, DeadComponent, StatsComponent
-from ...core.payloads import EffectResolutionPayload, HealRequestPayload, LogRequestPayload
+from ...core.payloads import EffectResolutionPayload, HealRequestPayload
 from ...core.enums import EventName
 from ...core.event_bus import GameEvent
 
@@ -81,11 +81,7 @@ class HealHandler(EffectHandler):
         actual_heal = base_heal + (stat_value * heal_percentage)
         
         # 记录日志
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, 
-            LogRequestPayload(
-                "[SPELL]", 
-                f"💚 {caster.name} 的治疗受 {stat_owner.name} 的 {affected_stat}({stat_value}) 通过 {heal_percentage*100:.0f}% 加成，治疗从 {base_heal:.1f} 提升至 {actual_heal:.1f}"
-            )
-        ))
+        self.event_bus.log("[SPELL]", "💚 {} 的治疗受 {} 的 {}({}) 通过 {:.0f}% 加成，治疗从 {:.1f} 提升至 {:.1f}",
+                           caster.name, stat_owner.name, affected_stat, stat_value, heal_percentage*100, base_heal, actual_heal)
         
         return actual_heal
\ No newline at end of file
@@ -10,7 +10,7 @@ from ..core.enums import EventName
 from ..core.payloads import ActionRequestPayload, PlayerSpellChoicePayload, PlayerTargetChoicePayload
 from ..core.components import (AIComponent, TeamComponent, HealthComponent, ManaComponent, 
                               EnergyComponent, SpellListComponent, UltimateSpellListComponent,
-                              DeadComponent, PositionComponent)
+                              PositionComponent)
 from ..core.entity import Entity
 from ..systems.data_manager import DataManager
 
@@ -77,13 +77,9 @@ class EnemyAISystem:
     def analyze_battlefield(self, enemy: Entity) -> Dict[str, Any]:
         """分析战场情况"""
         # 获取所有存活的实体
-        alive_entities = [e for e in self.world.entities if not e.has_component(DeadComponent)]
-        
         # 分类实体
-        allies = [e for e in alive_entities if e.has_component(TeamComponent) and 
-                 e.get_component(TeamComponent).team_id == "enemy" and e != enemy]
-        enemies = [e for e in alive_entities if e.has_component(TeamComponent) and 
-                  e.get_component(TeamComponent).team_id == "player"]
+        allies = [e for e in self.world.query(team="enemy") if e != enemy]
+        enemies = self.world.query(team="player")
         
         # 分析血量情况
         ally_health_analysis = self.analyze_health(allies)
@@ -1,6 +1,6 @@
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
-from ..core.payloads import EnergyChangeRequestPayload, LogRequestPayload, EnergyCostRequestPayload
+from ..core.payloads import EnergyChangeRequestPayload, EnergyCostRequestPayload
 from ..core.components import EnergyComponent
 
 class EnergySystem:
@@ -22,14 +22,10 @@ class EnergySystem:
             if energy_comp.energy >= cost:
                 energy_comp.energy -= cost
                 payload.is_affordable = True
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[ENERGY]", f"⚡ {entity.name} 消耗了 {cost} 点能量 (剩余: {energy_comp.energy:.0f})"
-                )))
+                self.event_bus.log("[ENERGY]", "⚡ {} 消耗了 {} 点能量 (剩余: {:.0f})", entity.name, cost, energy_comp.energy)
             else:
                 payload.is_affordable = False
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[ENERGY]", f"❌ {entity.name} 能量不足！需要 {cost} 点，当前只有 {energy_comp.energy:.0f} 点"
-                )))
+                self.event_bus.log("[ENERGY]", "❌ {} 能量不足！需要 {} 点，当前只有 {:.0f} 点", entity.name, cost, energy_comp.energy)
     
     def _on_energy_change_request(self, event):
         """处理能量点变化请求"""
@@ -46,17 +42,13 @@ class EnergySystem:
                 energy_comp.energy = min(energy_comp.energy + amount, energy_comp.max_energy)
                 actual_restore = energy_comp.energy - old_energy
                 if actual_restore > 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[ENERGY]", f"⚡ {target.name} 恢复了 {actual_restore:.0f} 点能量 (当前: {energy_comp.energy:.0f}/{energy_comp.max_energy:.0f})"
-                    )))
+                    self.event_bus.log("[ENERGY]", "⚡ {} 恢复了 {:.0f} 点能量 (当前: {:.0f}/{:.0f})", target.name, actual_restore, energy_comp.energy, energy_comp.max_energy)
             elif change_type == "consume":
                 # 消耗能量点
                 energy_comp.energy = max(energy_comp.energy - amount, 0)
                 actual_consume = old_energy - energy_comp.energy
                 if actual_consume > 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[ENERGY]", f"⚡ {target.name} 消耗了 {actual_consume:.0f} 点能量 (剩余: {energy_comp.energy:.0f})"
-                    )))
+                    self.event_bus.log("[ENERGY]", "⚡ {} 消耗了 {:.0f} 点能量 (剩余: {:.0f})", target.name, actual_consume, energy_comp.energy)
     
     def restore_energy_at_turn_end(self, entity):
         """回合结束时恢复能量点"""
@@ -68,6 +60,4 @@ class EnergySystem:
                 energy_comp.energy = min(energy_comp.energy + recovery_amount, energy_comp.max_energy)
                 actual_restore = energy_comp.energy - old_energy
                 if actual_restore > 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[ENERGY]", f"⚡ {entity.name} 回合结束，恢复了 {actual_restore:.0f} 点能量 (当前: {energy_comp.energy:.0f}/{energy_comp.max_energy:.0f})"
-                    ))) 
\ No newline at end of file
+                    self.event_bus.log("[ENERGY]", "⚡ {} 回合结束，恢复了 {:.0f} 点能量 (当前: {:.0f}/{:.0f})", entity.name, actual_restore, energy_comp.energy, energy_comp.max_energy) 
\ No newline at end of file
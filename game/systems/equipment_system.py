@@ -3,7 +3,6 @@ from ..core.entity import Entity
 from ..core.components import EquipmentComponent, EquipmentItem, StatsComponent
 from ..core.event_bus import EventBus
 from ..core.enums import EventName
-from ..core.payloads import LogRequestPayload
 from ..core.event_bus import GameEvent
 from .data_manager import DataManager
 
@@ -26,24 +25,18 @@ class EquipmentSystem:
         
         # 检查槽位是否已被占用
         if equipment_comp.equipment_slots.get(slot):
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[EQUIPMENT]", f"❌ {entity.name} 的 {slot} 槽位已被占用"
-            )))
+            self.event_bus.log("[EQUIPMENT]", "❌ {} 的 {} 槽位已被占用", entity.name, slot)
             return False
         
         # 获取装备数据
         equipment_data = self.data_manager.get_equipment_data(equipment_id)
         if not equipment_data:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[EQUIPMENT]", f"❌ 未找到装备数据: {equipment_id}"
-            )))
+            self.event_bus.log("[EQUIPMENT]", "❌ 未找到装备数据: {}", equipment_id)
             return False
         
         # 检查槽位是否匹配
         if equipment_data.get('slot') != slot:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[EQUIPMENT]", f"❌ {equipment_data['name']} 不能装备到 {slot} 槽位"
-            )))
+            self.event_bus.log("[EQUIPMENT]", "❌ {} 不能装备到 {} 槽位", equipment_data['name'], slot)
             return False
         
         # 创建装备实例
@@ -67,9 +60,7 @@ class EquipmentSystem:
         # 更新角色属性
         self._update_entity_stats(entity)
         
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[EQUIPMENT]", f"✅ {entity.name} 装备了 {equipment_item.name}"
-        )))
+        self.event_bus.log("[EQUIPMENT]", "✅ {} 装备了 {}", entity.name, equipment_item.name)
         
         return True
     
@@ -84,9 +75,7 @@ class EquipmentSystem:
             # 更新角色属性
             self._update_entity_stats(entity)
             
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[EQUIPMENT]", f"🔧 {entity.name} 卸下了 {equipment_item.name}"
-            )))
+            self.event_bus.log("[EQUIPMENT]", "🔧 {} 卸下了 {}", entity.name, equipment_item.name)
         
         return equipment_item
     
@@ -131,16 +120,12 @@ class EquipmentSystem:
             
             if is_destroyed:
                 destroyed_items.append(equipment_item)
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[EQUIPMENT]", f"💥 {entity.name} 的 {equipment_item.name} 耐久度耗尽，装备被摧毁！"
-                )))
+                self.event_bus.log("[EQUIPMENT]", "💥 {} 的 {} 耐久度耗尽，装备被摧毁！", entity.name, equipment_item.name)
             else:
                 # 记录耐久度变化
                 durability_percentage = equipment_item.get_durability_percentage()
                 if durability_percentage <= 20:  # 耐久度低于20%时提醒
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[EQUIPMENT]", f"⚠️ {entity.name} 的 {equipment_item.name} 耐久度仅剩 {durability_percentage:.1f}%"
-                    )))
+                    self.event_bus.log("[EQUIPMENT]", "⚠️ {} 的 {} 耐久度仅剩 {:.1f}%", entity.name, equipment_item.name, durability_percentage)
         
         # 移除被摧毁的装备
         for destroyed_item in destroyed_items:
@@ -203,14 +188,10 @@ class EquipmentSystem:
         
         # 记录装备属性变化
         if equipment_comp.get_all_equipped_items():
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[EQUIPMENT]", f"📊 {entity.name} 装备属性: 攻击力 {total_attack:.1f}, 防御力 {total_defense:.1f}"
-            )))
+            self.event_bus.log("[EQUIPMENT]", "📊 {} 装备属性: 攻击力 {:.1f}, 防御力 {:.1f}", entity.name, total_attack, total_defense)
         else:
             # 当没有装备时，显示基础属性
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[EQUIPMENT]", f"📊 {entity.name} 基础属性: 攻击力 {base_attack:.1f}, 防御力 {base_defense:.1f}"
-            )))
+            self.event_bus.log("[EQUIPMENT]", "📊 {} 基础属性: 攻击力 {:.1f}, 防御力 {:.1f}", entity.name, base_attack, base_defense)
     
     def get_equipment_info(self, entity: Entity) -> Dict:
         """获取角色的装备信息"""
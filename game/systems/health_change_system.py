@@ -0,0 +1,63 @@
+import math
+from ..core.event_bus import EventBus, GameEvent
+from ..core.enums import EventName
+from ..core.entity import Entity
+from ..core.payloads import HealthChangePayload
+
+class HealthChangeBatchSystem:
+    """
+    生命值变更批处理（可选，见 build_world(batch_health_changes=True)）。
+    加入世界后，HealthComponent.hp 的写入不再立即派发 HEALTH_CHANGED，而是记为脏数据：
+    本批第一次写入前的旧值和最新值。一次行动结束（ACTION_AFTER_ACT）时以及每帧末尾，
+    每个生命值有净变化的实体只派发一条合并后的 HEALTH_CHANGED。
+    多段伤害、群体伤害、持续伤害和吸血反伤因此不再逐次触发被动、界面等监听器。
+    """
+    def __init__(self, event_bus: EventBus, world: 'World'): # type: ignore
+        self.event_bus = event_bus
+        self.world = world
+        # 实体 -> [旧生命值, 新生命值, 最大生命值]，按第一次写入的顺序
+        self._dirty: dict[Entity, list[float]] = {}
+        world.health_tracker = self
+        # 在回合管理等监听器之前派发，行动后结算看到的是已经合并过的生命值变化
+        event_bus.subscribe(EventName.ACTION_AFTER_ACT, self.on_action_after_act, priority=0)
+
+    def record(self, entity: Entity, old_hp: float, new_hp: float, max_hp: float):
+        entry = self._dirty.get(entity)
+        if entry is None:
+            self._dirty[entity] = [old_hp, new_hp, max_hp]
+        else:
+            entry[1] = new_hp
+            entry[2] = max_hp
+
+    def on_action_after_act(self, event: GameEvent):
+        self.flush()
+
+    def update(self):
+        self.flush()
+
+    def next_update_time(self):
+        return None if self._dirty else math.inf
+
+    def copy_state_from(self, other: 'HealthChangeBatchSystem'):
+        """复制另一个世界中尚未派发的生命值变化（World.fork 调用），实体换成本世界中ID相同的实体"""
+        get_entity = self.world.get_entity
+        self._dirty = {get_entity(entity.id): list(entry) for entity, entry in other._dirty.items()}
+
+    def save_state(self) -> tuple:
+        """尚未派发的生命值变化，实体记为ID（World.snapshot 调用）"""
+        return tuple((entity.id, *entry) for entity, entry in self._dirty.items())
+
+    def load_state(self, state: tuple):
+        """还原 save_state() 的结果（World.restore 调用）"""
+        get_entity = self.world.get_entity
+        self._dirty = {get_entity(entity_id): [old_hp, new_hp, max_hp]
+                       for entity_id, old_hp, new_hp, max_hp in state}
+
+    def flush(self):
+        """派发所有待合并的生命值变化；监听器中产生的新变化会在同一次 flush 中继续派发"""
+        while self._dirty:
+            dirty, self._dirty = self._dirty, {}
+            for entity, (old_hp, new_hp, max_hp) in dirty.items():
+                if new_hp != old_hp:
+                    self.event_bus.dispatch(GameEvent(EventName.HEALTH_CHANGED,
+                                                      HealthChangePayload(entity, old_hp, new_hp, max_hp)))
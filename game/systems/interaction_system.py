@@ -4,8 +4,7 @@ from typing import Optional
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
 from ..core.payloads import (CastSpellRequestPayload, DamageRequestPayload, RemoveStatusEffectRequestPayload,
-                             UpdateStatusEffectsDurationRequestPayload, ApplyStatusEffectRequestPayload, UIMessagePayload,
-                             LogRequestPayload)
+                             UpdateStatusEffectsDurationRequestPayload, ApplyStatusEffectRequestPayload, UIMessagePayload)
 from ..core.entity import Entity
 from ..core.components import StatusEffectContainerComponent
 
@@ -84,9 +83,7 @@ class InteractionSystem:
             if damage > 0:
                 spell_data = self.data_manager.get_spell_data(source_spell_id)
                 spell_name = spell_data.get('name', '燃烬引爆') if spell_data else '燃烬引爆'
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[Interaction]", f"[法术联动] {spell_name} 消耗 {target_effect.effect_id} 造成 {damage:.1f} 伤害"
-                )))
+                self.event_bus.log("[Interaction]", "[法术联动] {} 消耗 {} 造成 {:.1f} 伤害", spell_name, target_effect.effect_id, damage)
                 #派发伤害
                 self.event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
                     caster=caster, 
@@ -109,9 +106,7 @@ class InteractionSystem:
                 
                 # 添加伤害减半的log提示
                 if context.get("damage_multiplier", 1) != 1:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                       "[Interaction]", f"[法术联动] {damage_payload.source_spell_name} 原始伤害 {original_damage:.1f}，因交互减半为 {new_damage:.1f}"
-                    )))
+                    self.event_bus.log("[Interaction]", "[法术联动] {} 原始伤害 {:.1f}，因交互减半为 {:.1f}", damage_payload.source_spell_name, original_damage, new_damage)
             if (remove_id := context.get("remove_effect_id")):
                 self.event_bus.dispatch(GameEvent(EventName.REMOVE_STATUS_EFFECT_REQUEST,RemoveStatusEffectRequestPayload(
                     target=target, 
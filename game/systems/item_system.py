@@ -3,7 +3,7 @@ from ..core.entity import Entity
 from ..core.components import InventoryComponent, HealthComponent, ManaComponent, StatusEffectContainerComponent
 from ..core.event_bus import EventBus
 from ..core.enums import EventName
-from ..core.payloads import LogRequestPayload, DamageRequestPayload, HealRequestPayload, ManaChangeRequestPayload
+from ..core.payloads import DamageRequestPayload, HealRequestPayload, ManaChangeRequestPayload
 from ..core.event_bus import GameEvent
 from .data_manager import DataManager
 
@@ -27,17 +27,13 @@ class ItemSystem:
         
         # 检查是否有该物品
         if not inventory_comp.has_item(item_id):
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[ITEM]", f"❌ {user.name} 没有 {item_id} 这个物品"
-            )))
+            self.event_bus.log("[ITEM]", "❌ {} 没有 {} 这个物品", user.name, item_id)
             return False
         
         # 获取物品数据
         item_data = self.data_manager.get_item_data(item_id)
         if not item_data:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[ITEM]", f"❌ 未找到物品数据: {item_id}"
-            )))
+            self.event_bus.log("[ITEM]", "❌ 未找到物品数据: {}", item_id)
             return False
         
         # 确定目标
@@ -45,9 +41,7 @@ class ItemSystem:
             target = self._determine_target(user, item_data)
         
         if target is None:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[ITEM]", f"❌ 无法确定 {item_data['name']} 的使用目标"
-            )))
+            self.event_bus.log("[ITEM]", "❌ 无法确定 {} 的使用目标", item_data['name'])
             return False
         
         # 检查使用条件
@@ -62,9 +56,7 @@ class ItemSystem:
             inventory_comp.remove_item(item_id, 1)
             
             # 记录使用日志
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[ITEM]", f"✅ {user.name} 使用了 {item_data['name']}"
-            )))
+            self.event_bus.log("[ITEM]", "✅ {} 使用了 {}", user.name, item_data['name'])
         
         return success
     
@@ -79,20 +71,17 @@ class ItemSystem:
             return user
         elif target_type == 'ally':
             # 选择友军目标（玩家控制的实体）
-            from ..core.components import PlayerControlledComponent, DeadComponent
-            allies = [e for e in self.world.entities 
-                     if e.has_component(PlayerControlledComponent) and not e.has_component(DeadComponent)]
+            from ..core.components import PlayerControlledComponent
+            allies = self.world.query(PlayerControlledComponent)
             return allies[0] if allies else None
         elif target_type == 'enemy':
             # 选择敌人目标（AI控制的实体）
-            from ..core.components import AIControlledComponent, DeadComponent
-            enemies = [e for e in self.world.entities 
-                      if e.has_component(AIControlledComponent) and not e.has_component(DeadComponent)]
+            from ..core.components import AIControlledComponent
+            enemies = self.world.query(AIControlledComponent)
             return enemies[0] if enemies else None
         else:
             # 任意目标
-            from ..core.components import DeadComponent
-            all_entities = [e for e in self.world.entities if not e.has_component(DeadComponent)]
+            all_entities = self.world.query()
             return all_entities[0] if all_entities else None
     
     def _check_use_condition(self, user: Entity, target: Entity, item_data: Dict) -> bool:
@@ -136,9 +125,7 @@ class ItemSystem:
         elif effect_type == 'experience':
             return self._apply_experience_effect(user, effect_value)
         else:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[ITEM]", f"❌ 未知的物品效果类型: {effect_type}"
-            )))
+            self.event_bus.log("[ITEM]", "❌ 未知的物品效果类型: {}", effect_type)
             return False
     
     def _apply_heal_effect(self, target: Entity, heal_amount: float) -> bool:
@@ -177,17 +164,13 @@ class ItemSystem:
     def _apply_cure_status_effect(self, target: Entity, status_type: str) -> bool:
         """应用状态效果治疗"""
         # 这里需要实现状态效果移除逻辑
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[ITEM]", f"✅ {target.name} 的 {status_type} 状态被治愈"
-        )))
+        self.event_bus.log("[ITEM]", "✅ {} 的 {} 状态被治愈", target.name, status_type)
         return True
     
     def _apply_status_effect(self, user: Entity, target: Entity, status_effect: str) -> bool:
         """应用状态效果"""
         # 这里需要实现状态效果应用逻辑
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[ITEM]", f"✅ {target.name} 被施加了 {status_effect} 状态"
-        )))
+        self.event_bus.log("[ITEM]", "✅ {} 被施加了 {} 状态", target.name, status_effect)
         return True
     
     def _apply_revive_effect(self, target: Entity, revive_percentage: float) -> bool:
@@ -195,9 +178,7 @@ class ItemSystem:
         from ..core.components import DeadComponent, HealthComponent
         
         if not target.has_component(DeadComponent):
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[ITEM]", f"❌ {target.name} 没有死亡，无法复活"
-            )))
+            self.event_bus.log("[ITEM]", "❌ {} 没有死亡，无法复活", target.name)
             return False
         
         # 移除死亡状态
@@ -209,25 +190,19 @@ class ItemSystem:
             revive_hp = health_comp.max_hp * (revive_percentage / 100)
             health_comp.hp = revive_hp
         
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[ITEM]", f"⚡ {target.name} 被复活了！"
-        )))
+        self.event_bus.log("[ITEM]", "⚡ {} 被复活了！", target.name)
         return True
     
     def _apply_escape_effect(self, user: Entity, escape_chance: float) -> bool:
         """应用逃脱效果"""
         # 这里需要实现逃脱逻辑
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[ITEM]", f"📜 {user.name} 使用了传送卷轴，成功逃脱！"
-        )))
+        self.event_bus.log("[ITEM]", "📜 {} 使用了传送卷轴，成功逃脱！", user.name)
         return True
     
     def _apply_experience_effect(self, user: Entity, exp_amount: float) -> bool:
         """应用经验值效果"""
         # 这里需要实现经验值增加逻辑
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            "[ITEM]", f"⭐ {user.name} 获得了 {exp_amount} 点经验值"
-        )))
+        self.event_bus.log("[ITEM]", "⭐ {} 获得了 {} 点经验值", user.name, exp_amount)
         return True
     
     def _on_use_item_request(self, event):
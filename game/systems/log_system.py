@@ -1,5 +1,5 @@
 from typing import Optional, Set
-from ..core.event_bus import EventBus, GameEvent
+from ..core.event_bus import EventBus, GameEvent, UI_TEXT_GROUP
 from ..core.enums import EventName
 from ..core.payloads import LogRequestPayload
 
@@ -13,6 +13,11 @@ class LogSystem:
         self.enabled = enabled  # 全局开关
         self.hidden_tags = hidden_tags or set()  # 隐藏的标签集合
         self.event_bus.subscribe(EventName.LOG_REQUEST, self.on_log_request)
+        self.event_bus.set_log_filter(self.is_enabled)
+
+    def is_enabled(self, tag: str) -> bool:
+        """该标签的日志是否会被打印"""
+        return self.enabled and tag not in self.hidden_tags
     
     def set_enabled(self, enabled: bool):
         """设置日志系统是否启用"""
@@ -40,10 +45,9 @@ class LogSystem:
         payload: LogRequestPayload = event.payload
         
         # 检查是否应该打印这条日志
-        if not self.enabled:
-            return
-        
-        if payload.tag in self.hidden_tags:
+        if not self.is_enabled(payload.tag):
             return
         
-        print(f"[{payload.tag}] {payload.message}")
\ No newline at end of file
+        # 先输出本帧已缓存的文字播报，保持日志与播报的先后顺序；状态面板等其他合并组仍留到帧末
+        self.event_bus.flush_coalesced(UI_TEXT_GROUP)
+        print(f"[{payload.tag}] {payload.render()}")
\ No newline at end of file
@@ -1,6 +1,6 @@
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
-from ..core.payloads import ManaChangeRequestPayload, LogRequestPayload
+from ..core.payloads import ManaChangeRequestPayload
 from ..core.components import ManaComponent
 
 class ManaSystem:
@@ -22,14 +22,10 @@ class ManaSystem:
             if mana_comp.mana >= cost:
                 mana_comp.mana -= cost
                 payload.is_affordable = True
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[MANA]", f"💙 {entity.name} 消耗了 {cost} 点法力值 (剩余: {mana_comp.mana:.0f})"
-                )))
+                self.event_bus.log("[MANA]", "💙 {} 消耗了 {} 点法力值 (剩余: {:.0f})", entity.name, cost, mana_comp.mana)
             else:
                 payload.is_affordable = False
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[MANA]", f"❌ {entity.name} 法力值不足！需要 {cost} 点，当前只有 {mana_comp.mana:.0f} 点"
-                )))
+                self.event_bus.log("[MANA]", "❌ {} 法力值不足！需要 {} 点，当前只有 {:.0f} 点", entity.name, cost, mana_comp.mana)
     
     def _on_mana_change_request(self, event):
         """处理法力值变化请求"""
@@ -46,14 +42,10 @@ class ManaSystem:
                 mana_comp.mana = min(mana_comp.mana + amount, mana_comp.max_mana)
                 actual_restore = mana_comp.mana - old_mana
                 if actual_restore > 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[MANA]", f"💙 {target.name} 恢复了 {actual_restore:.0f} 点法力值 (当前: {mana_comp.mana:.0f}/{mana_comp.max_mana:.0f})"
-                    )))
+                    self.event_bus.log("[MANA]", "💙 {} 恢复了 {:.0f} 点法力值 (当前: {:.0f}/{:.0f})", target.name, actual_restore, mana_comp.mana, mana_comp.max_mana)
             elif change_type == "consume":
                 # 消耗法力值
                 mana_comp.mana = max(mana_comp.mana - amount, 0)
                 actual_consume = old_mana - mana_comp.mana
                 if actual_consume > 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[MANA]", f"💙 {target.name} 消耗了 {actual_consume:.0f} 点法力值 (剩余: {mana_comp.mana:.0f})"
-                    )))
\ No newline at end of file
+                    self.event_bus.log("[MANA]", "💙 {} 消耗了 {:.0f} 点法力值 (剩余: {:.0f})", target.name, actual_consume, mana_comp.mana)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
-from ..core.payloads import HealthChangePayload, GainShieldPayload, LogRequestPayload
+from ..core.payloads import HealthChangePayload, GainShieldPayload
 from ..core.components import EntageShieldUsedComponent
 
 class PassiveAbilitySystem:
@@ -26,7 +26,7 @@ class PassiveAbilitySystem:
             self.pending_passive_triggers.append(passive_info)
             
             # 仍然发送日志信息供调试使用
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[PASSIVE]", passive_info)))
+            self.event_bus.log("[PASSIVE]", passive_info)
 
             self.event_bus.dispatch(GameEvent(EventName.GAIN_SHIELD_REQUEST, GainShieldPayload(
                 target=entity, source="绝地护盾", amount=shield_gain
@@ -1,3 +1,4 @@
+import inspect
 from typing import Dict, Any, List
 from ..core.components import (ResistanceComponent, GrievousWoundsComponent, ThornsComponent, CounterStrikeComponent, OverhealToShieldComponent, AttackTriggerPassiveComponent)
 
@@ -12,6 +13,15 @@ COMPONENT_MAPPING = {
     # 未来新增的被动组件在这里注册
 }
 
+# 组件类 -> 构造函数参数名，只在第一次创建该类组件时解析签名
+_constructor_args_cache: Dict[type, tuple] = {}
+
+def _constructor_args(component_class: type) -> tuple:
+    args = _constructor_args_cache.get(component_class)
+    if args is None:
+        args = _constructor_args_cache[component_class] = tuple(inspect.signature(component_class).parameters)
+    return args
+
 class PassiveFactory:
     """被动能力工厂，负责根据配置创建被动能力组件"""
 
@@ -39,11 +49,8 @@ class PassiveFactory:
         
         # 为了更通用，我们不再硬编码 if/elif
         # 而是动态地从 passive_data 中提取 component_class 所需的参数
-        import inspect
-        
-        constructor_args = inspect.signature(component_class).parameters
         args_to_pass = {}
-        for arg_name in constructor_args:
+        for arg_name in _constructor_args(component_class):
             if arg_name in passive_data:
                 args_to_pass[arg_name] = passive_data[arg_name]
         
@@ -5,7 +5,7 @@ from ..core.payloads import (ActionRequestPayload, UIDisplayOptionsPayload,
                              UIMessagePayload, CastSpellRequestPayload, StatQueryPayload, ActionAfterActPayload,
                              UseItemRequestPayload)
 from ..core.components import (PlayerControlledComponent, SpellListComponent, UltimateSpellListComponent,
-                               AIControlledComponent, DeadComponent, HealthComponent, SpeedComponent,
+                               AIControlledComponent, HealthComponent, SpeedComponent,
                                InventoryComponent, ManaComponent, EnergyComponent, UltimateChargeComponent)
 from .data_manager import DataManager
 from ..core.entity import Entity
@@ -420,21 +420,21 @@ class PlayerInputSystem:
             return f"{e.name} (HP: {hp:.0f}, Speed: {final_speed:.0f})"
         
         if target_type == "enemy":
-            available_targets = [e for e in self.world.entities if e.has_component(AIControlledComponent) and not e.has_component(DeadComponent)]
+            available_targets = self.world.query(AIControlledComponent)
             target_descriptions = [get_desc(e) for e in available_targets]
         elif target_type == "ally":
-            available_targets = [e for e in self.world.entities if e.has_component(PlayerControlledComponent) and not e.has_component(DeadComponent)]
+            available_targets = self.world.query(PlayerControlledComponent)
             target_descriptions = [get_desc(e) for e in available_targets]
         elif target_type == "all_enemies":
             # 全体敌人目标 - 显示所有敌人，但选择任意目标都会对所有敌人生效
-            available_targets = [e for e in self.world.entities if e.has_component(AIControlledComponent) and not e.has_component(DeadComponent)]
+            available_targets = self.world.query(AIControlledComponent)
             target_descriptions = [get_desc(e) + " (全体敌人)" for e in available_targets]
         elif target_type == "all_allies":
             # 全体盟友目标 - 显示所有盟友，但选择任意目标都会对所有盟友生效
-            available_targets = [e for e in self.world.entities if e.has_component(PlayerControlledComponent) and not e.has_component(DeadComponent)]
+            available_targets = self.world.query(PlayerControlledComponent)
             target_descriptions = [get_desc(e) + " (全体盟友)" for e in available_targets]
         else:
-            available_targets = [e for e in self.world.entities if not e.has_component(DeadComponent)]
+            available_targets = self.world.query()
             target_descriptions = [get_desc(e) for e in available_targets]
         
         if not available_targets:
@@ -529,13 +529,13 @@ class PlayerInputSystem:
             available_targets = [actor]
             target_descriptions = [get_desc(actor)]
         elif target_type == "ally":
-            available_targets = [e for e in self.world.entities if e.has_component(PlayerControlledComponent) and not e.has_component(DeadComponent)]
+            available_targets = self.world.query(PlayerControlledComponent)
             target_descriptions = [get_desc(e) for e in available_targets]
         elif target_type == "enemy":
-            available_targets = [e for e in self.world.entities if e.has_component(AIControlledComponent) and not e.has_component(DeadComponent)]
+            available_targets = self.world.query(AIControlledComponent)
             target_descriptions = [get_desc(e) for e in available_targets]
         else:
-            available_targets = [e for e in self.world.entities if not e.has_component(DeadComponent)]
+            available_targets = self.world.query()
             target_descriptions = [get_desc(e) for e in available_targets]
         
         if not available_targets:
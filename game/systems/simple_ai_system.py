@@ -7,10 +7,9 @@ from dataclasses import dataclass
 
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
-from ..core.payloads import ActionRequestPayload, CastSpellRequestPayload, LogRequestPayload
+from ..core.payloads import ActionRequestPayload, CastSpellRequestPayload
 from ..core.components import (AIComponent, TeamComponent, HealthComponent, 
-                              SpellListComponent, UltimateSpellListComponent,
-                              DeadComponent)
+                              SpellListComponent, UltimateSpellListComponent)
 from ..core.entity import Entity
 from ..systems.data_manager import DataManager
 
@@ -42,24 +41,18 @@ class SimpleEnemyAISystem:
             acting_entity.has_component(AIComponent)):
             
             # 添加调试信息
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[AI DEBUG]", f"{acting_entity.name} 开始AI决策"
-            )))
+            self.event_bus.log("[AI DEBUG]", "{} 开始AI决策", acting_entity.name)
             
             # 生成简单的AI决策
             decision = self.generate_simple_decision(acting_entity)
             if decision:
                 # 添加调试信息
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[AI DEBUG]", f"{acting_entity.name} 选择技能 {decision.spell_id} 目标 {decision.target_entity.name}"
-                )))
+                self.event_bus.log("[AI DEBUG]", "{} 选择技能 {} 目标 {}", acting_entity.name, decision.spell_id, decision.target_entity.name)
                 # 执行AI决策
                 self.execute_simple_decision(acting_entity, decision)
             else:
                 # 添加调试信息
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[AI DEBUG]", f"{acting_entity.name} 没有找到合适的技能或目标，跳过回合"
-                )))
+                self.event_bus.log("[AI DEBUG]", "{} 没有找到合适的技能或目标，跳过回合", acting_entity.name)
                 # 没有合适技能时，直接结束回合
                 from ..core.payloads import ActionAfterActPayload
                 self.event_bus.dispatch(GameEvent(EventName.ACTION_AFTER_ACT, ActionAfterActPayload(acting_entity)))
@@ -71,17 +64,13 @@ class SimpleEnemyAISystem:
         
         if not available_spells:
             # 添加调试信息
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[AI DEBUG]", f"{enemy.name} 没有可用技能"
-            )))
+            self.event_bus.log("[AI DEBUG]", "{} 没有可用技能", enemy.name)
             return None
         
         # 遍历所有可用技能，找到第一个有合适目标的技能
         for spell_id in available_spells:
             # 添加调试信息
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[AI DEBUG]", f"{enemy.name} 尝试技能 {spell_id}"
-            )))
+            self.event_bus.log("[AI DEBUG]", "{} 尝试技能 {}", enemy.name, spell_id)
             
             # 获取法术的目标类型
             target_type = self.data_manager.get_spell_target_type(spell_id)
@@ -90,17 +79,13 @@ class SimpleEnemyAISystem:
             target = self.get_target_by_spell_type(enemy, target_type)
             
             if target:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[AI DEBUG]", f"{enemy.name} 找到目标 {target.name} 用于技能 {spell_id}"
-                )))
+                self.event_bus.log("[AI DEBUG]", "{} 找到目标 {} 用于技能 {}", enemy.name, target.name, spell_id)
                 return SimpleAIDecision(
                     spell_id=spell_id,
                     target_entity=target
                 )
             else:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[AI DEBUG]", f"{enemy.name} 技能 {spell_id} 没有找到合适目标"
-                )))
+                self.event_bus.log("[AI DEBUG]", "{} 技能 {} 没有找到合适目标", enemy.name, spell_id)
         
         return None
     
@@ -124,50 +109,31 @@ class SimpleEnemyAISystem:
         """根据法术目标类型获取合适的目标"""
         if target_type == "enemy":
             # 攻击法术：敌人攻击玩家
-            alive_players = [e for e in self.world.entities 
-                            if e.has_component(TeamComponent) and 
-                            e.get_component(TeamComponent).team_id == "player" and
-                            not e.has_component(DeadComponent)]
+            alive_players = self.world.query(team="player")
             
             # 添加调试信息
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                "[AI DEBUG]", f"{enemy.name} 攻击法术，找到 {len(alive_players)} 个玩家目标"
-            )))
+            self.event_bus.log("[AI DEBUG]", "{} 攻击法术，找到 {} 个玩家目标", enemy.name, len(alive_players))
             
             return alive_players[0] if alive_players else None
             
         elif target_type == "ally":
             # 治疗法术：敌人治疗自己人
-            alive_allies = [e for e in self.world.entities 
-                           if e.has_component(TeamComponent) and 
-                           e.get_component(TeamComponent).team_id == "enemy" and
-                           e != enemy and  # 不包括自己
-                           not e.has_component(DeadComponent)]
+            alive_allies = [e for e in self.world.query(team="enemy") if e != enemy]  # 不包括自己
             return alive_allies[0] if alive_allies else None
             
         elif target_type == "all_enemies":
             # 群体攻击法术：敌人攻击玩家
-            alive_players = [e for e in self.world.entities 
-                            if e.has_component(TeamComponent) and 
-                            e.get_component(TeamComponent).team_id == "player" and
-                            not e.has_component(DeadComponent)]
+            alive_players = self.world.query(team="player")
             return alive_players[0] if alive_players else None
             
         elif target_type == "all_allies":
             # 群体治疗法术：敌人治疗自己人
-            alive_allies = [e for e in self.world.entities 
-                           if e.has_component(TeamComponent) and 
-                           e.get_component(TeamComponent).team_id == "enemy" and
-                           e != enemy and  # 不包括自己
-                           not e.has_component(DeadComponent)]
+            alive_allies = [e for e in self.world.query(team="enemy") if e != enemy]  # 不包括自己
             return alive_allies[0] if alive_allies else None
             
         else:
             # 默认情况：攻击玩家
-            alive_players = [e for e in self.world.entities 
-                            if e.has_component(TeamComponent) and 
-                            e.get_component(TeamComponent).team_id == "player" and
-                            not e.has_component(DeadComponent)]
+            alive_players = self.world.query(team="player")
             return alive_players[0] if alive_players else None
     
     def get_simple_target(self, enemy: Entity) -> Optional[Entity]:
@@ -12,7 +12,7 @@ from .effect_handlers.reduce_debuffs_handler import ReduceDebuffsHandler
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
 from ..core.payloads import (CastSpellRequestPayload, EffectResolutionPayload, DispelRequestPayload, 
-                             UIMessagePayload, LogRequestPayload, ManaCostRequestPayload, EnergyCostRequestPayload, UltimateChargeRequestPayload)
+                             UIMessagePayload, ManaCostRequestPayload, EnergyCostRequestPayload, UltimateChargeRequestPayload)
 from ..core.components import (ManaComponent, DeadComponent, HealthComponent, ShieldComponent,
                                StatusEffectContainerComponent, SpellListComponent, EnergyComponent, UltimateChargeComponent)
 from ..core.entity import Entity
@@ -69,9 +69,7 @@ class SpellCastSystem:
         # 只有单体法术才在这里播报，群体法术会在_apply_spell_to_all_targets中播报
         if target_type not in ["all_enemies", "all_allies"]:
             # 记录施法尝试
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                tag="[SPELL]", message=f"{caster.name} 准备施放 {spell_data['name']} (目标: {target.name})"
-            )))
+            self.event_bus.log("[SPELL]", "{} 准备施放 {} (目标: {})", caster.name, spell_data['name'], target.name)
 
         # 检查法力消耗
         mana_cost = self.data_manager.get_spell_cost(spell_id)
@@ -79,7 +77,7 @@ class SpellCastSystem:
         self.event_bus.dispatch(GameEvent(EventName.MANA_COST_REQUEST, mana_request))
         
         if not mana_request.is_affordable:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[SPELL]", "施法失败: 法力不足")))
+            self.event_bus.log("[SPELL]", "施法失败: 法力不足")
             self.event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(f"**提示**: [{caster.name}] 法力不足!")))
             # 施法失败，不派发ACTION_AFTER_ACT事件，让玩家重新选择
             return
@@ -91,7 +89,7 @@ class SpellCastSystem:
             self.event_bus.dispatch(GameEvent(EventName.ENERGY_COST_REQUEST, energy_request))
             
             if not energy_request.is_affordable:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[SPELL]", "施法失败: 能量不足")))
+                self.event_bus.log("[SPELL]", "施法失败: 能量不足")
                 self.event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(f"**提示**: [{caster.name}] 能量不足!")))
                 # 施法失败，不派发ACTION_AFTER_ACT事件，让玩家重新选择
                 return
@@ -103,7 +101,7 @@ class SpellCastSystem:
             self.event_bus.dispatch(GameEvent(EventName.ULTIMATE_CHARGE_REQUEST, ultimate_request))
             
             if not ultimate_request.is_affordable:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[SPELL]", "施法失败: 充能不足")))
+                self.event_bus.log("[SPELL]", "施法失败: 充能不足")
                 self.event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(f"**提示**: [{caster.name}] 充能不足!")))
                 # 施法失败，不派发ACTION_AFTER_ACT事件，让玩家重新选择
                 return
@@ -164,30 +162,18 @@ class SpellCastSystem:
             # 攻击敌方全体：根据施法者阵营选择目标
             if caster_team == "player":
                 # 玩家攻击敌人
-                all_targets = [e for e in self.world.entities 
-                              if e.has_component(TeamComponent) and 
-                              e.get_component(TeamComponent).team_id == "enemy" and
-                              not e.has_component(DeadComponent)]
+                all_targets = self.world.query(team="enemy")
             else:
                 # 敌人攻击玩家
-                all_targets = [e for e in self.world.entities 
-                              if e.has_component(TeamComponent) and 
-                              e.get_component(TeamComponent).team_id == "player" and
-                              not e.has_component(DeadComponent)]
+                all_targets = self.world.query(team="player")
         elif target_type == "all_allies":
             # 治疗我方全体：根据施法者阵营选择目标
             if caster_team == "player":
                 # 玩家治疗玩家
-                all_targets = [e for e in self.world.entities 
-                              if e.has_component(TeamComponent) and 
-                              e.get_component(TeamComponent).team_id == "player" and
-                              not e.has_component(DeadComponent)]
+                all_targets = self.world.query(team="player")
             else:
                 # 敌人治疗敌人
-                all_targets = [e for e in self.world.entities 
-                              if e.has_component(TeamComponent) and 
-                              e.get_component(TeamComponent).team_id == "enemy" and
-                              not e.has_component(DeadComponent)]
+                all_targets = self.world.query(team="enemy")
         else:
             # 如果不是全体目标，回退到单体施法
             self._apply_spell_to_single_target(caster, selected_target, spell_id)
@@ -202,9 +188,7 @@ class SpellCastSystem:
         targets_str = ", ".join(target_names)
         
         # 记录群体施法播报
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-            tag="[SPELL]", message=f"{caster.name} 准备施放 {spell_name} (目标: {targets_str})"
-        )))
+        self.event_bus.log("[SPELL]", "{} 准备施放 {} (目标: {})", caster.name, spell_name, targets_str)
         
         # 获取法术效果列表
         effects = self.data_manager.get_spell_effects(spell_id)
@@ -234,7 +218,7 @@ class SpellCastSystem:
         """应用单个效果，查询处理器并委托任务"""
         effect_type = effect.get('type')
         if effect_type is None:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload('[Spell System]', f'警告: 效果缺少type字段')))
+            self.event_bus.log('[Spell System]', '警告: 效果缺少type字段')
             return
             
         handler = self.effect_handlers.get(effect_type)
@@ -242,4 +226,4 @@ class SpellCastSystem:
         if handler:
             handler.apply(caster, target, effect, payload)
         else:
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload('[Spell System]', f'警告: 未知的法术效果类型: {effect_type}')))
\ No newline at end of file
+            self.event_bus.log('[Spell System]', '警告: 未知的法术效果类型: {}', effect_type)
\ No newline at end of file
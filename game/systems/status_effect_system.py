@@ -2,7 +2,7 @@ from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName, BattleTurnRule
 from ..core.payloads import (ApplyStatusEffectRequestPayload, RemoveStatusEffectRequestPayload,
                              UpdateStatusEffectsDurationRequestPayload, DispelRequestPayload,
-                             StatQueryPayload, LogRequestPayload, UIMessagePayload, DamageRequestPayload,
+                             StatQueryPayload, UIMessagePayload, DamageRequestPayload,
                              AmplifyPoisonRequestPayload, DetonatePoisonRequestPayload,
                              StatusEffectsResolvedPayload, ReduceDebuffsRequestPayload, PostActionSettlementPayload)
 from ..core.components import StatusEffectContainerComponent, DeadComponent
@@ -172,7 +172,7 @@ class StatusEffectSystem:
             if effect_to_remove:
                 effect_to_remove.logic.on_remove(payload.target, effect_to_remove, self.event_bus)
                 container.effects.remove(effect_to_remove)
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[STATUS]", f"[{payload.target.name}] 状态效果 {payload.effect_id} 已移除")))
+                self.event_bus.log("[STATUS]", "[{}] 状态效果 {} 已移除", payload.target.name, payload.effect_id)
     
     def on_update_effects_duration(self, event: GameEvent):
         payload: UpdateStatusEffectsDurationRequestPayload = event.payload
@@ -181,7 +181,7 @@ class StatusEffectSystem:
             effect = next((e for e in container.effects if e.effect_id == payload.effect_id), None)
             if effect and effect.duration is not None:
                 effect.duration += payload.change
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[STATUS]", f"[{payload.target.name}] 状态效果 {payload.effect_id} 的持续时间更新为 {effect.duration} 回合")))
+                self.event_bus.log("[STATUS]", "[{}] 状态效果 {} 的持续时间更新为 {} 回合", payload.target.name, payload.effect_id, effect.duration)
 
     def on_action_request(self, event: GameEvent):
         """角色行动前，结算该角色的状态效果"""
@@ -217,7 +217,7 @@ class StatusEffectSystem:
             if ui_system:
                 ui_system._status_effects_resolving = True
             
-        self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[STATUS]", f"---[{acting_entity.name}] 行动前状态效果结算---")))
+        self.event_bus.log("[STATUS]", "---[{}] 行动前状态效果结算---", acting_entity.name)
         
         # 特殊处理中毒效果（所有版本）
         poison_effects = [e for e in container.effects if e.effect_id.startswith("poison_")]
@@ -283,13 +283,13 @@ class StatusEffectSystem:
             
             # 一次性播报移除信息
             if expired_poison_effects:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[STATUS]", f"[{entity.name}] {len(expired_poison_effects)} 个中毒状态层数归0，已移除")))
+                self.event_bus.log("[STATUS]", "[{}] {} 个中毒状态层数归0，已移除", entity.name, len(expired_poison_effects))
                 self.event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(f"**状态效果**: {entity.name} 的 {len(expired_poison_effects)} 个中毒状态层数归0，已移除")))
             
             # 播报剩余中毒状态信息
             remaining_poison_effects = [e for e in poison_effects if e.stack_count > 0]
             if remaining_poison_effects:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[STATUS]", f"[{entity.name}] 剩余 {len(remaining_poison_effects)} 个中毒状态")))
+                self.event_bus.log("[STATUS]", "[{}] 剩余 {} 个中毒状态", entity.name, len(remaining_poison_effects))
         else:
             # 回退到默认逻辑
             for effect in poison_effects:
@@ -312,13 +312,13 @@ class StatusEffectSystem:
             
             # 一次性播报移除信息
             if expired_heal_effects:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[STATUS]", f"[{entity.name}] {len(expired_heal_effects)} 个持续恢复状态层数归0，已移除")))
+                self.event_bus.log("[STATUS]", "[{}] {} 个持续恢复状态层数归0，已移除", entity.name, len(expired_heal_effects))
                 self.event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(f"**状态效果**: {entity.name} 的 {len(expired_heal_effects)} 个持续恢复状态层数归0，已移除")))
             
             # 播报剩余持续恢复状态信息
             remaining_heal_effects = [e for e in heal_effects if e.stack_count > 0]
             if remaining_heal_effects:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[STATUS]", f"[{entity.name}] 剩余 {len(remaining_heal_effects)} 个持续恢复状态")))
+                self.event_bus.log("[STATUS]", "[{}] 剩余 {} 个持续恢复状态", entity.name, len(remaining_heal_effects))
         else:
             # 回退到默认逻辑
             for effect in heal_effects:
@@ -337,7 +337,7 @@ class StatusEffectSystem:
         for expired_effect in expired_effects:
             expired_effect.logic.on_remove(entity, expired_effect, self.event_bus)
             container.effects.remove(expired_effect)
-            self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload("[STATUS]", f"[{entity.name}] 状态效果 {expired_effect.name} 效果已过期")))
+            self.event_bus.log("[STATUS]", "[{}] 状态效果 {} 效果已过期", entity.name, expired_effect.name)
             self.event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(f"**状态效果**: {entity.name} 的 {expired_effect.name} 效果已结束")))
     
     def on_amplify_poison(self, event: GameEvent):
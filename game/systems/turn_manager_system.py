@@ -1,8 +1,9 @@
+import math
 import time
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName, BattleTurnRule
 from ..core.payloads import RoundStartPayload, ActionRequestPayload, StatQueryPayload, ActionAfterActPayload, PostActionSettlementPayload
-from ..core.components import DeadComponent, SpeedComponent, PositionComponent
+from ..core.components import SpeedComponent, PositionComponent
 from ..core.entity import Entity
 
 class TurnManagerSystem:
@@ -16,7 +17,7 @@ class TurnManagerSystem:
         self.round_number = 0
         self.turn_queue = []
         self.battle_turn_rule = BattleTurnRule.TURN_BASED
-        self.ap_bars = {entity.name: 0 for entity in self.world.entities if not entity.has_component(DeadComponent)}
+        self.ap_bars = {entity.id: 0 for entity in self.world.query()}  # 实体ID -> AP值
         self.is_waiting_for_action = False
         self.acting_entity = None
         # 新增：支持多个角色同时行动
@@ -34,16 +35,21 @@ class TurnManagerSystem:
         else:
             self.update_turn_based()
 
+    def next_update_time(self):
+        """AP模式下等待正在行动的角色时 update 不做任何事，直到收到 ACTION_AFTER_ACT；其余时候每帧都有工作"""
+        if self.battle_turn_rule == BattleTurnRule.AP_BASED and self.acting_entities:
+            return math.inf
+        return None
+
     def update_turn_based(self):
         if not self.turn_queue:
             self.round_number += 1
-            living_entities = [e for e in self.world.entities if not e.has_component(DeadComponent)]
-            if len(living_entities) < 2:
+            if len(self.world.query()) < 2:
                 self.world.is_running = False
                 return
 
-            # 过滤掉没有SpeedComponent的实体
-            living_entities = [e for e in living_entities if e.get_component(SpeedComponent) is not None]
+            # 只有带SpeedComponent的实体参与行动
+            living_entities = self.world.query(SpeedComponent)
             # 按速度排序，如果速度相等则按位置ID排序（位置ID小的先手）
             living_entities.sort(key=lambda e: (e.get_final_stat("speed", e.get_component(SpeedComponent).speed), -e.get_component(PositionComponent).position_id if e.get_component(PositionComponent) else 0), reverse=True)
             self.turn_queue = living_entities
@@ -61,10 +67,8 @@ class TurnManagerSystem:
     def update_ap_based(self):
         ready_entities = []
         
-        living_entities = [e for e in self.world.entities if not e.has_component(DeadComponent)]
-        
-        # 过滤掉没有SpeedComponent的实体（如战场实体等）
-        living_entities = [e for e in living_entities if e.get_component(SpeedComponent) is not None]
+        # 存活且有SpeedComponent的实体（排除战场实体等）
+        living_entities = self.world.query(SpeedComponent)
         
         if len(living_entities) < 2:
             self.world.is_running = False
@@ -75,8 +79,8 @@ class TurnManagerSystem:
             return
 
         for entity in living_entities:
-            if entity.name not in self.ap_bars:
-                self.ap_bars[entity.name] = 0
+            if entity.id not in self.ap_bars:
+                self.ap_bars[entity.id] = 0
             
             # 安全检查：确保实体有SpeedComponent
             speed_comp = entity.get_component(SpeedComponent)
@@ -85,13 +89,13 @@ class TurnManagerSystem:
                 continue
                 
             speed = entity.get_final_stat("speed", speed_comp.speed)
-            self.ap_bars[entity.name] += speed * self.AP_RECOVERY_RATE
-            if self.ap_bars[entity.name] >= self.AP_THRESHOLD:
+            self.ap_bars[entity.id] += speed * self.AP_RECOVERY_RATE
+            if self.ap_bars[entity.id] >= self.AP_THRESHOLD:
                 ready_entities.append(entity)
         
         if ready_entities:
             # 按AP值排序，如果AP值相等则按位置ID排序（位置ID小的先手）
-            ready_entities.sort(key=lambda e: (self.ap_bars[e.name], -e.get_component(PositionComponent).position_id if e.get_component(PositionComponent) else 0), reverse=True)
+            ready_entities.sort(key=lambda e: (self.ap_bars[e.id], -e.get_component(PositionComponent).position_id if e.get_component(PositionComponent) else 0), reverse=True)
             
             # 修改：处理所有AP满的角色
             self.ready_entities = ready_entities
@@ -103,7 +107,7 @@ class TurnManagerSystem:
             ui_system = self.world.get_system(UISystem)
             if ui_system:
                 ui_system.display_status_panel()
-                ui_system.last_refresh_time = time.time()  # 更新刷新时间戳
+                ui_system.last_refresh_time = time.perf_counter()  # 更新刷新时间戳
             
             # 为每个角色派发行动请求
             for entity in ready_entities:
@@ -116,8 +120,8 @@ class TurnManagerSystem:
         # 检查是否是正在行动的角色之一
         if acting_entity in self.acting_entities:
             # 扣除AP值
-            if acting_entity.name in self.ap_bars:
-                self.ap_bars[acting_entity.name] -= self.AP_THRESHOLD
+            if acting_entity.id in self.ap_bars:
+                self.ap_bars[acting_entity.id] -= self.AP_THRESHOLD
             
             # 恢复能量点
             if self.energy_system:
@@ -140,11 +144,43 @@ class TurnManagerSystem:
                 if status_effect_system:
                     status_effect_system._status_effects_settled = False
 
+    def copy_state_from(self, other: 'TurnManagerSystem'):
+        """复制另一个世界中回合管理的运行状态（World.fork 调用），实体换成本世界中ID相同的实体"""
+        get_entity = self.world.get_entity
+        self.round_number = other.round_number
+        self.battle_turn_rule = other.battle_turn_rule
+        self.ap_bars = dict(other.ap_bars)
+        self.turn_queue = [get_entity(e.id) for e in other.turn_queue]
+        self.is_waiting_for_action = other.is_waiting_for_action
+        self.acting_entity = get_entity(other.acting_entity.id) if other.acting_entity is not None else None
+        self.ready_entities = [get_entity(e.id) for e in other.ready_entities]
+        self.acting_entities = [get_entity(e.id) for e in other.acting_entities]
+
+    def save_state(self) -> tuple:
+        """回合管理的运行状态，实体记为ID（World.snapshot 调用）"""
+        return (self.round_number, self.battle_turn_rule.value, self.ap_bars,
+                tuple(e.id for e in self.turn_queue), self.is_waiting_for_action,
+                self.acting_entity.id if self.acting_entity is not None else None,
+                tuple(e.id for e in self.ready_entities), tuple(e.id for e in self.acting_entities))
+
+    def load_state(self, state: tuple):
+        """还原 save_state() 的结果（World.restore 调用）"""
+        get_entity = self.world.get_entity
+        round_number, rule, ap_bars, turn_queue, is_waiting, acting_entity, ready_entities, acting_entities = state
+        self.round_number = round_number
+        self.battle_turn_rule = BattleTurnRule(rule)
+        self.ap_bars = dict(ap_bars)
+        self.turn_queue = [get_entity(entity_id) for entity_id in turn_queue]
+        self.is_waiting_for_action = is_waiting
+        self.acting_entity = get_entity(acting_entity) if acting_entity is not None else None
+        self.ready_entities = [get_entity(entity_id) for entity_id in ready_entities]
+        self.acting_entities = [get_entity(entity_id) for entity_id in acting_entities]
+
     def set_battle_turn_rule(self, rule: BattleTurnRule):
         self.battle_turn_rule = rule
         self.round_number = 0
         self.turn_queue = []
-        self.ap_bars = {entity.name: 0 for entity in self.world.entities if not entity.has_component(DeadComponent)}
+        self.ap_bars = {entity.id: 0 for entity in self.world.query()}
         # 重置多角色行动相关的状态
         self.ready_entities = []
         self.acting_entities = []
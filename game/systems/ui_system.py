@@ -1,6 +1,9 @@
+import asyncio
+import math
 import os
 import time
-from ..core.event_bus import EventBus, GameEvent
+from typing import Awaitable, Callable, Optional
+from ..core.event_bus import EventBus, GameEvent, UI_TEXT_GROUP
 from ..core.enums import EventName, BattleTurnRule
 from ..core.payloads import (RoundStartPayload, UIMessagePayload, UIDisplayOptionsPayload,
                              EffectResolutionPayload, StatQueryPayload)
@@ -12,20 +15,27 @@ from .turn_manager_system import TurnManagerSystem
 class UISystem:
     UI_REFRESH_INTERVAL = 1.0 / 10 # 10 FPS
 
-    def __init__(self, event_bus: EventBus, world: 'World'): # type: ignore
+    def __init__(self, event_bus: EventBus, world: 'World', async_input: bool = False, # type: ignore
+                 input_provider: Optional[Callable[[str], Awaitable[str]]] = None):
         self.event_bus = event_bus
         self.world = world # 需要访问世界实体来渲染状态
         self.last_refresh_time = 0
-        self.event_bus.subscribe(EventName.UI_MESSAGE, lambda e: print(e.payload.message))
+        # 异步输入：配合 AsyncEventBus，等待玩家选择时不阻塞事件循环
+        # input_provider 为空时在线程中调用 input()
+        self.input_provider = input_provider or (lambda prompt: asyncio.to_thread(input, prompt))
         self.event_bus.subscribe(EventName.ROUND_START, self.on_round_start)
-        self.event_bus.subscribe(EventName.UI_DISPLAY_OPTIONS, self.on_display_options)
-        self.event_bus.subscribe(EventName.EFFECT_RESOLUTION_COMPLETE, self.on_effect_resolution)
-        self.event_bus.subscribe(EventName.STATUS_EFFECTS_RESOLVED, self.on_status_effects_resolved)
+        self.event_bus.subscribe(EventName.UI_DISPLAY_OPTIONS,
+                                 self.on_display_options_async if async_input else self.on_display_options)
+        # 文字播报和状态面板刷新按帧合并：一次范围技能产生的大量事件每帧只输出一次、只刷新一次面板
+        # 播报文字在派发时生成（此时的状态效果才是这次结算的结果），帧末统一输出
+        self.event_bus.coalesce((EventName.UI_MESSAGE, EventName.EFFECT_RESOLUTION_COMPLETE), self.on_ui_text,
+                                capture=self._render_ui_text, group=UI_TEXT_GROUP)
+        self.event_bus.coalesce((EventName.STATUS_EFFECTS_RESOLVED,), self.on_status_effects_resolved)
 
     def update(self):
         turn_manager = self.world.get_system(TurnManagerSystem)
         if turn_manager.battle_turn_rule == BattleTurnRule.AP_BASED:
-            current_time = time.time()
+            current_time = time.perf_counter()
             if current_time - self.last_refresh_time >= self.UI_REFRESH_INTERVAL:
                 # 在等待行动状态时也刷新UI，确保AP值显示正确
                 # 但避免在状态效果结算期间重复刷新
@@ -33,6 +43,13 @@ class UISystem:
                     self.display_status_panel()
                     self.last_refresh_time = current_time
 
+    def next_update_time(self):
+        """AP模式下只在到达刷新间隔时刷新状态面板"""
+        turn_manager = self.world.get_system(TurnManagerSystem)
+        if turn_manager.battle_turn_rule != BattleTurnRule.AP_BASED:
+            return math.inf
+        return self.last_refresh_time + self.UI_REFRESH_INTERVAL
+
     def _clear_screen(self):
         os.system('cls' if os.name == 'nt' else 'clear')
 
@@ -66,7 +83,7 @@ class UISystem:
                 
                 ap_str = ""
                 if is_ap_based:
-                    ap_value = turn_manager.ap_bars.get(entity.name, 0)
+                    ap_value = turn_manager.ap_bars.get(entity.id, 0)
                     ap_bar = self._generate_ap_bar(ap_value, turn_manager.AP_THRESHOLD)
                     ap_str = f"AP: {ap_bar} {ap_value:.0f}/{turn_manager.AP_THRESHOLD}"
 
@@ -134,7 +151,7 @@ class UISystem:
                 status_str = f"[{entity.name}] " + " | ".join(status_parts)
             print(status_str)
         print("-" * 40)
-        self.last_refresh_time = time.time()
+        self.last_refresh_time = time.perf_counter()
     
     def on_round_start(self, event: GameEvent):
         turn_manager = self.world.get_system(TurnManagerSystem)
@@ -145,14 +162,25 @@ class UISystem:
         # 回合开始时只显示回合信息，不立即显示状态面板
         # 状态面板将在状态效果结算完成后显示
 
-    def on_status_effects_resolved(self, event: GameEvent):
+    def _render_ui_text(self, event: GameEvent) -> str:
+        """派发时生成一条播报的文字"""
+        if event.name == EventName.UI_MESSAGE:
+            return event.payload.message
+        return "\n".join(self._format_effect_resolution(event.payload))
+
+    def on_ui_text(self, texts: list[str]):
+        """输出本帧合并的文字播报"""
+        print("\n".join(texts))
+
+    def on_status_effects_resolved(self, events: list[GameEvent]):
+        """本帧内无论结算了多少个角色的状态效果，都只刷新一次状态面板"""
         turn_manager = self.world.get_system(TurnManagerSystem)
         if turn_manager.battle_turn_rule == BattleTurnRule.TURN_BASED:
             self.event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload(f"[UI]**状态效果结算完毕**")))
         
         # 状态效果结算完成后刷新UI
         self.display_status_panel()
-        self.last_refresh_time = time.time()
+        self.last_refresh_time = time.perf_counter()
         
         # 清除状态效果结算标志
         if hasattr(self, '_status_effects_resolving'):
@@ -160,23 +188,39 @@ class UISystem:
 
     def on_display_options(self, event: GameEvent):
         payload: UIDisplayOptionsPayload = event.payload
+        self.event_bus.flush_coalesced()  # 先输出本帧已缓存的播报，再显示选项
         print(payload.prompt)
         for i, option in enumerate(payload.options): print(f"  {i + 1}. {option}")
-        while True:
-            try:
-                choice = int(input("请输入数字选择: ")) - 1
-                if 0 <= choice < len(payload.options):
-                    self.event_bus.dispatch(GameEvent(
-                        payload.response_event_name,
-                        {"choice_index": choice, "context": payload.context}
-                    ))
-                    break
-                else: print("无效选择，请重新输入。")
-            except ValueError: print("请输入一个有效的数字。")
+        while not self._submit_choice(payload, input("请输入数字选择: ")):
+            pass
+
+    async def on_display_options_async(self, event: GameEvent):
+        payload: UIDisplayOptionsPayload = event.payload
+        self.event_bus.flush_coalesced()  # 先输出本帧已缓存的播报，再显示选项
+        print(payload.prompt)
+        for i, option in enumerate(payload.options): print(f"  {i + 1}. {option}")
+        while not self._submit_choice(payload, await self.input_provider("请输入数字选择: ")):
+            pass
+
+    def _submit_choice(self, payload: UIDisplayOptionsPayload, text: str) -> bool:
+        """校验玩家输入，合法时派发选择结果并返回 True"""
+        try:
+            choice = int(text) - 1
+        except ValueError:
+            print("请输入一个有效的数字。")
+            return False
+        if not 0 <= choice < len(payload.options):
+            print("无效选择，请重新输入。")
+            return False
+        self.event_bus.dispatch(GameEvent(
+            payload.response_event_name,
+            {"choice_index": choice, "context": payload.context}
+        ))
+        return True
     
-    def on_effect_resolution(self, event: GameEvent):
-        """UI播报关键结果，包括谁对谁用了什么法术以及最终效果。"""
-        payload: EffectResolutionPayload = event.payload
+    def _format_effect_resolution(self, payload: EffectResolutionPayload) -> list[str]:
+        """UI播报关键结果，包括谁对谁用了什么法术以及最终效果，返回要输出的各行。"""
+        lines = []
         
         # 检查是否是反伤伤害
         is_thorns_reflection = payload.log_reflection
@@ -289,14 +333,15 @@ class UISystem:
             if effect_parts:
                 effects_str = "，".join(effect_parts)
                 if is_dot_damage:
-                    print(f"**战斗持续伤害**: {base_info}，{effects_str}！")
+                    lines.append(f"**战斗持续伤害**: {base_info}，{effects_str}！")
                 else:
-                    print(f"**战斗**: {base_info}，{effects_str}！")
+                    lines.append(f"**战斗**: {base_info}，{effects_str}！")
             # 移除无效的"产生了效果！"播报，因为如果effect_parts为空，说明没有具体的效果变化
         
         # 显示被动触发信息
         if payload.passive_triggers:
             for passive_info in payload.passive_triggers:
-                print(f"**被动**: {passive_info}")
+                lines.append(f"**被动**: {passive_info}")
         
-        print()  # 空行分隔
\ No newline at end of file
+        lines.append("")  # 空行分隔
+        return lines
\ No newline at end of file
@@ -1,6 +1,6 @@
 from ..core.event_bus import EventBus, GameEvent
 from ..core.enums import EventName
-from ..core.payloads import UltimateChargeChangeRequestPayload, LogRequestPayload, UltimateChargeRequestPayload
+from ..core.payloads import UltimateChargeChangeRequestPayload, UltimateChargeRequestPayload
 from ..core.components import UltimateChargeComponent
 
 class UltimateChargeSystem:
@@ -22,14 +22,10 @@ class UltimateChargeSystem:
             if charge_comp.charge >= cost:
                 charge_comp.charge -= cost
                 payload.is_affordable = True
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[ULTIMATE]", f"⚡ {entity.name} 消耗了 {cost}% 充能值 (剩余: {charge_comp.charge:.0f}%)"
-                )))
+                self.event_bus.log("[ULTIMATE]", "⚡ {} 消耗了 {}% 充能值 (剩余: {:.0f}%)", entity.name, cost, charge_comp.charge)
             else:
                 payload.is_affordable = False
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[ULTIMATE]", f"❌ {entity.name} 充能不足！需要 {cost}%，当前只有 {charge_comp.charge:.0f}%"
-                )))
+                self.event_bus.log("[ULTIMATE]", "❌ {} 充能不足！需要 {}%，当前只有 {:.0f}%", entity.name, cost, charge_comp.charge)
     
     def _on_ultimate_charge_change_request(self, event):
         """处理终极技能充能变化请求"""
@@ -46,17 +42,13 @@ class UltimateChargeSystem:
                 charge_comp.charge = min(charge_comp.charge + amount, charge_comp.max_charge)
                 actual_add = charge_comp.charge - old_charge
                 if actual_add > 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[ULTIMATE]", f"⚡ {target.name} 获得了 {actual_add:.0f}% 充能值 (当前: {charge_comp.charge:.0f}%)"
-                    )))
+                    self.event_bus.log("[ULTIMATE]", "⚡ {} 获得了 {:.0f}% 充能值 (当前: {:.0f}%)", target.name, actual_add, charge_comp.charge)
             elif change_type == "consume":
                 # 消耗充能值
                 charge_comp.charge = max(charge_comp.charge - amount, 0)
                 actual_consume = old_charge - charge_comp.charge
                 if actual_consume > 0:
-                    self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                        "[ULTIMATE]", f"⚡ {target.name} 消耗了 {actual_consume:.0f}% 充能值 (剩余: {charge_comp.charge:.0f}%)"
-                    )))
+                    self.event_bus.log("[ULTIMATE]", "⚡ {} 消耗了 {:.0f}% 充能值 (剩余: {:.0f}%)", target.name, actual_consume, charge_comp.charge)
     
     def add_charge_from_spell(self, entity, spell_id, data_manager):
         """从施法中获取充能值"""
@@ -71,9 +63,7 @@ class UltimateChargeSystem:
             charge_comp.charge = min(charge_comp.charge + charge_value, charge_comp.max_charge)
             actual_add = charge_comp.charge - old_charge
             if actual_add > 0:
-                self.event_bus.dispatch(GameEvent(EventName.LOG_REQUEST, LogRequestPayload(
-                    "[ULTIMATE]", f"⚡ {entity.name} 施放技能获得了 {actual_add:.0f}% 充能值"
-                )))
+                self.event_bus.log("[ULTIMATE]", "⚡ {} 施放技能获得了 {:.0f}% 充能值", entity.name, actual_add)
     
     def can_cast_ultimate(self, entity, charge_level=100):
         """检查是否可以释放终极技能"""
@@ -1,49 +1,334 @@
+import asyncio
+import math
+import random
 import time
-from typing import List, Any
-from .core.event_bus import EventBus
+from dataclasses import dataclass
+from typing import Callable, List, Any, Optional, ValuesView
+from .core.enums import EventName
+from .core.event_bus import EventBus, GameEvent
 from .core.entity import Entity
+from .core.component_store import ComponentStore
+from .core.fork import ForkedEntity
+from .core.snapshot import snapshot_world, restore_world
+from .core.tick_profiler import TickProfiler, DEFAULT_WINDOW
+from .core.frame_pacer import FramePacer
+from .core.components import (DeadComponent, TeamComponent, PlayerControlledComponent, AIControlledComponent,
+                              SpeedComponent, BattlefieldComponent)
 
 FRAME_RATE = 60
 TICK_INTERVAL = 1.0 / FRAME_RATE
+# run_battle() 最多推进的帧数：玩家角色等待一个没有人回答的输入时，战斗永远不会结束
+DEFAULT_MAX_BATTLE_STEPS = 100_000
+
+# 世界为这些组件维护索引，可以作为 query() 的条件
+INDEXED_COMPONENTS = (PlayerControlledComponent, AIControlledComponent, SpeedComponent, BattlefieldComponent)
+
+@dataclass
+class BattleOutcome:
+    """run_battle() 的结果。result 为 "victory"/"defeat"；战斗没有正常结束（超出帧数或被停止）时为 None"""
+    result: Optional[str] = None
+    battlefield_id: Optional[str] = None
+    steps: int = 0
+
+    @property
+    def is_complete(self) -> bool:
+        return self.result is not None
 
 class World:
-    def __init__(self, event_bus: EventBus):
+    def __init__(self, event_bus: EventBus, component_store: Optional[ComponentStore] = None):
         self.event_bus = event_bus
-        self.entities = []
+        self.component_store = component_store  # 可选：数值组件改为列式存储，供系统批量读写
+        # 实体注册表：ID -> 实体（保持加入顺序），以及名称 -> ID（名称可能重复）
+        self._entities: dict[int, Entity] = {}
+        self._ids_by_name: dict[str, list[int]] = {}
         self.systems: List[tuple[int, Any]] = []
+        # 由 add_system 维护：按优先级排好的 update 方法，以及 get_system 的查询结果缓存
+        self.update_callables: tuple[Callable[[], None], ...] = ()
+        # 各系统的 next_update_time 方法；有系统没有实现时为 None（视为每帧都有工作）
+        self._wakeup_callables: Optional[tuple[Callable[[], Optional[float]], ...]] = ()
+        self._systems_by_type: dict[type, Any] = {}
         self.is_running = False
+        # 本世界的随机数生成器（暴击、概率触发等判定都用它）；由全局随机数派生，先设置全局种子即可复现
+        self.rng = random.Random(random.getrandbits(64))
+        self.health_tracker = None  # 可选：HealthChangeBatchSystem，开启后生命值变化按行动合并派发
+        # 用给定的事件总线创建同样配置、无界面的世界（由 build_world 设置），fork() 用它装配子世界的系统
+        self.headless_builder: Optional[Callable[[EventBus], 'World']] = None
+        self.profiler: Optional[TickProfiler] = None  # 可选：主循环逐帧性能分析，见 enable_profiler()
+
+        # --- 实体索引：组件增删、实体死亡时增量更新（dict 当作有序集合） ---
+        self._entity_seq = 0
+        self._alive: dict[Entity, None] = {}
+        self._by_team: dict[str, dict[Entity, None]] = {}
+        self._by_component: dict[type, dict[Entity, None]] = {ct: {} for ct in INDEXED_COMPONENTS}
 
-    def add_entity(self, e: Entity): self.entities.append(e); return e
+    @property
+    def entities(self) -> ValuesView[Entity]:
+        """按加入顺序排列的所有实体的只读视图，不复制；遍历时需要增删实体的调用方先用 list() 复制一份"""
+        return self._entities.values()
+
+    def get_entity(self, entity_id: int) -> Optional[Entity]:
+        return self._entities.get(entity_id)
+
+    def get_entity_id(self, name: str) -> Optional[int]:
+        """名称 -> ID；同名实体有多个时返回最早加入的那个"""
+        ids = self._ids_by_name.get(name)
+        return ids[0] if ids else None
+
+    def add_entity(self, e: Entity):
+        self._entities[e.id] = e
+        self._ids_by_name.setdefault(e.name, []).append(e.id)
+        if self.component_store is not None:
+            self.component_store.attach(e)
+        e._world = self
+        e._world_seq = self._entity_seq
+        self._entity_seq += 1
+        if not e.has_component(DeadComponent):
+            self._alive[e] = None
+        for component_type in (TeamComponent, *INDEXED_COMPONENTS):
+            if (component := e.get_component(component_type)) is not None:
+                self._on_component_added(e, component_type, component)
+        return e
     def remove_entity(self, e: Entity): 
-        if e in self.entities:
-            self.entities.remove(e)
-    def get_entity_by_name(self, name: str): return next((e for e in self.entities if e.name == name), None)
+        if self._entities.pop(e.id, None) is not None:
+            ids = self._ids_by_name[e.name]
+            ids.remove(e.id)
+            if not ids:
+                del self._ids_by_name[e.name]
+            if self.component_store is not None:
+                self.component_store.detach(e)
+            self._alive.pop(e, None)
+            for members in (*self._by_team.values(), *self._by_component.values()):
+                members.pop(e, None)
+            e._world = None
+
+    def _on_component_added(self, e: Entity, component_type: type, component: Any):
+        """由 Entity.add_component 调用，维护实体索引"""
+        if component_type is DeadComponent:
+            self._alive.pop(e, None)
+        elif component_type is TeamComponent:
+            for members in self._by_team.values():
+                members.pop(e, None)
+            self._by_team.setdefault(component.team_id, {})[e] = None
+        elif component_type in self._by_component:
+            self._by_component[component_type][e] = None
+
+    def _on_component_removed(self, e: Entity, component_type: type):
+        """由 Entity.remove_component 调用，维护实体索引"""
+        if component_type is DeadComponent:
+            self._alive[e] = None
+        elif component_type is TeamComponent:
+            for members in self._by_team.values():
+                members.pop(e, None)
+        elif component_type in self._by_component:
+            self._by_component[component_type].pop(e, None)
+
+    def query(self, *component_types: type, team: Optional[str] = None, alive: bool = True) -> list[Entity]:
+        """
+        按索引查询实体，结果与 entities 中的顺序一致。
+        component_types 只能是 INDEXED_COMPONENTS 中的组件；team 按 TeamComponent.team_id 过滤；
+        alive=True 时排除带 DeadComponent 的实体。耗时与最小的候选集合成正比，而不是与实体总数成正比。
+        """
+        sets = [self._by_component[ct] for ct in component_types]
+        if team is not None:
+            sets.append(self._by_team.get(team, {}))
+        if alive:
+            sets.append(self._alive)
+        if not sets:
+            return list(self._entities.values())
+        sets.sort(key=len)
+        smallest, others = sets[0], sets[1:]
+        result = [e for e in smallest if all(e in members for members in others)]
+        result.sort(key=lambda e: e._world_seq)
+        return result
+    def get_entity_by_name(self, name: str):
+        entity_id = self.get_entity_id(name)
+        return self._entities[entity_id] if entity_id is not None else None
+    def fork(self) -> 'World':
+        """
+        创建写时复制的子世界，用于AI前瞻、伤害预览、"如果施放X会怎样"之类的试算。
+        子世界有自己的事件总线和一套无界面的系统（见 headless_builder），回合管理等系统的运行状态从本世界复制；
+        实体是 ForkedEntity，ID 与本世界相同，组件在子世界第一次取用时才复制，实体索引直接映射过去。
+        子世界中的任何修改都不会影响本世界；子世界使用期间本世界不应继续推进。
+        """
+        event_bus = EventBus()
+        child = self.headless_builder(event_bus) if self.headless_builder is not None else World(event_bus)
+        # 子世界从本世界当前的随机数状态继续，但之后的判定不再推进本世界的随机数
+        child.rng.setstate(self.rng.getstate())
+        forked = {e: ForkedEntity(e, event_bus) for e in self._entities.values()}
+        for e in forked.values():
+            e._world = child
+        child._entities = {e.id: e for e in forked.values()}
+        child._ids_by_name = {name: list(ids) for name, ids in self._ids_by_name.items()}
+        child._entity_seq = self._entity_seq
+        child._alive = {forked[e]: None for e in self._alive}
+        child._by_team = {team: {forked[e]: None for e in members} for team, members in self._by_team.items()}
+        child._by_component = {ct: {forked[e]: None for e in members} for ct, members in self._by_component.items()}
+        for _, system in child.systems:
+            if hasattr(system, 'copy_state_from') and (parent_system := self.get_system(type(system))) is not None:
+                system.copy_state_from(parent_system)
+        return child
+
+    def snapshot(self) -> bytes:
+        """把实体、组件、状态效果、回合状态和随机数状态编码为二进制快照（见 game.core.snapshot）"""
+        return snapshot_world(self)
+
+    def restore(self, data: bytes):
+        """用 snapshot() 的结果替换本世界的实体和运行状态"""
+        restore_world(self, data)
+
     def add_system(self, s: Any, priority: int = 100):
         self.systems.append((priority, s))
         self.systems.sort(key=lambda x: x[0])
+        self.update_callables = tuple(system.update for _, system in self.systems if hasattr(system, 'update'))
+        updating = [system for _, system in self.systems if hasattr(system, 'update')]
+        self._wakeup_callables = (tuple(system.next_update_time for system in updating)
+                                  if all(hasattr(system, 'next_update_time') for system in updating) else None)
+        self._systems_by_type.clear()
+
+    def next_update_time(self) -> Optional[float]:
+        """
+        所有有 update 的系统都空闲时，返回最早有系统需要工作的时刻（perf_counter 时间，math.inf 表示没有计划），
+        否则返回 None。系统通过可选的 next_update_time() 方法声明自己的空闲状态：
+        返回 None 表示下一帧有工作，返回时刻表示在那之前 update 什么也不做；没有实现的系统视为每帧都有工作。
+        """
+        if self._wakeup_callables is None:
+            return None
+        wakeup_time = math.inf
+        for next_update_time in self._wakeup_callables:
+            system_time = next_update_time()
+            if system_time is None:
+                return None
+            if system_time < wakeup_time:
+                wakeup_time = system_time
+        return wakeup_time
 
     def get_system(self, system_type: type):
+        """第一个（按优先级）属于 system_type 的系统；结果按类型缓存，注册新系统时失效"""
+        try:
+            return self._systems_by_type[system_type]
+        except KeyError:
+            pass
+        found = None
         for _, system in self.systems:
             if isinstance(system, system_type):
-                return system
-        return None
+                found = system
+                break
+        self._systems_by_type[system_type] = found
+        return found
+
+    def enable_profiler(self, window: int = DEFAULT_WINDOW, track_handlers: bool = True) -> TickProfiler:
+        """
+        开启主循环的逐帧性能分析：各系统 update 的耗时、超出帧预算（TICK_INTERVAL）的帧数，
+        以及（track_handlers=True 时）按系统归集的事件监听器耗时。随时调用 profiler.dump() 输出摘要。
+        未开启时主循环不做任何计时。
+        """
+        if self.profiler is None:
+            self.profiler = TickProfiler(self.event_bus, TICK_INTERVAL, window, track_handlers)
+        return self.profiler
+
+    def disable_profiler(self) -> Optional[TickProfiler]:
+        """关闭性能分析，返回已收集的数据"""
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.close()
+        return profiler
+
+    def step(self):
+        """推进一帧：按优先级依次更新各系统，然后交付本帧合并的界面事件。不休眠。"""
+        profiler = self.profiler
+        if profiler is None:
+            for update in self.update_callables:
+                update()
+        else:
+            profiler.begin_frame()
+            profiler.run_updates(self.update_callables)
+        # 每帧末尾交付本帧合并的界面事件（包括结束前的最后一帧）
+        self.event_bus.flush_coalesced()
+        if profiler is not None:
+            profiler.end_frame()
+
+    def run_until(self, predicate: Optional[Callable[[], bool]] = None, max_steps: Optional[int] = None) -> int:
+        """
+        无休眠地连续推进，直到 predicate() 为真、世界停止运行（is_running 变为 False）
+        或推进了 max_steps 帧。每帧结束后检查 predicate。返回实际推进的帧数。
+        """
+        self.is_running = True
+        steps = 0
+        step = self.step
+        while self.is_running and (max_steps is None or steps < max_steps):
+            step()
+            steps += 1
+            if predicate is not None and predicate():
+                break
+        return steps
+
+    def run_battle(self, max_steps: int = DEFAULT_MAX_BATTLE_STEPS) -> BattleOutcome:
+        """
+        无界面地把当前战斗跑完：连续推进到 BATTLEFIELD_COMPLETE 所在的帧结束，之后世界停止运行。
+        战场需要事先初始化；有玩家控制的角色时，调用方需要订阅 UI_DISPLAY_OPTIONS 来提供选择。
+        """
+        outcome = BattleOutcome()
+        def on_battlefield_complete(event: GameEvent):
+            outcome.battlefield_id = event.payload.get("battlefield_id")
+            outcome.result = event.payload.get("result")
+        handle = self.event_bus.subscribe(EventName.BATTLEFIELD_COMPLETE, on_battlefield_complete)
+        try:
+            outcome.steps = self.run_until(lambda: outcome.result is not None, max_steps)
+        finally:
+            self.event_bus.unsubscribe(handle)
+            self.is_running = False
+        return outcome
 
     def start(self):
         self.is_running = True
         self.game_loop()
 
     def game_loop(self):
+        pacer = FramePacer(TICK_INTERVAL)
         while self.is_running:
-            loop_start_time = time.time()
-
-            for priority, system in self.systems:
-                if hasattr(system, 'update'):
-                    system.update()
+            self.step()
             if not self.is_running:
                 break
 
-            loop_end_time = time.time()
-            elapsed_time = loop_end_time - loop_start_time
-            sleep_time = TICK_INTERVAL - elapsed_time
+            sleep_time = pacer.next_delay(self.next_update_time())
             if sleep_time > 0:
-                time.sleep(sleep_time)
\ No newline at end of file
+                time.sleep(sleep_time)
+
+    async def start_async(self):
+        self.is_running = True
+        await self.game_loop_async()
+
+    async def game_loop_async(self):
+        """
+        协程版主循环，需要配合 AsyncEventBus 使用。
+        某个系统的 update 派发出协程监听器（例如等待玩家输入）时，先等这些协程完成
+        再更新下一个系统，等待期间让出事件循环。
+        注意：同一次 update 中派发的其他同步事件不会等待协程，例如同一帧多个角色
+        AP 满时，AI 角色会先于等待输入的玩家角色完成行动。
+        """
+        event_bus = self.event_bus
+        pacer = FramePacer(TICK_INTERVAL)
+        while self.is_running:
+            profiler = self.profiler
+            if profiler is None:
+                for update in self.update_callables:
+                    update()
+                    if event_bus.has_pending_tasks:
+                        await event_bus.drain()
+            else:
+                # 等待协程监听器的时间计入派发它们的系统
+                profiler.begin_frame()
+                for update in self.update_callables:
+                    start = time.perf_counter()
+                    update()
+                    if event_bus.has_pending_tasks:
+                        await event_bus.drain()
+                    profiler.record_update(update, time.perf_counter() - start)
+            event_bus.flush_coalesced()
+            if profiler is not None:
+                profiler.end_frame()
+            if not self.is_running:
+                break
+
+            # 即使本帧超时也让出一次事件循环，避免独占
+            await asyncio.sleep(pacer.next_delay(self.next_update_time()))
\ No newline at end of file
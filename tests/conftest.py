@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture(scope="session")
+def data_manager():
+    # 数据文件按相对于仓库根目录的路径加载
+    os.chdir(ROOT)
+    from game.main import load_game_data
+    return load_game_data()
@@ -0,0 +1,79 @@
+import pytest
+
+from game.core.components import (AIComponent, EquipmentComponent, HealthComponent, InventoryComponent,
+                                  SpellListComponent, StatsComponent, StatusEffectContainerComponent)
+from game.core.enums import EventName
+from game.core.event_bus import EventBus
+from game.systems.character_factory import CharacterFactory
+
+@pytest.fixture
+def factory(data_manager):
+    return CharacterFactory(EventBus(), data_manager)
+
+def test_template_is_compiled_once_and_cloned(factory):
+    first = factory.create_character_from_template("goblin_warrior", "goblin_1")
+    prototype = factory.prototypes["goblin_warrior"]
+    second = factory.create_character_from_template("goblin_warrior", "goblin_2")
+
+    assert factory.prototypes["goblin_warrior"] is prototype
+    assert (first.name, second.name) == ("goblin_1", "goblin_2")
+    assert first.id != second.id
+
+def test_clone_matches_directly_built_character(factory, data_manager):
+    clone = factory.create_character_from_template("hero")
+    built = factory._create_character_from_data(data_manager.get_avatar_data("hero"), "hero", "hero")
+
+    for component_type in (SpellListComponent, StatsComponent, InventoryComponent):
+        assert clone.get_component(component_type) == built.get_component(component_type)
+    assert (clone.get_component(EquipmentComponent).equipped_items.keys()
+            == built.get_component(EquipmentComponent).equipped_items.keys())
+    health = clone.get_component(HealthComponent)
+    assert (health.hp, health.max_hp) == (built.get_component(HealthComponent).hp,
+                                          built.get_component(HealthComponent).max_hp)
+
+def test_clones_get_their_own_runtime_state(factory):
+    first = factory.create_character_from_template("goblin_warrior", "goblin_1")
+    second = factory.create_character_from_template("goblin_warrior", "goblin_2")
+
+    assert first.get_component(HealthComponent)._owner is first
+    assert second.get_component(HealthComponent)._owner is second
+    for component_type in (StatusEffectContainerComponent, EquipmentComponent, InventoryComponent, AIComponent):
+        assert first.get_component(component_type) is not second.get_component(component_type)
+    first_item = next(iter(first.get_component(EquipmentComponent).equipped_items.values()))
+    second_item = next(iter(second.get_component(EquipmentComponent).equipped_items.values()))
+    first_item.current_durability -= 10
+    assert second_item.current_durability == first_item.max_durability
+
+def test_spawn_logs_are_replayed_with_the_clone_name(factory):
+    logs = []
+    factory.event_bus.subscribe(EventName.LOG_REQUEST, lambda event: logs.append(event.payload.render()))
+    factory.create_character_from_template("hero", "hero_a")
+    factory.create_character_from_template("hero", "hero_b")
+
+    assert logs[:len(logs) // 2] == [line.replace("hero_b", "hero_a") for line in logs[len(logs) // 2:]]
+    assert any("hero_b" in line for line in logs)
+
+def test_clones_do_not_share_mutable_component_data(factory):
+    first = factory.create_character_from_template("goblin_warrior", "goblin_1")
+    second = factory.create_character_from_template("goblin_warrior", "goblin_2")
+    hero_a = factory.create_character_from_template("hero", "hero_a")
+    hero_b = factory.create_character_from_template("hero", "hero_b")
+
+    spells = second.get_component(SpellListComponent).spells[:]
+    first.get_component(SpellListComponent).spells.append("extra_spell")
+    behavior_patterns = [dict(pattern) for pattern in second.get_component(AIComponent).behavior_patterns]
+    first.get_component(AIComponent).behavior_patterns[0]["mutated"] = True
+    first.get_component(AIComponent).behavior_patterns.append({"mutated": True})
+    item_a = next(iter(hero_a.get_component(EquipmentComponent).equipped_items.values()))
+    item_b = next(iter(hero_b.get_component(EquipmentComponent).equipped_items.values()))
+    base_stats = dict(item_b.base_stats)
+    for stat_name in item_a.base_stats:
+        item_a.base_stats[stat_name] += 100
+
+    assert second.get_component(SpellListComponent).spells == spells
+    assert second.get_component(AIComponent).behavior_patterns == behavior_patterns
+    assert item_b.base_stats == base_stats
+    # 原型本身也不受影响，之后生成的实体与修改前一致
+    third = factory.create_character_from_template("goblin_warrior", "goblin_3")
+    assert third.get_component(SpellListComponent).spells == spells
+    assert third.get_component(AIComponent).behavior_patterns == behavior_patterns
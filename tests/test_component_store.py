@@ -0,0 +1,33 @@
+import io
+
+import pytest
+
+from game.core import component_store
+from game.core.component_store import ComponentStore
+from game.core.event_bus import EventBus
+from game.core.journal import EventJournalRecorder
+from game.main import build_world, init_battlefield
+from game.scheduler import first_choice, subscribe_choice_policy
+
+def _battle_trace(data_manager, seed: int, store=None) -> bytes:
+    """无界面跑完一场战斗，返回事件日志"""
+    event_bus = EventBus()
+    world = build_world(event_bus, data_manager, headless=True, component_store=store)
+    subscribe_choice_policy(event_bus, first_choice)
+    stream = io.BytesIO()
+    recorder = EventJournalRecorder(event_bus, stream, seed, world.rng)
+    init_battlefield(event_bus)
+    assert world.run_battle().is_complete
+    recorder.close()
+    return stream.getvalue()
+
+@pytest.mark.parametrize("use_numpy", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(component_store.np is None, reason="需要 numpy")),
+], ids=["array", "numpy"])
+@pytest.mark.parametrize("seed", range(3))
+def test_battle_with_component_store_matches_battle_without(data_manager, seed, use_numpy):
+    store = ComponentStore(capacity=2, use_numpy=use_numpy)  # 容量很小，战斗中会扩容
+
+    assert _battle_trace(data_manager, seed, store) == _battle_trace(data_manager, seed)
+    assert store.capacity > 2  # 战斗中的实体确实挂接到了列式存储上
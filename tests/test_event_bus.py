@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+
+import pytest
+
+from game.core.components import CounterStrikeComponent, ThornsComponent
+from game.core.entity import Entity
+from game.core.enums import EventName, ListenerErrorPolicy
+from game.core.event_bus import CascadeDepthError, EventBus, GameEvent
+from game.core.payloads import DamageRequestPayload, HealthChangePayload, UIMessagePayload
+from game.main import build_world, init_battlefield
+
+def _health_changed(entity: Entity) -> GameEvent:
+    return GameEvent(EventName.HEALTH_CHANGED, HealthChangePayload(entity, 100, 90, 100))
+
+def test_entity_index_skips_listeners_of_other_entities():
+    event_bus = EventBus()
+    entities = [Entity(f"dummy_{i}", event_bus) for i in range(100)]
+    checked, calls = [], []
+    for entity in entities:
+        event_bus.subscribe(EventName.HEALTH_CHANGED, lambda event, entity=entity: calls.append(entity.name),
+                            priority=0, entity=entity, where=lambda event, entity=entity: checked.append(entity) or True)
+    event_bus.subscribe(EventName.HEALTH_CHANGED, lambda event: calls.append("global"))
+    target = entities[42]
+
+    event_bus.dispatch(_health_changed(target))
+
+    # 其他实体的监听器连过滤条件都不会被执行；按实体订阅的监听器与全局监听器按优先级合并
+    assert checked == [target]
+    assert calls == ["dummy_42", "global"]
+
+def test_unsubscribed_entity_listener_is_removed_from_the_index():
+    event_bus = EventBus()
+    hero, goblin = Entity("hero", event_bus), Entity("goblin", event_bus)
+    calls = []
+    handle = event_bus.subscribe(EventName.HEALTH_CHANGED, lambda event: calls.append("hero"), entity=hero)
+
+    event_bus.unsubscribe(handle)
+    event_bus.dispatch(_health_changed(hero))
+    event_bus.dispatch(_health_changed(goblin))
+
+    assert calls == []
+
+def _cascade_trace(data_manager, deferred: bool) -> tuple[list, str, str]:
+    """英雄攻击带反伤和反震的敌人，按顺序记录伤害请求、生命值变化和每次伤害请求的监听器全部执行完毕"""
+    event_bus = EventBus(deferred=deferred)
+    world = build_world(event_bus, data_manager, headless=True)
+    init_battlefield(event_bus)
+    hero, enemy = world.query(team="player")[0], world.query(team="enemy")[0]
+    enemy.add_component(ThornsComponent(0.5))
+    enemy.add_component(CounterStrikeComponent(7))
+    trace = []
+    event_bus.subscribe(EventName.DAMAGE_REQUEST, lambda event: trace.append(
+        ("damage", event.payload.source_spell_id, event.payload.target.name, event_bus.current_depth)), priority=-1)
+    event_bus.subscribe(EventName.DAMAGE_REQUEST, lambda event: trace.append(
+        ("done", event.payload.source_spell_id)), priority=10_000)
+    event_bus.subscribe(EventName.HEALTH_CHANGED, lambda event: trace.append(
+        ("health", event.payload.entity.name)), priority=-1)
+
+    event_bus.dispatch(GameEvent(EventName.DAMAGE_REQUEST, DamageRequestPayload(
+        caster=hero, target=enemy, source_spell_id="test", source_spell_name="测试",
+        base_damage=40, damage_type="pure", can_be_reflected=True)))
+    return trace, hero.name, enemy.name
+
+def test_deferred_mode_resolves_thorns_and_counter_strike_after_the_root_damage(data_manager):
+    trace, hero, enemy = _cascade_trace(data_manager, deferred=True)
+
+    assert trace == [
+        ("damage", "test", enemy, 0), ("health", enemy), ("done", "test"),
+        ("damage", "thorns", hero, 1), ("health", hero), ("done", "thorns"),
+        ("damage", "counter_strike", hero, 1), ("health", hero), ("done", "counter_strike"),
+    ]
+
+def test_immediate_mode_resolves_thorns_and_counter_strike_inside_the_root_damage(data_manager):
+    trace, hero, enemy = _cascade_trace(data_manager, deferred=False)
+
+    assert trace == [
+        ("damage", "test", enemy, 0), ("health", enemy),
+        ("damage", "thorns", hero, 0), ("health", hero), ("done", "thorns"),
+        ("damage", "counter_strike", hero, 0), ("health", hero), ("done", "counter_strike"),
+        ("done", "test"),
+    ]
+
+def _endless_cascade(error_policy: ListenerErrorPolicy) -> tuple[EventBus, list]:
+    """每条 UI_MESSAGE 都再 post 一条，直到超过最大连锁深度"""
+    event_bus = EventBus(error_policy=error_policy, deferred=True, max_cascade_depth=2)
+    depths = []
+    def on_message(event: GameEvent):
+        depths.append(event_bus.current_depth)
+        event_bus.post(GameEvent(EventName.UI_MESSAGE, UIMessagePayload("again")))
+    event_bus.subscribe(EventName.UI_MESSAGE, on_message)
+    return event_bus, depths
+
+def test_cascade_overflow_raises_under_raise_policy():
+    event_bus, depths = _endless_cascade(ListenerErrorPolicy.RAISE)
+
+    with pytest.raises(CascadeDepthError):
+        event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload("root")))
+
+    assert depths == [0, 1, 2]
+    assert event_bus.dropped_event_count == 1
+    # 出错后连锁状态已复位，下一次派发重新从根事件开始
+    with pytest.raises(CascadeDepthError):
+        event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload("root")))
+    assert depths == [0, 1, 2, 0, 1, 2]
+
+@pytest.mark.parametrize("error_policy, warns", [(ListenerErrorPolicy.ISOLATE, True), (ListenerErrorPolicy.COUNT, False)])
+def test_cascade_overflow_drops_the_event_under_isolate_and_count_policies(capsys, error_policy, warns):
+    event_bus, depths = _endless_cascade(error_policy)
+
+    event_bus.dispatch(GameEvent(EventName.UI_MESSAGE, UIMessagePayload("root")))
+
+    assert depths == [0, 1, 2]
+    assert event_bus.dropped_event_count == 1
+    assert event_bus.error_counts[EventName.UI_MESSAGE] == 1
+    assert ("[CASCADE WARNING]" in capsys.readouterr().out) == warns
+
+def test_batch_listener_receives_queued_events_grouped_by_target():
+    event_bus = EventBus(deferred=True)
+    hero, goblin = Entity("hero", event_bus), Entity("goblin", event_bus)
+    handled, batches = [], []
+    def on_round_start(event: GameEvent):
+        for target in (hero, goblin, hero):
+            event_bus.post(GameEvent(EventName.DAMAGE_REQUEST, SimpleNamespace(target=target)))
+    event_bus.subscribe(EventName.ROUND_START, on_round_start)
+    event_bus.subscribe(EventName.DAMAGE_REQUEST, lambda event: handled.append(event.payload.target.name))
+    event_bus.subscribe_batch(EventName.DAMAGE_REQUEST, lambda events: batches.append(
+        [event.payload.target.name for event in events]))
+
+    event_bus.dispatch(GameEvent(EventName.ROUND_START, None))
+
+    assert handled == ["hero", "hero", "goblin"]
+    assert batches == [["hero", "hero"], ["goblin"]]
+    assert event_bus.last_cascade_size == 4
@@ -0,0 +1,130 @@
+import io
+import math
+
+import pytest
+
+from game.core.components import DeadComponent, HealthComponent, ManaComponent, StatusEffectContainerComponent
+from game.core.enums import EventName
+from game.core.event_bus import EventBus, GameEvent
+from game.core.journal import EventJournalRecorder
+from game.main import build_world, init_battlefield
+from game.scheduler import first_choice, subscribe_choice_policy
+from game.systems.dead_system import DeadSystem
+from game.systems.health_change_system import HealthChangeBatchSystem
+from game.systems.turn_manager_system import TurnManagerSystem
+
+STEPS_BEFORE_FORK = 20
+MAX_STEPS = 10_000
+
+def _answer_first_option(event_bus: EventBus):
+    def on_display_options(event: GameEvent):
+        payload = event.payload
+        event_bus.dispatch(GameEvent(payload.response_event_name, {"choice_index": 0, "context": payload.context}))
+    event_bus.subscribe(EventName.UI_DISPLAY_OPTIONS, on_display_options)
+
+def _run(world, max_steps: int = MAX_STEPS) -> int:
+    world.is_running = True
+    steps = 0
+    while world.is_running and steps < max_steps:
+        for _, system in world.systems:
+            if hasattr(system, 'update'):
+                system.update()
+        world.event_bus.flush_coalesced()
+        steps += 1
+    return steps
+
+def _state(world) -> tuple:
+    entities = []
+    for entity in world.entities:
+        health = entity.get_component(HealthComponent)
+        mana = entity.get_component(ManaComponent)
+        container = entity.get_component(StatusEffectContainerComponent)
+        entities.append((entity.id, entity.name, health.hp if health else None, mana.mana if mana else None,
+                         [(e.effect_id, e.stack_count, e.duration) for e in container.effects] if container else None,
+                         entity.has_component(DeadComponent)))
+    turn_manager = world.get_system(TurnManagerSystem)
+    return entities, turn_manager.round_number, sorted(turn_manager.ap_bars.items())
+
+def _battle_world(data_manager, **kwargs):
+    event_bus = EventBus()
+    world = build_world(event_bus, data_manager, headless=True, **kwargs)
+    _answer_first_option(event_bus)
+    init_battlefield(event_bus)
+    _run(world, STEPS_BEFORE_FORK)
+    return world
+
+def test_fork_keeps_entity_ids_and_copies_components_on_write(data_manager):
+    world = _battle_world(data_manager)
+    child = world.fork()
+
+    assert [e.id for e in child.entities] == [e.id for e in world.entities]
+    enemy = child.query(team="enemy")[0]
+    enemy.get_component(HealthComponent).hp = 0
+    enemy.add_component(DeadComponent())
+
+    parent_enemy = world.get_entity(enemy.id)
+    assert parent_enemy.get_component(HealthComponent).hp > 0
+    assert parent_enemy in world.query(team="enemy")
+    assert enemy not in child.query(team="enemy")
+
+def test_running_fork_to_the_end_leaves_parent_state_unchanged(data_manager):
+    world = _battle_world(data_manager)
+    before = _state(world)
+    child = world.fork()
+    _answer_first_option(child.event_bus)
+
+    _run(child)
+
+    assert not child.is_running
+    assert _state(child) != before
+    assert _state(world) == before
+
+def test_fork_copies_pending_death_check(data_manager):
+    world = _battle_world(data_manager)
+    dead_system = world.get_system(DeadSystem)
+    dead_system.update()
+    assert dead_system.next_update_time() == math.inf
+
+    assert world.fork().get_system(DeadSystem).next_update_time() == math.inf
+
+    world.query(team="enemy")[0].get_component(HealthComponent).hp = 0
+    assert world.fork().get_system(DeadSystem).next_update_time() is None
+
+def test_fork_carries_pending_batched_health_changes(data_manager):
+    world = _battle_world(data_manager, batch_health_changes=True)
+    enemy = world.query(team="enemy")[0]
+    health = enemy.get_component(HealthComponent)
+    old_hp = health.hp
+    health.hp = old_hp - 10
+
+    child = world.fork()
+    changes = []
+    child.event_bus.subscribe(EventName.HEALTH_CHANGED, lambda event: changes.append(event.payload))
+    child.get_system(HealthChangeBatchSystem).flush()
+
+    assert [(c.entity.id, c.old_hp, c.new_hp) for c in changes] == [(enemy.id, old_hp, old_hp - 10)]
+    assert changes[0].entity is child.get_entity(enemy.id)
+    # 子世界派发过的变化在本世界中仍然待派发
+    assert world.get_system(HealthChangeBatchSystem).next_update_time() is None
+
+def _battle_trace(data_manager, seed: int, fork_at: int = None) -> bytes:
+    """无界面跑完一场战斗，返回本世界的事件日志；fork_at 不为空时在该帧分叉并先把子世界跑完"""
+    event_bus = EventBus()
+    world = build_world(event_bus, data_manager, headless=True)
+    subscribe_choice_policy(event_bus, first_choice)
+    stream = io.BytesIO()
+    recorder = EventJournalRecorder(event_bus, stream, seed, world.rng)
+    init_battlefield(event_bus)
+    if fork_at is not None:
+        world.run_until(max_steps=fork_at)
+        child = world.fork()
+        subscribe_choice_policy(child.event_bus, first_choice)
+        assert child.run_battle().is_complete
+    world.run_battle()
+    recorder.close()
+    return stream.getvalue()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_running_fork_leaves_parent_battle_unchanged(data_manager, seed):
+    reference = _battle_trace(data_manager, seed)
+    assert _battle_trace(data_manager, seed, fork_at=STEPS_BEFORE_FORK) == reference
@@ -0,0 +1,62 @@
+import pytest
+
+from game.core.components import HealthComponent
+from game.core.entity import Entity
+from game.core.enums import EventName
+from game.core.event_bus import EventBus, GameEvent
+from game.systems.health_change_system import HealthChangeBatchSystem
+from game.world import World
+
+def _record_health_changes(event_bus: EventBus) -> list:
+    changes = []
+    event_bus.subscribe(EventName.HEALTH_CHANGED, lambda event: changes.append(event.payload))
+    return changes
+
+@pytest.mark.parametrize("owner_factory", [lambda event_bus: None, lambda event_bus: Entity("dummy", event_bus)],
+                         ids=["no_owner", "owner_outside_world"])
+def test_hp_write_without_world_dispatches_directly(owner_factory):
+    event_bus = EventBus()
+    changes = _record_health_changes(event_bus)
+    owner = owner_factory(event_bus)
+    health = HealthComponent(owner, event_bus, 80, 100)
+
+    health.hp = 30
+
+    assert health.hp == 30
+    assert len(changes) == 1
+    assert (changes[0].entity, changes[0].old_hp, changes[0].new_hp, changes[0].max_hp) == (owner, 80, 30, 100)
+
+def test_unchanged_hp_write_does_not_dispatch():
+    event_bus = EventBus()
+    changes = _record_health_changes(event_bus)
+    health = HealthComponent(None, event_bus, 100, 100)
+
+    health.hp = 150  # 超过上限，截断后不变
+
+    assert health.hp == 100
+    assert changes == []
+
+def _batched_entity(world: World, name: str, hp: float) -> HealthComponent:
+    entity = Entity(name, world.event_bus)
+    health = HealthComponent(entity, world.event_bus, hp, hp)
+    entity.add_component(health)
+    world.add_entity(entity)
+    return health
+
+def test_batched_writes_dispatch_one_net_change_per_entity_after_action():
+    event_bus = EventBus()
+    world = World(event_bus)
+    world.add_system(HealthChangeBatchSystem(event_bus, world))
+    changes = _record_health_changes(event_bus)
+    hero = _batched_entity(world, "hero", 100)
+    goblin = _batched_entity(world, "goblin", 50)
+
+    hero.hp -= 30
+    hero.hp += 10
+    goblin.hp -= 5
+    goblin.hp += 5  # 净变化为 0，不派发
+    assert changes == []
+
+    event_bus.dispatch(GameEvent(EventName.ACTION_AFTER_ACT, None))
+
+    assert [(c.entity.name, c.old_hp, c.new_hp) for c in changes] == [("hero", 100, 80)]
@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from game.core.entity import Entity
+from game.core.enums import EventName, ListenerErrorPolicy
+from game.core.event_bus import EventBus, GameEvent
+from game.core.journal import MAX_STRING_ID, EventJournalRecorder, JournalRecord, read_journal
+from game.core.payloads import HealthChangePayload, UIDisplayOptionsPayload
+from game.main import build_world, init_battlefield
+from game.replay import MAX_REPLAY_TICKS, replay_journal
+
+def test_journal_round_trip():
+    event_bus = EventBus()
+    stream = io.BytesIO()
+    recorder = EventJournalRecorder(event_bus, stream, seed=123)
+    hero = Entity("hero", event_bus)
+    event_bus.dispatch(GameEvent(EventName.BATTLEFIELD_INIT_REQUEST, {"battlefield_id": "tutorial_battlefield"}))
+    event_bus.dispatch(GameEvent(EventName.PLAYER_SPELL_CHOICE, {"choice_index": 2, "context": None}))
+    event_bus.dispatch(GameEvent(EventName.HEALTH_CHANGED, HealthChangePayload(hero, 100.0, 62.5, 100.0)))
+    event_bus.dispatch(GameEvent(EventName.HEALTH_CHANGED, HealthChangePayload(None, 10.0, 0.0, 10.0)))
+    recorder.close()
+
+    stream.seek(0)
+    seed, records = read_journal(stream)
+
+    assert seed == 123
+    assert records == [
+        JournalRecord(EventName.BATTLEFIELD_INIT_REQUEST, ("tutorial_battlefield",)),
+        JournalRecord(EventName.PLAYER_SPELL_CHOICE, (2,)),
+        JournalRecord(EventName.HEALTH_CHANGED, ("hero", 100.0, 62.5)),
+        JournalRecord(EventName.HEALTH_CHANGED, (None, 10.0, 0.0)),
+    ]
+
+def test_string_table_stops_before_the_null_reference():
+    event_bus = EventBus(error_policy=ListenerErrorPolicy.RAISE)
+    stream = io.BytesIO()
+    recorder = EventJournalRecorder(event_bus, stream, seed=1)
+    # 假装字符串表已经用到 MAX_STRING_ID - 1（这些字符串不会出现在下面的记录中）
+    recorder._strings = {f"unused_{i}": i for i in range(MAX_STRING_ID)}
+    last = Entity("last", event_bus)
+    event_bus.dispatch(GameEvent(EventName.HEALTH_CHANGED, HealthChangePayload(last, 10.0, 5.0, 10.0)))
+
+    with pytest.raises(ValueError, match="字符串表已满"):
+        event_bus.dispatch(GameEvent(EventName.HEALTH_CHANGED,
+                                     HealthChangePayload(Entity("overflow", event_bus), 10.0, 5.0, 10.0)))
+    recorder.close()
+
+    stream.seek(0)
+    _, records = read_journal(stream)
+    # 最后一个可用ID 0xFFFE 仍能还原为字符串，而不是被当成空引用
+    assert records == [JournalRecord(EventName.HEALTH_CHANGED, ("last", 10.0, 5.0))]
+    assert recorder.record_count == 1
+
+def test_recorded_battle_replays_consistently(data_manager):
+    event_bus = EventBus()
+    world = build_world(event_bus, data_manager, headless=True)
+    def on_display_options(event: GameEvent):
+        payload: UIDisplayOptionsPayload = event.payload
+        event_bus.dispatch(GameEvent(payload.response_event_name, {"choice_index": 0, "context": payload.context}))
+    event_bus.subscribe(EventName.UI_DISPLAY_OPTIONS, on_display_options)
+    stream = io.BytesIO()
+    recorder = EventJournalRecorder(event_bus, stream, 7, world.rng)
+    init_battlefield(event_bus)
+
+    ticks = world.run_until(max_steps=MAX_REPLAY_TICKS)
+    recorder.close()
+    assert not world.is_running
+
+    stream.seek(0)
+    result = replay_journal(stream, data_manager)
+
+    assert result.is_consistent, (result.divergence_index, result.expected, result.actual)
+    assert result.record_count == recorder.record_count
+    assert result.ticks == ticks
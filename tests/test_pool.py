@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+
+from game.core.enums import EventName
+from game.core.event_bridge import EventBridge, decode_event
+from game.core.event_bus import EventBus
+from game.core.payloads import LogRequestPayload
+from game.core.pool import ObjectPool, UseAfterReleaseError, set_pool_debug
+
+@dataclass(slots=True)
+class _Item:
+    value: int
+
+@pytest.fixture
+def pool_debug():
+    set_pool_debug(True)
+    yield
+    set_pool_debug(False)
+
+def test_released_object_is_reinitialised_on_reuse():
+    pool = ObjectPool(_Item)
+    first = pool.acquire(1)
+    pool.release(first)
+
+    second = pool.acquire(2)
+
+    assert second is first
+    assert second.value == 2
+    assert (pool.created_count, pool.reused_count) == (1, 1)
+
+def test_pool_keeps_at_most_max_size_free_objects():
+    pool = ObjectPool(_Item, max_size=1)
+    items = [pool.acquire(i) for i in range(3)]
+    for item in items:
+        pool.release(item)
+
+    assert pool.acquire(0) is items[0]
+    assert pool.acquire(0) is not items[1]
+
+def test_debug_mode_detects_use_after_release_and_double_release(pool_debug):
+    pool = ObjectPool(_Item)
+    item = pool.acquire(1)
+    pool.release(item)
+
+    with pytest.raises(UseAfterReleaseError):
+        item.value
+    with pytest.raises(UseAfterReleaseError):
+        pool.release(item)
+    assert pool.acquire(1) is not item
+
+def test_dispatch_pooled_releases_event_after_dispatch(pool_debug):
+    event_bus = EventBus()
+    payload_pool = ObjectPool(_Item)
+    seen = []
+    event_bus.subscribe(EventName.LOG_REQUEST, lambda event: seen.append((event, event.payload.value)))
+
+    event_bus.dispatch_pooled(EventName.LOG_REQUEST, payload_pool.acquire(5), payload_pool)
+
+    event, value = seen[0]
+    assert value == 5
+    with pytest.raises(UseAfterReleaseError):
+        event.payload
+
+def test_each_event_bus_has_its_own_event_pool():
+    first, second = EventBus(), EventBus()
+    events = []
+    first.subscribe(EventName.LOG_REQUEST, events.append)
+    second.subscribe(EventName.LOG_REQUEST, events.append)
+
+    first.dispatch_pooled(EventName.LOG_REQUEST, None)
+    second.dispatch_pooled(EventName.LOG_REQUEST, None)
+    first.dispatch_pooled(EventName.LOG_REQUEST, None)
+
+    assert events[0] is not events[1]
+    assert events[2] is events[0]
+
+@pytest.mark.parametrize("debug", [False, True], ids=["reuse", "debug"])
+def test_coalesced_listener_can_hold_pooled_events_past_their_dispatch(debug):
+    set_pool_debug(debug)
+    try:
+        event_bus = EventBus()
+        payload_pool = ObjectPool(_Item)
+        delivered = []
+        event_bus.coalesce((EventName.LOG_REQUEST,), delivered.extend)
+
+        event_bus.dispatch_pooled(EventName.LOG_REQUEST, payload_pool.acquire(1), payload_pool)
+        event_bus.dispatch_pooled(EventName.LOG_REQUEST, payload_pool.acquire(2), payload_pool)
+        event_bus.flush_coalesced()
+    finally:
+        set_pool_debug(False)
+
+    assert [(event.name, event.payload.value) for event in delivered] == [(EventName.LOG_REQUEST, 1),
+                                                                          (EventName.LOG_REQUEST, 2)]
+
+def test_bridge_encodes_pooled_events_before_they_are_released():
+    event_bus = EventBus()
+    sent = []
+    bridge = EventBridge(event_bus, SimpleNamespace(put=sent.extend), (EventName.LOG_REQUEST,))
+    payload_pool = ObjectPool(LogRequestPayload)
+
+    event_bus.dispatch_pooled(EventName.LOG_REQUEST, payload_pool.acquire("[TEST]", "first"), payload_pool)
+    event_bus.dispatch_pooled(EventName.LOG_REQUEST, payload_pool.acquire("[TEST]", "second"), payload_pool)
+    bridge.flush()
+
+    assert [decode_event(record).payload.render() for record in sent] == ["first", "second"]
@@ -0,0 +1,33 @@
+from game.scheduler import WorldScheduler
+
+def test_all_scheduled_battles_run_to_completion(data_manager):
+    scheduler = WorldScheduler(data_manager, time_slice=0.0005)
+    battles = [scheduler.create_battle(name=f"battle-{i}") for i in range(4)]
+
+    finished = scheduler.run()
+
+    assert sorted(s.name for s in finished) == sorted(s.name for s in battles)
+    assert scheduler.active == []
+    for scheduled in finished:
+        assert scheduled.stop_reason == "complete"
+        assert scheduled.outcome.result in ("victory", "defeat")
+        assert scheduled.outcome.battlefield_id == "tutorial_battlefield"
+        assert not scheduled.world.is_running
+        assert scheduled.slices >= 1
+        assert scheduled.outcome.steps >= scheduled.slices
+    # 时间片很短，每场战斗都要和其他世界轮流运行多轮
+    assert scheduler.rounds > 1
+
+def test_step_and_cpu_limits_stop_a_world(data_manager):
+    scheduler = WorldScheduler(data_manager)
+    limited_steps = scheduler.create_battle(name="steps", max_steps=3)
+    limited_cpu = scheduler.create_battle(name="cpu", cpu_limit=0.0)
+    unlimited = scheduler.create_battle(name="unlimited")
+
+    scheduler.run()
+
+    assert (limited_steps.stop_reason, limited_steps.outcome.steps) == ("max_steps", 3)
+    assert limited_steps.outcome.result is None
+    assert limited_cpu.stop_reason == "cpu_limit"
+    assert limited_cpu.slices == 1
+    assert unlimited.stop_reason == "complete"
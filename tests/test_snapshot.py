@@ -0,0 +1,97 @@
+import math
+
+from game.core.components import (BattlefieldComponent, DeadComponent, EnemyWaveComponent, HealthComponent,
+                                  ManaComponent, StatusEffectContainerComponent)
+from game.core.enums import EventName
+from game.core.event_bus import EventBus
+from game.main import build_world, init_battlefield
+from game.scheduler import first_choice, subscribe_choice_policy
+from game.systems.dead_system import DeadSystem
+from game.systems.turn_manager_system import TurnManagerSystem
+
+def _world(data_manager, **kwargs):
+    event_bus = EventBus()
+    world = build_world(event_bus, data_manager, headless=True, **kwargs)
+    subscribe_choice_policy(event_bus, first_choice)
+    return world
+
+def _battle_world(data_manager, **kwargs):
+    world = _world(data_manager, **kwargs)
+    init_battlefield(world.event_bus)
+    world.step()
+    return world
+
+def _first_enemy(world):
+    return next(e for e in world.query(team="enemy"))
+
+def _battlefield(world):
+    return next(e for e in world.entities if e.has_component(BattlefieldComponent))
+
+def _state(world) -> tuple:
+    entities = []
+    for entity in world.entities:
+        health = entity.get_component(HealthComponent)
+        mana = entity.get_component(ManaComponent)
+        container = entity.get_component(StatusEffectContainerComponent)
+        entities.append((entity.id, entity.name, health.hp if health else None, mana.mana if mana else None,
+                         [(e.effect_id, e.stack_count, e.duration, e.caster.id if e.caster else None)
+                          for e in container.effects] if container else None))
+    turn_manager = world.get_system(TurnManagerSystem)
+    return entities, turn_manager.round_number, sorted(turn_manager.ap_bars.items())
+
+def test_restored_world_continues_like_the_original(data_manager):
+    world = _battle_world(data_manager)
+    world.run_until(max_steps=40)
+    data = world.snapshot()
+    world.run_until(max_steps=40)
+    expected = _state(world)
+
+    restored = _world(data_manager)
+    restored.restore(data)
+    restored.run_until(max_steps=40)
+
+    assert _state(restored) == expected
+
+def test_restore_keeps_pending_death_check(data_manager):
+    world = _battle_world(data_manager)
+    enemy = _first_enemy(world)
+    enemy.get_component(HealthComponent).hp = 0
+    data = world.snapshot()
+    world.step()
+    assert world.get_system(DeadSystem).next_update_time() == math.inf
+
+    world.restore(data)
+
+    assert world.get_system(DeadSystem).next_update_time() is None
+    world.step()
+    assert world.get_entity(enemy.id).has_component(DeadComponent)
+
+def test_restore_keeps_pending_batched_health_changes(data_manager):
+    world = _battle_world(data_manager, batch_health_changes=True)
+    enemy = _first_enemy(world)
+    health = enemy.get_component(HealthComponent)
+    old_hp = health.hp
+    health.hp = old_hp - 10
+    data = world.snapshot()
+
+    restored = _world(data_manager, batch_health_changes=True)
+    restored.restore(data)
+    changes = []
+    restored.event_bus.subscribe(EventName.HEALTH_CHANGED, lambda event: changes.append(event.payload))
+    restored.step()
+
+    assert [(c.entity.id, c.old_hp, c.new_hp) for c in changes] == [(enemy.id, old_hp, old_hp - 10)]
+    assert changes[0].entity is restored.get_entity(enemy.id)
+
+def test_restore_keeps_battlefield_wave_and_completion_flags(data_manager):
+    world = _battle_world(data_manager)
+    battlefield = _battlefield(world)
+    battlefield.get_component(BattlefieldComponent).is_completed = True
+    data = world.snapshot()
+
+    restored = _world(data_manager)
+    restored.restore(data)
+
+    restored_battlefield = _battlefield(restored)
+    assert restored_battlefield.get_component(BattlefieldComponent).is_completed
+    assert restored_battlefield.get_component(EnemyWaveComponent).is_spawned
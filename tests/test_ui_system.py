@@ -0,0 +1,32 @@
+import random
+
+from game.core.enums import EventName
+from game.core.event_bus import EventBus
+from game.main import build_world, init_battlefield
+from game.systems.ui_system import UISystem
+
+def _panel_refreshes(data_manager, monkeypatch, log_enabled: bool) -> tuple[int, int]:
+    """跑完一场有界面的战斗，返回 (状态效果结算触发的面板刷新次数, STATUS_EFFECTS_RESOLVED 派发次数)"""
+    refreshes = []
+    monkeypatch.setattr(UISystem, "on_status_effects_resolved", lambda self, events: refreshes.append(len(events)))
+    monkeypatch.setattr(UISystem, "_clear_screen", lambda self: None)
+    monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+    random.seed(1)
+    event_bus = EventBus()
+    world = build_world(event_bus, data_manager, log_enabled=log_enabled)
+    resolved = []
+    event_bus.subscribe(EventName.STATUS_EFFECTS_RESOLVED, resolved.append)
+    init_battlefield(event_bus)
+    world.run_battle()
+    assert sum(refreshes) == len(resolved)
+    return len(refreshes), len(resolved)
+
+def test_logging_does_not_add_status_panel_refreshes(data_manager, monkeypatch, capsys):
+    refreshes_without_log, resolved = _panel_refreshes(data_manager, monkeypatch, log_enabled=False)
+    assert "[COMBAT]" not in capsys.readouterr().out
+
+    refreshes_with_log, resolved_with_log = _panel_refreshes(data_manager, monkeypatch, log_enabled=True)
+    assert "[COMBAT]" in capsys.readouterr().out
+
+    assert resolved_with_log == resolved
+    assert refreshes_with_log == refreshes_without_log < resolved
@@ -0,0 +1,63 @@
+from game.core.components import (AIControlledComponent, DeadComponent, PlayerControlledComponent, SpeedComponent,
+                                  TeamComponent)
+from game.core.entity import Entity
+from game.core.event_bus import EventBus
+from game.world import World
+
+def _entity(world: World, name: str, team: str, *components) -> Entity:
+    entity = Entity(name, world.event_bus)
+    entity.add_component(TeamComponent(team))
+    for component in components:
+        entity.add_component(component)
+    return world.add_entity(entity)
+
+def _names(entities) -> list[str]:
+    return [entity.name for entity in entities]
+
+def _battle_world():
+    world = World(EventBus())
+    _entity(world, "hero", "player", PlayerControlledComponent(), SpeedComponent(10))
+    _entity(world, "goblin", "enemy", AIControlledComponent(), SpeedComponent(8))
+    _entity(world, "mage", "player", PlayerControlledComponent(), SpeedComponent(12))
+    _entity(world, "archer", "enemy", AIControlledComponent())
+    return world
+
+def test_query_filters_by_component_and_team_in_world_order():
+    world = _battle_world()
+
+    assert _names(world.query()) == ["hero", "goblin", "mage", "archer"]
+    assert _names(world.query(team="enemy")) == ["goblin", "archer"]
+    assert _names(world.query(SpeedComponent)) == ["hero", "goblin", "mage"]
+    assert _names(world.query(SpeedComponent, team="enemy")) == ["goblin"]
+    assert _names(world.query(PlayerControlledComponent, AIControlledComponent)) == []
+    assert world.query(team="neutral") == []
+
+def test_indexes_follow_component_changes_and_death():
+    world = _battle_world()
+    hero = world.get_entity_by_name("hero")
+    goblin = world.get_entity_by_name("goblin")
+
+    goblin.add_component(DeadComponent())
+    hero.remove_component(SpeedComponent)
+    hero.add_component(TeamComponent("enemy"))
+
+    assert _names(world.query(team="enemy")) == ["hero", "archer"]
+    assert _names(world.query(team="enemy", alive=False)) == ["hero", "goblin", "archer"]
+    assert _names(world.query(SpeedComponent)) == ["mage"]
+
+    goblin.remove_component(DeadComponent)
+    assert _names(world.query(SpeedComponent, team="enemy")) == ["goblin"]
+
+def test_removed_entity_leaves_every_index():
+    world = _battle_world()
+    mage = world.get_entity_by_name("mage")
+
+    world.remove_entity(mage)
+
+    assert mage not in world.query(alive=False)
+    assert _names(world.query(PlayerControlledComponent)) == ["hero"]
+    assert _names(world.query(SpeedComponent, team="player")) == ["hero"]
+
+    # 移出世界后的组件变化不再影响索引
+    mage.add_component(AIControlledComponent())
+    assert _names(world.query(AIControlledComponent)) == ["goblin", "archer"]